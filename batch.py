@@ -0,0 +1,146 @@
+"""Wsadowe (nieinteraktywne) uruchamianie wielu symulacji do analiz Monte Carlo.
+
+Przykład::
+
+    tribes-batch --board-size 30 --tribes 20 --seed-start 0 --runs 1000 --workers 8
+    tribes-batch --board-size 30 --tribes 20 --params hard.toml --set expansion_cost=250
+
+Każda symulacja działa w osobnym procesie puli, bez wypisywania planszy
+i bez czekania między turami. Podsumowania wszystkich przebiegów trafiają
+do jednego pliku CSV. Parametry rozgrywki (``params.SimulationParams``)
+wczytywane są raz i przekazywane do procesów jako niezmienny obiekt.
+"""
+import argparse
+import csv
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from simulation import Simulation
+from params import DEFAULT_PARAMS, DEFAULT_SETTINGS, RunSettings, SimulationParams, parse_override
+
+RESULT_COLUMNS = ['seed', 'board_size', 'tribes_count', 'turns', 'tribes_alive', 'winner', 'battles',
+                  'termination_reason', 'elapsed']
+ENGINES = ('objects', 'vector', 'parallel')
+
+# Domyślne ograniczenia kosztu pojedynczego przebiegu w trybie wsadowym
+DEFAULT_MAX_TURNS = 10000
+DEFAULT_STALEMATE_TURNS = 200
+
+
+def create_simulation(board_size, tribes_count, seed, engine='objects', **options):
+    """Utwórz symulację wybranego silnika bez czekania między turami.
+
+    Silniki 'vector' i 'parallel' trzymają pełną siatkę, więc przyjmują plansze
+    najwyżej do config.VECTOR_BOARD_LIMIT (sprawdza validate_parameters).
+    """
+    if engine == 'vector':
+        from vector_engine import VectorSimulation  # wymaga NumPy
+        return VectorSimulation(board_size, tribes_count, 0, seed=seed, **options)
+    if engine == 'parallel':
+        # Jedna symulacja na wszystkich rdzeniach, o ile options nie ograniczają workers
+        from parallel_engine import ParallelVectorSimulation  # wymaga NumPy
+        return ParallelVectorSimulation(board_size, tribes_count, 0, seed=seed, **options)
+    return Simulation(board_size, tribes_count, 0, seed=seed, **options)
+
+
+def run_single(seed, board_size, tribes_count, engine='objects', settings=DEFAULT_SETTINGS, params=DEFAULT_PARAMS):
+    """Uruchom jedną symulację bez wyjścia na konsolę i zwróć jej podsumowanie"""
+    start = time.perf_counter()
+    # Tryb szybki bez raportów; poziom WARNING wycisza też podsumowanie pojedynczego przebiegu
+    options = dict(mode='fast', log_level=logging.WARNING, settings=settings, params=params)
+    if engine == 'parallel':
+        # Przebiegi rozkładają na procesy pule batch/sweep - silnik równoległy bez własnej, zagnieżdżonej puli
+        options['workers'] = 1
+    sim = create_simulation(board_size, tribes_count, seed, engine, **options)
+    sim.run(save=False)
+
+    result = sim.summary()
+    result['seed'] = seed
+    result['elapsed'] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def run_batch(board_size, tribes_count, seeds, workers=None, engine='objects', settings=DEFAULT_SETTINGS,
+              params=DEFAULT_PARAMS):
+    """Uruchom symulacje dla wszystkich ziaren w puli procesów; wyniki w kolejności ziaren"""
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    task = partial(run_single, board_size=board_size, tribes_count=tribes_count, engine=engine,
+                   settings=settings, params=params)
+    if workers == 1:
+        return [task(seed) for seed in seeds]
+
+    # Kilka porcji na proces - mniej komunikacji, a nadal równe obciążenie rdzeni
+    chunksize = max(1, len(seeds) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(task, seeds, chunksize=chunksize))
+
+
+def write_results(results, filename):
+    """Zapisz wyniki wszystkich przebiegów do jednego pliku CSV"""
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Wsadowe uruchamianie symulacji plemion (Monte Carlo).")
+    parser.add_argument('--board-size', type=int, required=True, help="rozmiar planszy")
+    parser.add_argument('--tribes', type=int, required=True, help="liczba plemion")
+    parser.add_argument('--seed-start', type=int, default=0, help="pierwsze ziarno losowania (domyślnie 0)")
+    parser.add_argument('--runs', type=int, default=100, help="liczba przebiegów (kolejne ziarna)")
+    parser.add_argument('--workers', type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument('--engine', choices=ENGINES, default='objects', help="silnik symulacji")
+    parser.add_argument('--max-turns', type=int, default=DEFAULT_MAX_TURNS, help="limit tur jednego przebiegu")
+    parser.add_argument('--stalemate-turns', type=int, default=DEFAULT_STALEMATE_TURNS,
+                        help="zakończ po tylu turach bez zmian terytorium/populacji i bez walk")
+    parser.add_argument('--params', metavar='FILE', default=None, help="parametry rozgrywki z pliku .toml lub .json")
+    parser.add_argument('--set', metavar='NAME=VALUE', action='append', default=[], dest='overrides',
+                        help="nadpisz pojedynczy parametr (można powtarzać), np. --set expansion_cost=250")
+    parser.add_argument('--output', default='batch_results.csv', help="plik wynikowy CSV")
+    args = parser.parse_args(argv)
+
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_turns < 1:
+        parser.error("--max-turns must be at least 1")
+    if args.stalemate_turns < 1:
+        parser.error("--stalemate-turns must be at least 1")
+    try:
+        create_simulation(args.board_size, args.tribes, None, args.engine).validate_parameters()
+        params = SimulationParams.load(args.params) if args.params is not None else DEFAULT_PARAMS
+        args.params = params.with_overrides(**dict(parse_override(text) for text in args.overrides))
+    except (ValueError, OSError, ImportError) as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv=None):
+    """Punkt wejścia `tribes-batch`"""
+    args = parse_args(argv)
+    seeds = range(args.seed_start, args.seed_start + args.runs)
+
+    start = time.perf_counter()
+    settings = RunSettings(max_turns=args.max_turns, stalemate_turns=args.stalemate_turns)
+    results = run_batch(args.board_size, args.tribes, seeds, args.workers, args.engine, settings, args.params)
+    elapsed = time.perf_counter() - start
+    write_results(results, args.output)
+
+    wins = Counter(result['winner'] for result in results)
+    print(f"Zakończono {len(results)} symulacji w {elapsed:.2f} s. Wyniki zapisano do {args.output}")
+    for winner, count in wins.most_common(10):
+        label = "brak zwycięzcy" if winner is None else f"Plemię {winner}"
+        print(f"  {label}: {count} ({count / len(results):.1%})")
+    reasons = Counter(result['termination_reason'] for result in results)
+    print("Powody zakończenia: " + ", ".join(f"{reason}={count}" for reason, count in reasons.most_common()))
+
+
+if __name__ == "__main__":
+    main()
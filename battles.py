@@ -0,0 +1,57 @@
+"""Zbiorcze rozstrzyganie walk w turze (tryb ``battle_mode='batched'``).
+
+Stykające się pary plemion (w kolejności rosnących id) dzielone są na rundy
+rozłącznych par: para trafia do rundy o jeden późniejszej niż ostatnia walka
+któregokolwiek z jej plemion. Kolejność walk każdego plemienia jest więc
+taka sama jak przy rozstrzyganiu par po kolei, a w obrębie rundy siły,
+zwycięzców i straty można policzyć jedną operacją na tablicach.
+
+Losowania (atakujący, przejęte zasoby) wykonywane są z góry dla całej
+rundy, więc przy tym samym ziarnie przebieg różni się od trybu
+``'sequential'``, ale wzory na zwycięzcę i straty są te same co w
+``Board.battle``. Wymaga NumPy.
+"""
+
+BATTLE_MODES = ('sequential', 'batched')
+
+
+def battle_rounds(pairs):
+    """Podziel pary (w podanej kolejności) na rundy, w których każde plemię walczy co najwyżej raz"""
+    last_round = {}  # id plemienia -> numer rundy jego ostatniej walki
+    rounds = []
+    for pair in pairs:
+        first, second = pair
+        number = max(last_round.get(first, -1), last_round.get(second, -1)) + 1
+        if number == len(rounds):
+            rounds.append([])
+        rounds[number].append(pair)
+        last_round[first] = last_round[second] = number
+    return rounds
+
+
+def resolve_battles(attacker_strength, defender_strength, attacker_warriors, defender_warriors):
+    """Wyznacz wyniki rundy walk naraz (ten sam wzór co Board.battle).
+
+    Argumenty to sekwencje równej długości (siły i liczby wojowników stron).
+    Zwraca tablice: decisive (czy walka się odbyła - nie remis 0:0), attacker_wins,
+    winner_losses (wg wzoru, bez przycięcia do liczby wojowników) i loser_losses.
+    """
+    import numpy as np
+
+    attacker_strength = np.asarray(attacker_strength, dtype=np.int64)
+    defender_strength = np.asarray(defender_strength, dtype=np.int64)
+    attacker_warriors = np.asarray(attacker_warriors, dtype=np.int64)
+    defender_warriors = np.asarray(defender_warriors, dtype=np.int64)
+
+    decisive = (attacker_strength != 0) | (defender_strength != 0)
+    attacker_wins = attacker_strength > defender_strength
+    winner_strength = np.where(attacker_wins, attacker_strength, defender_strength)
+    loser_strength = np.where(attacker_wins, defender_strength, attacker_strength)
+    winner_warriors = np.where(attacker_wins, attacker_warriors, defender_warriors)
+    loser_losses = np.where(attacker_wins, defender_warriors, attacker_warriors)
+
+    # Wzór: (W_wyg / S_wyg) * (S_przeg / S_wyg) * W_wyg, obcięty do liczby całkowitej jak int()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        losses = (winner_warriors / winner_strength) * (loser_strength / winner_strength) * winner_warriors
+    winner_losses = np.where(decisive & (winner_strength > 0), losses, 0).astype(np.int64)
+    return decisive, attacker_wins, winner_losses, np.where(decisive, loser_losses, 0)
@@ -0,0 +1,206 @@
+"""Powtarzalny benchmark wydajności symulacji.
+
+Uruchamia symulacje z ustalonym ziarnem (bez wyjścia na konsolę i bez zapisu
+CSV) dla macierzy rozmiarów planszy i liczby plemion w granicach z
+``config.py`` i mierzy: tury na sekundę, czas inicjalizacji, czas faz tury
+oraz szczytowe zużycie pamięci (tracemalloc, w osobnym przebiegu).
+
+Przykład::
+
+    tribes-bench --save baseline.json
+    tribes-bench --compare baseline.json --tolerance 0.2
+    tribes-bench --policy my_policies:AGGRESSIVE --save aggressive.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from config import MIN_BOARD_SIZE, MAX_BOARD_SIZE, DENSE_BOARD_LIMIT, MIN_TRIBES, MAX_TRIBES_RATIO
+from profiling import PhaseProfiler
+from recorder import NullRecorder
+from batch import ENGINES, create_simulation
+from params import DEFAULT_SETTINGS, RunSettings
+from policy import load_policy
+
+DEFAULT_SIZES = (MIN_BOARD_SIZE, 25, 50, DENSE_BOARD_LIMIT)
+DEFAULT_TURNS = 200
+DEFAULT_SEED = 12345
+DEFAULT_TOLERANCE = 0.2
+DEFAULT_REPEAT = 3
+
+
+def tribe_counts(board_size):
+    """Liczby plemion dla danej planszy: minimum, wartość pośrednia i maksimum z config"""
+    max_tribes = (board_size ** 2) // MAX_TRIBES_RATIO
+    middle = max(MIN_TRIBES, int((MIN_TRIBES * max_tribes) ** 0.5))
+    return sorted({MIN_TRIBES, middle, max_tribes})
+
+
+def benchmark_cases(sizes=DEFAULT_SIZES, engines=('objects',)):
+    """Zwróć listę przypadków (silnik, rozmiar planszy, liczba plemion)"""
+    return [(engine, size, tribes) for engine in engines for size in sizes for tribes in tribe_counts(size)]
+
+
+def case_name(engine, board_size, tribes_count):
+    return f"{engine}-{board_size}x{board_size}-{tribes_count}"
+
+
+def play(sim, max_turns):
+    """Rozegraj symulację do zwycięstwa lub limitu tur, bez wypisywania na konsolę"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        sim.initialize()
+        initialize_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        while sim.alive_tribes_count() > 1 and sim.turn < max_turns:
+            sim.step()
+        turns_seconds = time.perf_counter() - start
+        sim.save_to_csv()
+    return initialize_seconds, turns_seconds
+
+
+def run_case(engine, board_size, tribes_count, max_turns=DEFAULT_TURNS, seed=DEFAULT_SEED, memory=True,
+             repeat=DEFAULT_REPEAT, settings=DEFAULT_SETTINGS):
+    """Zmierz jeden przypadek (najszybszy z `repeat` przebiegów); zwraca słownik z wynikami"""
+    if max_turns < 1:
+        raise ValueError("Turn limit must be at least 1")
+    if repeat < 1:
+        raise ValueError("Repeat count must be at least 1")
+    best = None
+    for _ in range(repeat):
+        sim = create_simulation(board_size, tribes_count, seed, engine, settings=settings)
+        sim.recorder = NullRecorder()
+        sim.profiler = PhaseProfiler()
+        timings = play(sim, max_turns)
+        if best is None or timings[1] < best[1][1]:
+            best = (sim, timings)
+    sim, (initialize_seconds, turns_seconds) = best
+
+    result = {
+        'case': case_name(engine, board_size, tribes_count),
+        'engine': engine,
+        'board_size': board_size,
+        'tribes_count': tribes_count,
+        'turns': sim.turn,
+        'initialize_seconds': initialize_seconds,
+        'seconds': turns_seconds,
+        'turns_per_second': sim.turn / turns_seconds if turns_seconds > 0 else float('inf'),
+        'phases': {name: stats['per_turn'] for name, stats in sim.profiler.report().items()},
+        'peak_memory_kb': None
+    }
+
+    # Pamięć mierzona osobno - tracemalloc spowalnia i zafałszowałby czasy
+    if memory:
+        sim = create_simulation(board_size, tribes_count, seed, engine, settings=settings)
+        sim.recorder = NullRecorder()
+        tracemalloc.start()
+        try:
+            play(sim, max_turns)
+            result['peak_memory_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Porównaj wyniki z zapisanym punktem odniesienia; zwróć listę opisów regresji"""
+    baseline_cases = {entry['case']: entry for entry in baseline['results']}
+    regressions = []
+    for result in results:
+        reference = baseline_cases.get(result['case'])
+        if reference is None:
+            continue
+        if reference['turns'] != result['turns']:
+            # Inna liczba tur - przebieg się zmienił, porównanie czasów jest mniej miarodajne
+            regressions.append(f"{result['case']}: turns {reference['turns']} -> {result['turns']} (trajectory changed)")
+        if result['turns_per_second'] < reference['turns_per_second'] * (1 - tolerance):
+            regressions.append(f"{result['case']}: turns/s {reference['turns_per_second']:.1f} -> {result['turns_per_second']:.1f}")
+        if result['initialize_seconds'] > reference['initialize_seconds'] * (1 + tolerance) + 0.001:
+            regressions.append(f"{result['case']}: initialize {reference['initialize_seconds']:.4f}s -> {result['initialize_seconds']:.4f}s")
+        if (result['peak_memory_kb'] is not None and reference.get('peak_memory_kb') is not None
+                and result['peak_memory_kb'] > reference['peak_memory_kb'] * (1 + tolerance)):
+            regressions.append(f"{result['case']}: peak memory {reference['peak_memory_kb']} kB -> {result['peak_memory_kb']} kB")
+        for phase, per_turn in result['phases'].items():
+            reference_per_turn = reference['phases'].get(phase)
+            # Pomijamy fazy trwające poniżej 0.1 ms na turę - tam dominuje szum pomiaru
+            if reference_per_turn and reference_per_turn > 1e-4 and per_turn > reference_per_turn * (1 + tolerance):
+                regressions.append(f"{result['case']}: phase {phase} {reference_per_turn * 1000:.3f} ms -> {per_turn * 1000:.3f} ms per turn")
+    return regressions
+
+
+def format_result(result):
+    memory = '-' if result['peak_memory_kb'] is None else f"{result['peak_memory_kb']} kB"
+    slowest = max(result['phases'].items(), key=lambda item: item[1], default=('-', 0))
+    return (f"{result['case']:<24} {result['turns']:>6} {result['turns_per_second']:>10.1f} "
+            f"{result['initialize_seconds'] * 1000:>10.2f} {memory:>12}  {slowest[0]}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark wydajności symulacji plemion.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="rozmiary planszy")
+    parser.add_argument('--engines', choices=ENGINES, nargs='+', default=['objects'], help="silniki do zmierzenia")
+    parser.add_argument('--turns', type=int, default=DEFAULT_TURNS, help="maksymalna liczba tur na przypadek")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="ziarno losowania")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="liczba powtórzeń (liczy się najszybsze)")
+    parser.add_argument('--no-memory', action='store_true', help="pomiń pomiar pamięci")
+    parser.add_argument('--save', metavar='FILE', help="zapisz wyniki jako punkt odniesienia (JSON)")
+    parser.add_argument('--compare', metavar='FILE', help="porównaj z zapisanym punktem odniesienia")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="dopuszczalne pogorszenie (ułamek)")
+    parser.add_argument('--policy', metavar='MODULE:NAME', help="strategia plemion (domyślnie policy.DEFAULT_POLICY)")
+    args = parser.parse_args(argv)
+    if args.turns < 1:
+        parser.error("--turns must be at least 1")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    for size in args.sizes:
+        if not MIN_BOARD_SIZE <= size <= MAX_BOARD_SIZE:
+            parser.error(f"Board size must be between {MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}")
+        for engine in args.engines:
+            try:
+                create_simulation(size, MIN_TRIBES, None, engine).validate_parameters()
+            except (ValueError, ImportError) as error:
+                parser.error(str(error))
+    if args.policy is not None:
+        try:
+            args.policy = load_policy(args.policy)
+        except (ValueError, ImportError, AttributeError) as error:
+            parser.error(f"Cannot load policy: {error}")
+    return args
+
+
+def main(argv=None):
+    """Punkt wejścia `tribes-bench`"""
+    args = parse_args(argv)
+    print(f"{'przypadek':<24} {'tury':>6} {'tury/s':>10} {'init [ms]':>10} {'pamięć':>12}  najwolniejsza faza")
+
+    results = []
+    for engine, size, tribes in benchmark_cases(args.sizes, args.engines):
+        result = run_case(engine, size, tribes, args.turns, args.seed, memory=not args.no_memory, repeat=args.repeat,
+                          settings=RunSettings(policy=args.policy))
+        results.append(result)
+        print(format_result(result))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'seed': args.seed, 'turns': args.turns, 'results': results}, f, indent=2)
+        print(f"Zapisano punkt odniesienia do {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Wykryto regresje:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("Brak regresji względem punktu odniesienia.")
+
+
+if __name__ == "__main__":
+    main()
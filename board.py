@@ -1,127 +1,252 @@
-import random
-from config import STOLE_RESOURCES_MIN, STOLE_RESOURCES_MAX
-
-
-class Board:
-    """Klasa reprezentująca planszę"""
-
-    # Lista kodów kolorów ANSI, które będziemy cyklicznie przypisywać plemionom
-    COLOR_CODES = [
-        '\033[31m',  # czerwony
-        '\033[32m',  # zielony
-        '\033[33m',  # żółty
-        '\033[34m',  # niebieski
-        '\033[35m',  # magenta
-        '\033[36m',  # cyjan
-        '\033[91m',  # jasny czerwony
-        '\033[92m',  # jasny zielony
-        '\033[93m',  # jasny żółty
-        '\033[94m',  # jasny niebieski
-        '\033[95m',  # jasny magenta
-        '\033[96m',  # jasny cyjan
-    ]
-    RESET_CODE = '\033[0m'  # reset koloru (przywrócenie domyślnego)
-
-
-    def __init__(self, size):
-        self.size = size
-        self.grid = [[None for _ in range(size)] for _ in range(size)]
-        self.tribes = []  # agregacja - plemiona
-
-    def place_tribe(self, tribe):
-        """Umieść plemię na planszy"""
-        self.tribes.append(tribe)
-
-    def get_random_empty_position(self):
-        """Znajdź losowe puste pole na planszy"""
-        empty_positions = []
-        for x in range(self.size):
-            for y in range(self.size):
-                if self.grid[x][y] is None:
-                    empty_positions.append((x, y))
-        return random.choice(empty_positions) if empty_positions else None
-
-    def remove_tribe(self, tribe):
-        """Usuń plemię z planszy"""
-        if tribe in self.tribes:
-            self.tribes.remove(tribe)
-            tribe.is_alive = False
-            for x, y in tribe.territory:
-                self.grid[x][y] = None
-
-    def have_shared_border(self, tribe1, tribe2):
-        """Sprawdź czy dwa plemiona mają wspólną granicę"""
-        for x1, y1 in tribe1.territory:
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                nx, ny = x1 + dx, y1 + dy
-                if (nx, ny) in tribe2.territory:
-                    return True
-        return False
-
-    def battle(self, attacker, defender):
-        """Rozstrzygnij walkę między plemionami"""
-        strength_attacker = attacker.total_strength()
-        strength_defender = defender.total_strength()
-
-        # Jeśli obie siły są zerowe, to remis - nie ma walki
-        if strength_attacker == 0 and strength_defender == 0:
-            return None, None, 0, 0
-
-        # Określenie zwycięzcy na podstawie siły
-        if strength_attacker > strength_defender:
-            winner, loser = attacker, defender
-            winner_strength, loser_strength = strength_attacker, strength_defender
-        else:
-            winner, loser = defender, attacker
-            winner_strength, loser_strength = strength_defender, strength_attacker
-
-        # Oblicz straty zwycięzcy zgodnie z wzorem
-        winner_losses = 0
-        if winner_strength > 0:
-            # Wzór: (W_wyg / S_wyg) * (S_przeg / S_wyg) * W_wyg
-            winner_losses = int((len(winner.warriors) / winner_strength) * (loser_strength / winner_strength) * len(winner.warriors))
-
-
-        # Zastosuj straty zwycięzcy - usuń wojowników
-        # Uwaga: min(winner_losses, len(winner.warriors)) aby nie przekroczyć
-        for _ in range(min(winner_losses, len(winner.warriors))):
-            if winner.warriors:
-                winner.warriors.pop()
-
-        # Przegrany traci WSZYSTKICH wojowników
-        loser_losses = len(loser.warriors)
-        loser.warriors = []
-
-        # Przejęcie zasobów
-        winner.building_materials += loser.building_materials * random.uniform(STOLE_RESOURCES_MIN, STOLE_RESOURCES_MAX)
-        winner.food += loser.food * random.uniform(STOLE_RESOURCES_MIN, STOLE_RESOURCES_MAX)
-
-        # Usuń przegranego z planszy
-        self.remove_tribe(loser)
-
-        return winner, loser, winner_losses, loser_losses
-
-    def display_board(self):
-        """Wyświetl planszę w konsoli."""
-        # Maksymalna szerokość
-        max_id = 0
-        for row in self.grid:
-            for cell in row:
-                if cell is not None and cell > max_id:
-                    max_id = cell
-        # min 2, max 3 (zależnie od długości maksymalnej ID plemienia)
-        cell_width = max(2, len(str(max_id)))
-
-        print("\n--- Plansza ---")
-        for row in self.grid:
-            for cell in row:
-                if cell is not None:
-                    color_code = self.COLOR_CODES[cell % len(self.COLOR_CODES)]
-                    # rjust dopełnia spacji z lewej, więc ' 10' zamiast '10'
-                    cell_str = str(cell).rjust(cell_width)
-                    print(f"{color_code}{cell_str}{self.RESET_CODE}", end=' ')
-                else:
-                    # analogicznie do pustego pola: kropka w położeniu wycentrowanym
-                    print(f"{'.'.rjust(cell_width)}", end=' ')
-            print()
-        print("---------------\n")
\ No newline at end of file
+import random
+import sys
+from indexed_set import IndexedSet
+from grid import ChunkedGrid, SparseFreeCells
+from config import DENSE_BOARD_LIMIT
+from params import DEFAULT_PARAMS
+from renderer import COLOR_CODES, RESET_CODE, cell_width_for, format_grid
+
+
+class Board:
+    """Klasa reprezentująca planszę"""
+
+    # Kody kolorów ANSI, które cyklicznie przypisujemy plemionom (wspólne z rendererem)
+    COLOR_CODES = COLOR_CODES
+    RESET_CODE = RESET_CODE
+
+    # Przesunięcia do czterech sąsiednich pól (góra, dół, prawo, lewo)
+    NEIGHBOR_OFFSETS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+    def __init__(self, size, rng=None, params=DEFAULT_PARAMS):
+        self.size = size
+        # Własny generator liczb losowych planszy (wspólny z jej plemionami)
+        self.rng = rng if rng is not None else random.Random()
+        # Parametry rozgrywki (params.SimulationParams) - wspólne z plemionami planszy
+        self.params = params
+        self.next_tribe_id = 0  # kolejne wolne id plemienia na tej planszy
+        self.max_tribe_id = 0  # największe przydzielone id (szerokość pola przy wyświetlaniu)
+        if size > DENSE_BOARD_LIMIT:
+            # Duża plansza: kafle tylko tam, gdzie są plemiona, wolne pola losowane metodą odrzucania
+            self.grid = ChunkedGrid(size)
+            self.free_cells = SparseFreeCells(self.grid)
+        else:
+            self.grid = [[None for _ in range(size)] for _ in range(size)]
+            # Pula wolnych pól - losowanie i aktualizacja w O(1)
+            self.free_cells = IndexedSet((x, y) for x in range(size) for y in range(size))
+        self.tribes = []  # agregacja - plemiona
+        self.tribes_by_id = {}  # szybki dostęp do plemienia po id (także przed place_tribe)
+        # Indeks styków: (mniejsze_id, większe_id) -> liczba stykających się krawędzi pól
+        self.contacts = {}
+        # Obserwatorzy zdarzeń planszy przekazywanych przez notify: zmian pól (metoda
+        # cell_changed(x, y, wartość), np. renderer) i zdarzeń plemion (np. events.EventLog);
+        # obserwator implementuje tylko metody zdarzeń, które go interesują
+        self.observers = []
+
+    def allocate_tribe_id(self):
+        """Przydziel kolejne id plemienia na tej planszy"""
+        tribe_id = self.next_tribe_id
+        self.next_tribe_id += 1
+        self.max_tribe_id = tribe_id
+        return tribe_id
+
+    def add_observer(self, observer):
+        """Zarejestruj obserwatora zmian pól planszy"""
+        self.observers.append(observer)
+
+    def notify(self, event, *args):
+        """Przekaż zdarzenie obserwatorom, którzy mają metodę o nazwie event"""
+        for observer in self.observers:
+            handler = getattr(observer, event, None)
+            if handler is not None:
+                handler(*args)
+
+    def place_tribe(self, tribe):
+        """Umieść plemię na planszy"""
+        self.tribes.append(tribe)
+        self.tribes_by_id[tribe.id] = tribe
+
+    def get_tribe(self, tribe_id):
+        """Zwróć plemię o podanym id (lub None, jeśli nie zajmuje pól na planszy)"""
+        return self.tribes_by_id.get(tribe_id)
+
+    def neighbors(self, x, y):
+        """Zwróć sąsiednie pola (x, y) leżące w granicach planszy"""
+        for dx, dy in self.NEIGHBOR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                yield nx, ny
+
+    @staticmethod
+    def contact_key(tribe_id1, tribe_id2):
+        """Klucz pary plemion w indeksie styków (niezależny od kolejności)"""
+        return (tribe_id1, tribe_id2) if tribe_id1 < tribe_id2 else (tribe_id2, tribe_id1)
+
+    def claim_cell(self, x, y, tribe):
+        """Zajmij pole (x, y) przez plemię i zaktualizuj indeks styków oraz granice (frontier) plemion"""
+        previous = self.grid[x][y]
+        if previous == tribe.id:
+            return
+        if previous is not None:
+            self.release_cell(x, y)
+
+        self.tribes_by_id.setdefault(tribe.id, tribe)
+        self.grid[x][y] = tribe.id
+        self.free_cells.discard((x, y))
+        self.notify('cell_changed', x, y, tribe.id)
+        tribe.frontier.discard((x, y))
+        for nx, ny in self.neighbors(x, y):
+            other = self.grid[nx][ny]
+            if other is None:
+                # Puste sąsiednie pole staje się kandydatem do ekspansji
+                tribe.frontier.add((nx, ny))
+            elif other != tribe.id:
+                key = self.contact_key(tribe.id, other)
+                self.contacts[key] = self.contacts.get(key, 0) + 1
+                # Zajęte pole nie jest już wolne dla sąsiedniego plemienia
+                self.tribes_by_id[other].frontier.discard((x, y))
+
+    def release_cell(self, x, y):
+        """Zwolnij pole (x, y) i zaktualizuj indeks styków oraz granice (frontier) plemion"""
+        owner = self.grid[x][y]
+        if owner is None:
+            return
+
+        self.grid[x][y] = None
+        self.free_cells.add((x, y))
+        self.notify('cell_changed', x, y, None)
+        owner_tribe = self.tribes_by_id[owner]
+        for nx, ny in self.neighbors(x, y):
+            other = self.grid[nx][ny]
+            if other is None:
+                # Puste pole zostaje w granicy właściciela tylko, jeśli nadal sąsiaduje z jego terytorium
+                if not self._touches(nx, ny, owner):
+                    owner_tribe.frontier.discard((nx, ny))
+            elif other == owner:
+                owner_tribe.frontier.add((x, y))
+            else:
+                key = self.contact_key(owner, other)
+                remaining = self.contacts[key] - 1
+                if remaining:
+                    self.contacts[key] = remaining
+                else:
+                    del self.contacts[key]
+                # Zwolnione pole staje się kandydatem do ekspansji sąsiada
+                self.tribes_by_id[other].frontier.add((x, y))
+
+    def _touches(self, x, y, tribe_id):
+        """Sprawdź, czy pole (x, y) sąsiaduje z polem plemienia o danym id"""
+        return any(self.grid[nx][ny] == tribe_id for nx, ny in self.neighbors(x, y))
+
+    def restore(self, free_cells, tribes, next_tribe_id):
+        """Odtwórz stan pustej planszy z checkpointu (bez powiadamiania obserwatorów).
+
+        free_cells: wolne pola w kolejności puli (None dla rzadkiej planszy - pula wynika z siatki),
+        tribes: odtworzone plemiona (z terytorium i granicą) w kolejności self.tribes.
+        Siatka odtwarzana jest z terytoriów plemion.
+        """
+        if free_cells is not None:
+            self.free_cells = IndexedSet(free_cells)
+        self.next_tribe_id = next_tribe_id
+        self.max_tribe_id = max(0, next_tribe_id - 1)
+        self.tribes = []
+        self.tribes_by_id = {}
+        for tribe in tribes:
+            self.place_tribe(tribe)
+            for x, y in tribe.territory:
+                self.grid[x][y] = tribe.id
+
+        # Indeks styków przeliczany od zera (kolejność kluczy nie wpływa na przebieg)
+        self.contacts = {}
+        for tribe in tribes:
+            for x, y in tribe.territory:
+                for nx, ny in ((x + 1, y), (x, y + 1)):
+                    if nx < self.size and ny < self.size:
+                        other = self.grid[nx][ny]
+                        if other is not None and other != tribe.id:
+                            key = self.contact_key(tribe.id, other)
+                            self.contacts[key] = self.contacts.get(key, 0) + 1
+
+    def contacting_pairs(self):
+        """Zwróć posortowaną listę par id plemion, które obecnie się stykają"""
+        return sorted(self.contacts)
+
+    def get_random_empty_position(self):
+        """Znajdź losowe puste pole na planszy (O(1) dzięki puli wolnych pól)"""
+        return self.free_cells.choice(self.rng) if self.free_cells else None
+
+    def remove_tribe(self, tribe):
+        """Usuń plemię z planszy"""
+        if tribe in self.tribes:
+            self.notify('tribe_removed', tribe.id)
+            self.tribes.remove(tribe)
+            tribe.is_alive = False
+            # Stała kolejność zwalniania pól - przebieg nie zależy od kolejności iteracji zbioru
+            for x, y in sorted(tribe.territory):
+                if self.grid[x][y] == tribe.id:
+                    self.release_cell(x, y)
+            tribe.frontier.clear()
+            self.tribes_by_id.pop(tribe.id, None)
+
+    def have_shared_border(self, tribe1, tribe2):
+        """Sprawdź czy dwa plemiona mają wspólną granicę (O(1) dzięki indeksowi styków)"""
+        return self.contact_key(tribe1.id, tribe2.id) in self.contacts
+
+    def battle(self, attacker, defender):
+        """Rozstrzygnij walkę między plemionami"""
+        strength_attacker = attacker.total_strength()
+        strength_defender = defender.total_strength()
+
+        # Jeśli obie siły są zerowe, to remis - nie ma walki
+        if strength_attacker == 0 and strength_defender == 0:
+            return None, None, 0, 0
+
+        # Określenie zwycięzcy na podstawie siły
+        if strength_attacker > strength_defender:
+            winner, loser = attacker, defender
+            winner_strength, loser_strength = strength_attacker, strength_defender
+        else:
+            winner, loser = defender, attacker
+            winner_strength, loser_strength = strength_defender, strength_attacker
+
+        # Oblicz straty zwycięzcy zgodnie z wzorem
+        winner_losses = 0
+        if winner_strength > 0:
+            # Wzór: (W_wyg / S_wyg) * (S_przeg / S_wyg) * W_wyg
+            winner_losses = int((len(winner.warriors) / winner_strength) * (loser_strength / winner_strength) * len(winner.warriors))
+
+
+        params = self.params
+        materials_share = self.rng.uniform(params.stole_resources_min, params.stole_resources_max)
+        food_share = self.rng.uniform(params.stole_resources_min, params.stole_resources_max)
+        loser_losses = self.apply_battle(winner, loser, winner_losses, materials_share, food_share)
+
+        return winner, loser, winner_losses, loser_losses
+
+    def apply_battle(self, winner, loser, winner_losses, materials_share, food_share):
+        """Zastosuj wynik walki: straty, przejęcie zasobów i usunięcie przegranego; zwraca straty przegranego"""
+        # Zastosuj straty zwycięzcy - usuń wojowników (pop_many nie usunie więcej niż jest)
+        removed = winner.warriors.pop_many(winner_losses)
+        if removed:
+            self.notify('units_lost', winner.id, 0, removed)
+
+        # Przegrany traci WSZYSTKICH wojowników
+        loser_losses = len(loser.warriors)
+        loser.warriors.clear()
+
+        # Przejęcie zasobów
+        winner.building_materials += loser.building_materials * materials_share
+        winner.food += loser.food * food_share
+
+        # Usuń przegranego z planszy
+        self.remove_tribe(loser)
+        return loser_losses
+
+    def display_board(self):
+        """Wyświetl planszę w konsoli (cała klatka jednym zapisem)."""
+        self.print_grid(self.grid, self.max_tribe_id)
+
+    @staticmethod
+    def print_grid(grid, max_id=0):
+        """Wyświetl w konsoli siatkę (wiersze z id plemion lub None)."""
+        sys.stdout.write(format_grid(grid, cell_width_for(max_id)))
@@ -0,0 +1,183 @@
+"""Zapis i wznawianie stanu trwającej symulacji (checkpointy).
+
+Plik checkpointu to nagłówek ``TRIBECKP`` z numerem wersji formatu, po którym
+następuje skompresowane zlib ciało: blok metadanych JSON (parametry, tura,
+stan generatora, liczniki plemion, log walk, pozycje plików wynikowych) oraz
+nazwane sekcje binarne (siatka, pule pól). Format nie używa pickle, więc
+wczytanie cudzego pliku nie wykonuje żadnego kodu.
+
+Przykład::
+
+    tribes-resume simulation.ckpt --checkpoint-every 100
+    tribes-resume simulation.ckpt --max-turns 20000  # dłuższy limit niż w zapisanym przebiegu
+"""
+import argparse
+import json
+import os
+import struct
+import zlib
+from array import array
+
+from params import RunSettings, SimulationParams
+
+MAGIC = b'TRIBECKP'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<8sI')
+_LENGTH = struct.Struct('<Q')
+
+
+def encode_checkpoint(meta, sections):
+    """Zakoduj stan jako bajty checkpointu (nagłówek + skompresowane ciało).
+
+    sections: nazwa -> ``array.array`` lub ``bytes``; typ elementów zapisywany jest w metadanych.
+    """
+    layout = []
+    chunks = []
+    for name, data in sections.items():
+        typecode = data.typecode if isinstance(data, array) else None
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        layout.append([name, typecode, len(raw)])
+        chunks.append(raw)
+    header = json.dumps({'meta': meta, 'sections': layout}).encode('utf-8')
+    body = zlib.compress(_LENGTH.pack(len(header)) + header + b''.join(chunks))
+    return _HEADER.pack(MAGIC, FORMAT_VERSION) + body
+
+
+def write_checkpoint(path, meta, sections):
+    """Zapisz checkpoint atomowo (plik tymczasowy + os.replace)"""
+    data = encode_checkpoint(meta, sections)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(path):
+    """Wczytaj checkpoint; zwraca (meta, sections)"""
+    with open(path, 'rb') as f:
+        return decode_checkpoint(f.read(), path)
+
+
+def decode_checkpoint(data, path='checkpoint'):
+    """Odkoduj bajty checkpointu; zwraca (meta, sections). path służy tylko komunikatom błędów"""
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path} is not a simulation checkpoint")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a simulation checkpoint")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version} (expected {FORMAT_VERSION})")
+
+    body = zlib.decompress(data[_HEADER.size:])
+    (header_length,) = _LENGTH.unpack_from(body)
+    offset = _LENGTH.size
+    header = json.loads(body[offset:offset + header_length].decode('utf-8'))
+    offset += header_length
+
+    sections = {}
+    for name, typecode, length in header['sections']:
+        raw = body[offset:offset + length]
+        if typecode is None:
+            sections[name] = raw
+        else:
+            sections[name] = array(typecode)
+            sections[name].frombytes(raw)
+        offset += length
+    return header['meta'], sections
+
+
+def save_checkpoint(sim, path):
+    """Zapisz stan symulacji do pliku"""
+    meta, sections = sim.snapshot()
+    write_checkpoint(path, meta, sections)
+
+
+def load_checkpoint(path, recorder=None, reseed=None, **options):
+    """Odtwórz symulację z checkpointu.
+
+    recorder: rekorder dla dalszej części przebiegu (domyślnie ``run`` utworzy nowy),
+    reseed: nowe ziarno - rozgałęzienie przebiegu od zapisanej tury ("co by było, gdyby"),
+    options: dodatkowe argumenty konstruktora (np. display, checkpoint_every); parametry,
+    ustawienia przebiegu (settings) i tryb zapisane w checkpoincie obowiązują, jeśli ich
+    nie podano. Strategia plemion nie jest zapisywana - własną trzeba przekazać w settings.
+    """
+    meta, sections = read_checkpoint(path)
+    sim = restore_simulation(meta, sections, recorder, **options)
+    if reseed is not None:
+        sim.reseed(reseed)
+    return sim
+
+
+def restore_simulation(meta, sections, recorder=None, **options):
+    """Utwórz symulację silnika zapisanego w meta i odtwórz w niej stan"""
+    if meta['engine'] == 'vector':
+        from vector_engine import VectorSimulation as engine  # wymaga NumPy
+    elif meta['engine'] == 'parallel':
+        from parallel_engine import ParallelVectorSimulation as engine  # wymaga NumPy
+    else:
+        from simulation import Simulation as engine
+    options.setdefault('time_per_turn', meta['time_per_turn'])
+    if 'params' in meta:  # checkpointy sprzed parametryzacji mają parametry domyślne
+        options.setdefault('params', SimulationParams.from_dict(meta['params']))
+    # Starsze checkpointy nie zapisywały ustawień przebiegu - wtedy domyślne lub podane w options
+    if 'settings' in meta:
+        options.setdefault('settings', RunSettings.from_dict(meta['settings']))
+    if 'mode' in meta:
+        options.setdefault('mode', meta['mode'])
+        options.setdefault('report_every', meta['report_every'])
+    sim = engine(meta['board_size'], meta['tribes_count'], seed=meta['seed'], recorder=recorder, **options)
+    sim.restore(meta, sections)
+    return sim
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Wznowienie symulacji plemion z checkpointu.")
+    parser.add_argument('checkpoint', help="plik checkpointu")
+    parser.add_argument('--reseed', type=int, default=None, help="nowe ziarno (rozgałęzienie przebiegu)")
+    parser.add_argument('--checkpoint-every', type=int, default=None, help="zapisuj checkpoint co N tur")
+    parser.add_argument('--output-dir', default='.', help="katalog plików CSV (kontynuowanych, jeśli istnieją)")
+    parser.add_argument('--display', choices=('full', 'diff', 'off'), default='full', help="tryb wyświetlania planszy")
+    parser.add_argument('--max-turns', type=int, default=None,
+                        help="limit tur przebiegu (domyślnie zapisany w checkpoincie)")
+    parser.add_argument('--stalemate-turns', type=int, default=None,
+                        help="limit tur bez zmian i walk (domyślnie zapisany w checkpoincie)")
+    args = parser.parse_args(argv)
+    if args.checkpoint_every is not None and args.checkpoint_every < 1:
+        parser.error("--checkpoint-every must be at least 1")
+    if args.max_turns is not None and args.max_turns < 1:
+        parser.error("--max-turns must be at least 1")
+    if args.stalemate_turns is not None and args.stalemate_turns < 1:
+        parser.error("--stalemate-turns must be at least 1")
+    return args
+
+
+def main(argv=None):
+    """Punkt wejścia `tribes-resume`"""
+    from recorder import CsvRecorder
+
+    args = parse_args(argv)
+    meta, _ = read_checkpoint(args.checkpoint)
+    # Pliki CSV przycinane są do stanu z chwili zapisu checkpointu, a rozgałęzienie zaczyna nowe
+    offsets = meta['recorder_offsets'] if args.reseed is None else None
+    recorder = CsvRecorder(directory=args.output_dir, offsets=offsets)
+    # Limity z linii poleceń zastępują zapisane; pozostałe ustawienia przebiegu zostają bez zmian
+    settings = RunSettings.from_dict(meta['settings']) if 'settings' in meta else RunSettings()
+    overrides = {name: getattr(args, name) for name in ('max_turns', 'stalemate_turns')
+                 if getattr(args, name) is not None}
+    sim = load_checkpoint(
+        args.checkpoint,
+        recorder=recorder,
+        reseed=args.reseed,
+        display=args.display,
+        checkpoint_every=args.checkpoint_every,
+        checkpoint_path=args.checkpoint,
+        settings=settings.with_overrides(**overrides)
+    )
+    print(f"Wznowiono symulację od tury {sim.turn}.")
+    sim.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Wyjście symulacji na konsolę przez moduł ``logging``.
+
+Wszystkie komunikaty symulacji (nagłówki tur, statystyki, walki,
+podsumowanie) trafiają do loggera ``tribes``. W trybie zwykłym szczegóły tur
+logowane są na poziomie INFO, a w trybie szybkim na DEBUG, więc przy
+domyślnym poziomie INFO znikają bez zmiany kodu symulacji.
+"""
+import logging
+import sys
+
+logger = logging.getLogger('tribes')
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Handler piszący zawsze do bieżącego ``sys.stdout`` (działa z ``contextlib.redirect_stdout``)"""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def configure_logging(level=None):
+    """Dołącz (jednorazowo) handler wypisujący same komunikaty i ustaw poziom loggera ``tribes``.
+
+    level: poziom logowania; None zostawia poziom ustawiony wcześniej (domyślnie INFO).
+    """
+    if not any(isinstance(handler, ConsoleHandler) for handler in logger.handlers):
+        handler = ConsoleHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    if level is not None:
+        logger.setLevel(level)
+    elif logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
@@ -0,0 +1,291 @@
+"""Binarny log zdarzeń symulacji z klatkami kluczowymi i odtwarzaniem dowolnej tury.
+
+Log to strumień rekordów dopisywanych na bieżąco: znacznik tury, zajęcie i
+zwolnienie pola, rekrutacja, ulepszenie, straty jednostek, walka i usunięcie
+plemienia. Co ``keyframe_every`` tur (i na początku) dopisywana jest klatka
+kluczowa - pełny stan symulacji w formacie checkpointu - a jej pozycja trafia
+do pliku indeksu ``<log>.idx``. ``Replay`` odtwarza stan tury N, wczytując
+najbliższą wcześniejszą klatkę i stosując zdarzenia do tury N, bez ponownego
+symulowania.
+
+Odtwarzane są plansza (terytoria, granice, styki) i liczebność jednostek;
+jedzenie i budulec plemion pochodzą z ostatniej klatki (ich wartości w każdej
+turze zapisuje rekorder w ``tribes_data.csv``).
+
+Przykład::
+
+    sim = Simulation(30, 20, 0, seed=1, event_log=EventLog('run.events'))
+    sim.run()
+    board = Replay('run.events').board_at(150)
+"""
+import bisect
+import os
+import struct
+
+from checkpoint import encode_checkpoint, decode_checkpoint, restore_simulation
+from recorder import NullRecorder
+
+MAGIC = b'TRIBEEVT'
+FORMAT_VERSION = 2
+_HEADER = struct.Struct('<8sIII')  # magic, wersja, rozmiar planszy, liczba poziomów wojowników
+_INDEX = struct.Struct('<IQ')  # tura klatki, pozycja rekordu klatki w logu
+DEFAULT_KEYFRAME_EVERY = 100
+
+# Rodzaje rekordów i ich zawartość (po bajcie rodzaju)
+TURN, CLAIM, RELEASE, RECRUIT, UPGRADE, LOSSES, BATTLE, DEATH, KEYFRAME = range(9)
+BATTLE_KEYS = ('attacker', 'defender', 'winner', 'attacker_losses', 'defender_losses')
+
+
+def record_structs(levels):
+    """Struktury rekordów dla podanej liczby poziomów wojowników (params.max_warrior_level)"""
+    return {
+        TURN: struct.Struct('<I'),  # numer tury
+        CLAIM: struct.Struct('<iI'),  # plemię, pole (x * rozmiar + y)
+        RELEASE: struct.Struct('<I'),  # pole
+        RECRUIT: struct.Struct('<iII'),  # plemię, nowi robotnicy, nowi wojownicy
+        UPGRADE: struct.Struct(f'<i{levels}I'),  # plemię, liczba wojowników na poziomach po ulepszeniu
+        LOSSES: struct.Struct('<iII'),  # plemię, utraceni robotnicy, utraceni wojownicy
+        BATTLE: struct.Struct('<iiiII'),  # atakujący, obrońca, zwycięzca, straty atakującego i obrońcy
+        DEATH: struct.Struct('<i'),  # plemię
+        KEYFRAME: struct.Struct('<IQ'),  # tura, długość danych checkpointu (dane zaraz po rekordzie)
+    }
+
+
+class EventLog:
+    """Obserwator planszy zapisujący zdarzenia do pliku (bufor zapisywany na końcu tury).
+
+    Symulacja wywołuje ``attach`` po utworzeniu planszy, ``begin_turn``/``end_turn``
+    w każdej turze i ``close`` na końcu przebiegu. Symulacja wznowiona z checkpointu
+    dopisuje do istniejącego logu, przyciętego do końca tury wznowienia.
+    """
+
+    def __init__(self, path, keyframe_every=DEFAULT_KEYFRAME_EVERY):
+        if keyframe_every < 1:
+            raise ValueError("Keyframe interval must be at least 1")
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.keyframe_every = keyframe_every
+        self.size = None
+        self._records = None
+        self._file = None
+        self._index = None
+        self._buffer = bytearray()
+
+    def attach(self, sim):
+        """Podłącz się do planszy symulacji i zapisz klatkę początkową (lub kontynuuj log po wznowieniu)"""
+        board = sim.board
+        board.add_observer(self)
+        self.size = board.size
+        levels = sim.params.max_warrior_level
+        self._records = record_structs(levels)
+        keyframe_turn = None
+        if self._file is None:
+            header = _HEADER.pack(MAGIC, FORMAT_VERSION, board.size, levels)
+            if sim.turn > 0 and os.path.exists(self.path) and os.path.exists(self.index_path):
+                keyframe_turn = self._reopen(header, sim.turn)
+            if self._file is None:
+                self._file = open(self.path, 'wb')
+                self._file.write(header)
+                self._index = open(self.index_path, 'wb')
+        if keyframe_turn != sim.turn:
+            self.write_keyframe(sim)
+
+    def _reopen(self, header, turn):
+        """Otwórz istniejący log do dopisywania, obcinając zdarzenia po turze turn (jak CsvRecorder).
+
+        Zwraca turę ostatniej zachowanej klatki albo None, gdy log nie ma klatki
+        sprzed wznowienia (wtedy zapisywany jest od nowa).
+        """
+        with open(self.path, 'rb') as f:
+            if f.read(len(header)) != header:
+                raise ValueError(f"{self.path} was recorded with a different board size or format")
+        with open(self.index_path, 'rb') as f:
+            index = f.read()
+        entries = [_INDEX.unpack_from(index, offset) for offset in range(0, len(index) - _INDEX.size + 1, _INDEX.size)]
+        kept = bisect.bisect_right([entry_turn for entry_turn, _ in entries], turn)
+        if kept == 0:
+            return None
+
+        # Zdarzenia tur do wznowienia leżą między ostatnią zachowaną klatką a następną
+        start = entries[kept - 1][1]
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            data = f.read(entries[kept][1] - start) if kept < len(entries) else f.read()
+        offset = 0
+        while offset < len(data):
+            kind = data[offset]
+            record = self._records.get(kind)
+            if record is None:
+                raise ValueError(f"{self.path} is corrupted (unknown record at offset {start + offset})")
+            if offset + 1 + record.size > len(data):
+                break  # niedokończony rekord przerwanego zapisu
+            values = record.unpack_from(data, offset + 1)
+            if kind == TURN and values[0] > turn:
+                break
+            end = offset + 1 + record.size + (values[1] if kind == KEYFRAME else 0)
+            if end > len(data):
+                break
+            offset = end
+        if offset == 0:
+            kept -= 1  # klatka zachowanej tury nie została dopisana do końca
+            if kept == 0:
+                return None
+        self._file = open(self.path, 'r+b')
+        self._file.truncate(start + offset)
+        self._file.seek(0, os.SEEK_END)
+        self._index = open(self.index_path, 'r+b')
+        self._index.truncate(kept * _INDEX.size)
+        self._index.seek(0, os.SEEK_END)
+        return entries[kept - 1][0]
+
+    def _emit(self, kind, *values):
+        self._buffer.append(kind)
+        self._buffer += self._records[kind].pack(*values)
+
+    # --- obserwator planszy ---
+
+    def cell_changed(self, x, y, value):
+        if value is None:
+            self._emit(RELEASE, x * self.size + y)
+        else:
+            self._emit(CLAIM, value, x * self.size + y)
+
+    def units_recruited(self, tribe_id, workers, warriors):
+        self._emit(RECRUIT, tribe_id, workers, warriors)
+
+    def warriors_upgraded(self, tribe_id, counts):
+        self._emit(UPGRADE, tribe_id, *counts)
+
+    def units_lost(self, tribe_id, workers, warriors):
+        self._emit(LOSSES, tribe_id, workers, warriors)
+
+    def tribe_removed(self, tribe_id):
+        self._emit(DEATH, tribe_id)
+
+    # --- tury i klatki ---
+
+    def begin_turn(self, turn):
+        self._emit(TURN, turn)
+
+    def battle_fought(self, battle):
+        """Zapisz rozstrzygniętą walkę (słownik jak w Simulation.battle_log)"""
+        self._emit(BATTLE, *(battle[key] for key in BATTLE_KEYS))
+
+    def end_turn(self, sim):
+        """Zapisz zdarzenia tury i co keyframe_every tur klatkę kluczową"""
+        if sim.turn % self.keyframe_every == 0:
+            self.write_keyframe(sim)
+        else:
+            self.flush()
+
+    def write_keyframe(self, sim):
+        """Dopisz pełny stan symulacji i jego pozycję w indeksie"""
+        self.flush()
+        data = encode_checkpoint(*sim.snapshot())
+        self._index.write(_INDEX.pack(sim.turn, self._file.tell()))
+        self._emit(KEYFRAME, sim.turn, len(data))
+        self._buffer += data
+        self.flush()
+        self._index.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._index.close()
+            self._file = self._index = None
+
+
+class Replay:
+    """Odtwarzanie stanu zapisanego przebiegu w dowolnej turze"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{path} is not a simulation event log")
+        magic, version, self.size, levels = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a simulation event log")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported event log version {version} (expected {FORMAT_VERSION})")
+        self._records = record_structs(levels)
+        with open(f"{path}.idx", 'rb') as f:
+            index = f.read()
+        entries = [_INDEX.unpack_from(index, offset) for offset in range(0, len(index), _INDEX.size)]
+        if not entries:
+            raise ValueError(f"{path} has no keyframes")
+        self.keyframe_turns = [turn for turn, _ in entries]
+        self.keyframe_offsets = [offset for _, offset in entries]
+
+    def simulation_at(self, turn):
+        """Zwróć symulację (bez rekordera i wyświetlania) w stanie z końca podanej tury"""
+        position = bisect.bisect_right(self.keyframe_turns, turn) - 1
+        if position < 0:
+            raise ValueError(f"Turn {turn} is before the first keyframe (turn {self.keyframe_turns[0]})")
+        # Zdarzenia do tury N leżą przed następną klatką (zapisaną na końcu późniejszej tury)
+        start = self.keyframe_offsets[position]
+        end = self.keyframe_offsets[position + 1] if position + 1 < len(self.keyframe_offsets) else None
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            data = f.read() if end is None else f.read(end - start)
+
+        if not data or data[0] != KEYFRAME:
+            raise ValueError(f"{self.path}: keyframe index does not match the log")
+        keyframe = self._records[KEYFRAME]
+        _, length = keyframe.unpack_from(data, 1)
+        offset = 1 + keyframe.size
+        sim = restore_simulation(*decode_checkpoint(data[offset:offset + length], self.path),
+                                 recorder=NullRecorder(), display='off')
+        self._apply(sim, data, offset + length, turn)
+        return sim
+
+    def board_at(self, turn):
+        """Zwróć planszę w stanie z końca podanej tury"""
+        return self.simulation_at(turn).board
+
+    def _apply(self, sim, data, offset, turn):
+        """Zastosuj zdarzenia od pozycji offset aż do końca podanej tury"""
+        board = sim.board
+        size = self.size
+        records = self._records
+        while offset < len(data):
+            kind = data[offset]
+            record = records[kind]
+            values = record.unpack_from(data, offset + 1)
+            offset += 1 + record.size
+            if kind == TURN:
+                if values[0] > turn:
+                    break
+                sim.turn = values[0]
+            elif kind == CLAIM:
+                tribe = board.get_tribe(values[0])
+                x, y = divmod(values[1], size)
+                tribe.territory.add((x, y))
+                board.claim_cell(x, y, tribe)
+            elif kind == RELEASE:
+                board.release_cell(*divmod(values[0], size))
+            elif kind == RECRUIT:
+                tribe = board.get_tribe(values[0])
+                tribe.workers.add(values[1])
+                tribe.warriors.add(values[2])
+            elif kind == UPGRADE:
+                board.get_tribe(values[0]).warriors.counts = values[1:]
+            elif kind == LOSSES:
+                tribe = board.get_tribe(values[0])
+                tribe.workers.pop_many(values[1])
+                tribe.warriors.pop_many(values[2])
+            elif kind == BATTLE:
+                sim.battle_log.append(dict(zip(BATTLE_KEYS, values), turn=sim.turn))
+            elif kind == DEATH:
+                tribe = board.get_tribe(values[0])
+                tribe.warriors.clear()
+                board.remove_tribe(tribe)
+            elif kind == KEYFRAME:
+                offset += values[1]  # kolejna klatka - zdarzenia są dalej
@@ -1,42 +1,179 @@
+"""Wykresy przebiegu symulacji na podstawie ``tribes_data.csv``.
+
+Przykład (bez okna, zapis do plików)::
+
+    tribes-charts tribes_data.csv --top 10 --output-dir wykresy
+    tribes-charts tribes_data.csv --aggregate --format svg --output-dir wykresy
+"""
+import argparse
+import os
+
 import pandas as pd  # import biblioteki pandas do manipulacji danymi
-import matplotlib.pyplot as plt  # import biblioteki matplotlib do tworzenia wykresów
+
+# Kompaktowe typy kolumn pliku plemion (domyślne int64/float64 zajmują 2x więcej pamięci).
+# Zasoby zostają w float64 - w długich przebiegach przekraczają 2**24, powyżej którego float32 gubi jedności
+COLUMN_DTYPES = {
+    'turn': 'int32',
+    'tribe_id': 'int32',
+    'workers': 'int32',
+    'warriors': 'int32',
+    'territory': 'int32',
+    'food': 'float64',
+    'building_materials': 'float64',
+    'alive': 'int8'
+}
+DEFAULT_COLUMNS = ['food', 'building_materials', 'workers', 'warriors']
+LEGEND_LIMIT = 30  # powyżej tylu linii legenda jest pomijana (byłaby nieczytelna)
+
 
 class TribeCharts:
-    def __init__(self, filename):
+    def __init__(self, filename, columns=None, top=None, aggregate=False):
         """
-        Konstruktor klasy WykresyPlemion.
-        filename: ścieżka do pliku CSV zawierającego dane plemion.
+        Konstruktor klasy TribeCharts.
+        filename: ścieżka do pliku CSV (także .csv.gz) lub Parquet z danymi plemion,
+        columns: kolumny do przedstawienia na wykresach (domyślnie DEFAULT_COLUMNS),
+        top: pokaż tylko `top` plemion o najwyższym maksimum danej kolumny, resztę jako sumę,
+        aggregate: zamiast linii plemion pokaż sumę, średnią i zakres min-max wszystkich plemion.
+        Dane wczytywane są dopiero przy pierwszym użyciu.
         """
+        columns = list(columns) if columns is not None else list(DEFAULT_COLUMNS)
+        for col in columns:
+            if col not in COLUMN_DTYPES or col in ('turn', 'tribe_id'):
+                raise ValueError(f"Unknown chart column {col!r}")
+        if top is not None and top < 1:
+            raise ValueError("Top tribes count must be at least 1")
         self.filename = filename  # zapisanie nazwy pliku jako atrybut obiektu
-        self.df = pd.read_csv(self.filename)  # wczytanie danych z pliku CSV do DataFrame
-        # lista unikalnych identyfikatorów plemion, posortowana rosnąco
-        self.tribes_to_compare = sorted(self.df['tribe_id'].unique())
         # kolumny, które chcemy przedstawić na wykresach
-        self.columns_of_interest = ['food', 'building_materials', 'workers', 'warriors']
+        self.columns_of_interest = columns
+        self.top = top
+        self.aggregate = aggregate
+        self._df = None  # wczytywane leniwie (property df)
+        self._matrix = None  # tury x plemiona dla wszystkich kolumn naraz (property matrix)
+
+    @property
+    def df(self):
+        """Dane plemion - tylko potrzebne kolumny, w kompaktowych typach"""
+        if self._df is None:
+            usecols = ['turn', 'tribe_id'] + self.columns_of_interest
+            if self.filename.endswith('.parquet'):
+                self._df = pd.read_parquet(self.filename, columns=usecols).astype(
+                    {col: COLUMN_DTYPES[col] for col in usecols})
+            else:
+                self._df = pd.read_csv(self.filename, usecols=usecols,
+                                       dtype={col: COLUMN_DTYPES[col] for col in usecols})
+        return self._df
+
+    @property
+    def tribes_to_compare(self):
+        """Lista unikalnych identyfikatorów plemion, posortowana rosnąco"""
+        return list(self.matrix.columns.get_level_values('tribe_id').unique())
+
+    @property
+    def matrix(self):
+        """Macierz tury x plemiona dla każdej kolumny (jedno grupowanie zamiast filtrowania per plemię).
+
+        matrix[col] to DataFrame z indeksem 'turn' i kolumnami 'tribe_id';
+        NaN oznacza turę, w której plemię już (lub jeszcze) nie istniało.
+        """
+        if self._matrix is None:
+            self._matrix = self.df.pivot(index='turn', columns='tribe_id', values=self.columns_of_interest)
+        return self._matrix
 
-    def draw_charts(self):
+    def series(self, col):
+        """Linie do narysowania dla kolumny: DataFrame tury x serie (nazwy serii to etykiety legendy)"""
+        data = self.matrix[col]
+        if self.aggregate:
+            return pd.DataFrame({
+                'Suma': data.sum(axis=1),
+                'Średnia': data.mean(axis=1),
+                'Minimum': data.min(axis=1),
+                'Maksimum': data.max(axis=1)
+            })
+        if self.top is not None and self.top < data.shape[1]:
+            # najsilniejsze plemiona wg maksimum kolumny w całym przebiegu, reszta zsumowana w jedną linię
+            leaders = data.max().nlargest(self.top).index.sort_values()
+            view = data[leaders].rename(columns=lambda tribe_id: f'Tribe {tribe_id}')
+            view['Pozostałe (suma)'] = data.drop(columns=leaders).sum(axis=1, min_count=1)
+            return view
+        return data.rename(columns=lambda tribe_id: f'Tribe {tribe_id}')
+
+    def draw_chart(self, ax, col):
+        """Narysuj wykres jednej kolumny na podanych osiach"""
+        view = self.series(col)
+        if self.aggregate:
+            # zakres min-max jako pole, suma i średnia jako linie
+            ax.fill_between(view.index, view['Minimum'], view['Maksimum'], alpha=0.3, label='Zakres min-max')
+            view = view[['Suma', 'Średnia']]
+        # wszystkie linie jednym wywołaniem (kolumny macierzy to kolejne serie)
+        lines = ax.plot(view.index, view.to_numpy())
+        # ustawienie tytułu wykresu, w zależności od analizowanej kolumny
+        ax.set_title(f'Porównanie plemion: {col}')
+        ax.set_xlabel('Tura')  # etykieta osi X
+        # etykieta osi Y: zamiana podkreśleń na spacje i kapitalizacja
+        ax.set_ylabel(col.replace('_', ' ').capitalize())
+        # legenda tylko dla czytelnej liczby linii
+        if len(lines) <= LEGEND_LIMIT:
+            for line, label in zip(lines, view.columns):
+                line.set_label(label)
+            ax.legend(ncol=3, fontsize='small')
+        ax.grid(True)  # włączenie siatki na wykresie
+
+    def draw_charts(self, output_dir=None, fmt='png'):
         """
         Metoda rysująca wykresy dla każdej z wybranych kolumn,
         porównująca wartości dla poszczególnych plemion w kolejnych turach.
+        output_dir: zapisz wykresy do plików `<kolumna>.<fmt>` zamiast je wyświetlać
+        (bez interfejsu graficznego - działa np. na serwerze). Zwraca listę zapisanych plików.
         """
+        saved = []
         # iteracja po każdej z kolumn zainteresowania
         for col in self.columns_of_interest:
-            plt.figure(figsize=(12, 7))  # utworzenie nowej figury o rozmiarze 12x7 cali (w Matplotlib musimy w calach)
-
-            # dla każdego plemienia narysuj osobną linię na wykresie
-            for tribe_id in self.tribes_to_compare:
-                # wyfiltrowanie danych tylko dla bieżącego plemienia
-                tribe_data = self.df[self.df['tribe_id'] == tribe_id]
-                # narysowanie linii: oś X = 'turn', oś Y = wartość kolumny col
-                plt.plot(tribe_data['turn'], tribe_data[col], label=f'Tribe {tribe_id}')
-
-            # ustawienie tytułu wykresu, w zależności od analizowanej kolumny
-            plt.title(f'Porównanie plemion: {col}')
-            plt.xlabel('Tura')  # etykieta osi X
-            # etykieta osi Y: zamiana podkreśleń na spacje i kapitalizacja
-            plt.ylabel(col.replace('_', ' ').capitalize())
-            # legenda wyświetlająca etykiety dla poszczególnych plemion
-            plt.legend(ncol=3, fontsize='small')
-            plt.grid(True)  # włączenie siatki na wykresie
-            plt.tight_layout()  # dopasowanie marginesów, aby nic nie było obcięte
-            plt.show()  # wyświetlenie wykresu
\ No newline at end of file
+            if output_dir is None:
+                import matplotlib.pyplot as plt  # okno wykresu wymaga pyplot i backendu GUI
+
+                fig, ax = plt.subplots(figsize=(12, 7))  # figura o rozmiarze 12x7 cali (w Matplotlib musimy w calach)
+                self.draw_chart(ax, col)
+                fig.tight_layout()  # dopasowanie marginesów, aby nic nie było obcięte
+                plt.show()  # wyświetlenie wykresu
+            else:
+                from matplotlib.figure import Figure  # figura bez pyplot - nie potrzebuje backendu GUI
+
+                fig = Figure(figsize=(12, 7))
+                self.draw_chart(fig.subplots(), col)
+                fig.tight_layout()
+                path = os.path.join(output_dir, f'{col}.{fmt}')
+                fig.savefig(path)
+                saved.append(path)
+        return saved
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Wykresy przebiegu symulacji plemion.")
+    parser.add_argument('filename', nargs='?', default='tribes_data.csv', help="plik danych plemion (CSV lub Parquet)")
+    parser.add_argument('--columns', nargs='+', default=DEFAULT_COLUMNS, help="kolumny do narysowania")
+    view = parser.add_mutually_exclusive_group()
+    view.add_argument('--top', type=int, default=None, help="pokaż tylko N najsilniejszych plemion (reszta jako suma)")
+    view.add_argument('--aggregate', action='store_true', help="pokaż sumę, średnią i zakres zamiast linii plemion")
+    parser.add_argument('--output-dir', default=None, help="zapisz wykresy do katalogu zamiast wyświetlać")
+    parser.add_argument('--format', default='png', help="format plików wykresów (png, svg, pdf)")
+    args = parser.parse_args(argv)
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+    return args
+
+
+def main(argv=None):
+    """Punkt wejścia `tribes-charts`"""
+    args = parse_args(argv)
+    try:
+        charts = TribeCharts(args.filename, args.columns, top=args.top, aggregate=args.aggregate)
+    except ValueError as error:
+        raise SystemExit(f"tribes-charts: error: {error}")
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+    for path in charts.draw_charts(args.output_dir, args.format):
+        print(f"Zapisano wykres {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Rzadka siatka dla dużych plansz.
+
+``ChunkedGrid`` dzieli planszę na kafle ``TILE_SIZE`` x ``TILE_SIZE`` i tworzy
+kafel dopiero przy zajęciu pierwszego pola (zwalnia go po opróżnieniu), więc
+pamięć rośnie z zajętym obszarem, a nie z rozmiarem planszy. Dostęp jest taki
+sam jak do listy list: ``grid[x][y]`` i ``grid[x][y] = wartość``.
+"""
+from array import array
+
+TILE_SIZE = 64
+_EMPTY = -1  # wartość pustego pola w kaflu (na zewnątrz widoczna jako None)
+
+
+class ChunkedGrid:
+    """Siatka size x size z kaflami tworzonymi tylko tam, gdzie są zajęte pola"""
+
+    __slots__ = ('size', 'tile_size', 'tiles', 'occupied')
+
+    def __init__(self, size, tile_size=TILE_SIZE):
+        self.size = size
+        self.tile_size = tile_size
+        self.tiles = {}  # (kx, ky) -> [array('i') pól kafla, liczba zajętych pól]
+        self.occupied = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.size:
+            raise IndexError("grid row index out of range")
+        return _GridRow(self, x)
+
+    def __iter__(self):
+        # Pełne wiersze - tylko dla małych plansz (np. wyświetlanie), duże nie są tak odczytywane
+        for x in range(self.size):
+            yield [self.get(x, y) for y in range(self.size)]
+
+    def get(self, x, y):
+        """Zwróć id plemienia na polu (x, y) lub None"""
+        ts = self.tile_size
+        tile = self.tiles.get((x // ts, y // ts))
+        if tile is None:
+            return None
+        value = tile[0][(x % ts) * ts + y % ts]
+        return None if value == _EMPTY else value
+
+    def set(self, x, y, value):
+        """Ustaw pole (x, y) na id plemienia lub None"""
+        ts = self.tile_size
+        key = (x // ts, y // ts)
+        tile = self.tiles.get(key)
+        if tile is None:
+            if value is None:
+                return
+            tile = self.tiles[key] = [array('i', [_EMPTY]) * (ts * ts), 0]
+        index = (x % ts) * ts + y % ts
+        was_empty = tile[0][index] == _EMPTY
+        tile[0][index] = _EMPTY if value is None else value
+        if was_empty and value is not None:
+            tile[1] += 1
+            self.occupied += 1
+        elif not was_empty and value is None:
+            tile[1] -= 1
+            self.occupied -= 1
+            if tile[1] == 0:
+                del self.tiles[key]
+
+    def occupied_cells(self):
+        """Zwróć zajęte pola jako (x, y, id plemienia) - koszt proporcjonalny do liczby kafli"""
+        ts = self.tile_size
+        for (kx, ky), (cells, _) in self.tiles.items():
+            for index, value in enumerate(cells):
+                if value != _EMPTY:
+                    yield kx * ts + index // ts, ky * ts + index % ts, value
+
+
+class _GridRow:
+    """Widok wiersza ChunkedGrid (grid[x]) obsługujący indeksowanie po y"""
+
+    __slots__ = ('_grid', '_x')
+
+    def __init__(self, grid, x):
+        self._grid = grid
+        self._x = x
+
+    def __len__(self):
+        return self._grid.size
+
+    def __getitem__(self, y):
+        if not 0 <= y < self._grid.size:
+            raise IndexError("grid column index out of range")
+        return self._grid.get(self._x, y)
+
+    def __setitem__(self, y, value):
+        if not 0 <= y < self._grid.size:
+            raise IndexError("grid column index out of range")
+        self._grid.set(self._x, y, value)
+
+    def __iter__(self):
+        return (self._grid.get(self._x, y) for y in range(self._grid.size))
+
+
+class SparseFreeCells:
+    """Pula wolnych pól dużej planszy bez listy wszystkich pól.
+
+    Liczność wynika z licznika zajętych pól siatki, a losowanie działa metodą
+    odrzucania - szybko, dopóki plansza jest w większości pusta.
+    """
+
+    __slots__ = ('grid',)
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __len__(self):
+        return self.grid.size ** 2 - self.grid.occupied
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __contains__(self, cell):
+        return self.grid.get(*cell) is None
+
+    def add(self, cell):
+        pass  # stan wynika z siatki
+
+    def discard(self, cell):
+        pass
+
+    def choice(self, rng):
+        """Wylosuj wolne pole (losowanie pól aż do trafienia w puste)"""
+        size = self.grid.size
+        while True:
+            x = rng.randrange(size)
+            y = rng.randrange(size)
+            if self.grid.get(x, y) is None:
+                return x, y
@@ -0,0 +1,318 @@
+"""Historia siatki planszy w pliku mapowanym w pamięci (wymaga NumPy).
+
+``GridHistoryWriter`` dopisuje po każdej turze siatkę jako klatkę stałego
+rozmiaru (``int16``, a przy ponad 32767 plemionach ``int32``; ``-1`` to puste
+pole). ``GridHistory`` mapuje plik przez ``np.memmap``, więc klatka dowolnej
+tury to widok na plik bez kopiowania, a analizy wielu tysięcy tur (mapy
+zajętości, strefy konfliktów) czytają dane porcjami zamiast wczytywać całość.
+
+Z ``keyframe_every=K`` pełna klatka zapisywana jest co K tur, a w pozostałych
+turach tylko zmienione pola (plik ``<historia>.deltas``); odczyt takiej tury
+to najbliższa wcześniejsza klatka plus zmiany (kopia, nie widok). Ten tryb
+jest wymagany dla siatek silnika wektorowego większych niż
+``DENSE_BOARD_LIMIT``; rzadkich plansz ``Board`` (powyżej tego limitu)
+historia nie obsługuje - pełna siatka w pamięci przekreśliłaby ich sens.
+
+Symulacja wznowiona z checkpointu dopisuje do istniejącej historii,
+przyciętej do tury wznowienia.
+
+Przykład::
+
+    sim = Simulation(50, 40, 0, seed=1, history=GridHistoryWriter('run.grid'))
+    sim.run()
+    history = GridHistory('run.grid')
+    grid = history[500]  # np.ndarray (rozmiar x rozmiar), widok na plik
+    heat = history.heatmap(tribe_id=3)
+"""
+import os
+import struct
+
+import numpy as np
+
+from config import DENSE_BOARD_LIMIT
+
+MAGIC = b'TRIBEGRD'
+FORMAT_VERSION = 1
+# magic, wersja, rozmiar planszy, bajty na pole, co ile tur pełna klatka (0 - każda), pierwsza tura
+_HEADER = struct.Struct('<8sIIIIq')
+HEADER_SIZE = 64  # nagłówek dopełniony - klatki zaczynają się od wyrównanego przesunięcia
+_DELTA = struct.Struct('<II')  # tura, liczba zmienionych pól (dalej indeksy int32 i wartości pól)
+EMPTY = -1
+CHUNK_FRAMES = 256  # klatek przetwarzanych naraz w analizach
+
+
+def grid_dtype(tribes_count):
+    """Najmniejszy typ pola mieszczący id wszystkich plemion"""
+    return np.dtype(np.int16) if tribes_count <= np.iinfo(np.int16).max else np.dtype(np.int32)
+
+
+class GridHistoryWriter:
+    """Zapis siatki po każdej turze (obserwator planszy albo kopia siatki silnika wektorowego).
+
+    Symulacja wywołuje ``attach`` po utworzeniu planszy, ``end_turn`` na końcu
+    każdej tury i ``close`` na końcu przebiegu.
+    """
+
+    def __init__(self, path, keyframe_every=None):
+        if keyframe_every is not None and keyframe_every < 1:
+            raise ValueError("Keyframe interval must be at least 1")
+        self.path = path
+        self.deltas_path = f"{path}.deltas"
+        self.keyframe_every = keyframe_every
+        self.grid = None  # bieżąca siatka w typie pliku
+        self.first_turn = None
+        self._observing = False
+        self._changed = {}  # płaski indeks pola -> nowa wartość (tryb z klatkami co K tur)
+        self._file = None
+        self._deltas = None
+
+    def attach(self, sim):
+        """Zapisz nagłówek i klatkę początkową (po wznowieniu: kontynuuj historię), podłącz się do planszy"""
+        size = sim.board_size
+        board = getattr(sim, 'board', None)
+        if size > DENSE_BOARD_LIMIT:
+            if board is not None:
+                raise ValueError(f"Grid history needs a dense grid - boards larger than {DENSE_BOARD_LIMIT} "
+                                 f"are supported by the vector engine only")
+            if self.keyframe_every is None:
+                raise ValueError(f"Grid history of boards larger than {DENSE_BOARD_LIMIT} needs keyframe_every")
+        dtype = grid_dtype(sim.tribes_count)
+        if board is not None:
+            self.grid = np.full((size, size), EMPTY, dtype=dtype)
+            for tribe in board.tribes:
+                for x, y in tribe.territory:
+                    self.grid[x, y] = tribe.id
+            board.add_observer(self)
+            self._observing = True
+        else:
+            self.grid = sim.grid.astype(dtype)  # silnik wektorowy: siatka NumPy porównywana co turę
+
+        if sim.turn > 0 and os.path.exists(self.path) and self._reopen(sim.turn, dtype):
+            return
+        self.first_turn = sim.turn
+        self._file = open(self.path, 'wb')
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, size, dtype.itemsize, self.keyframe_every or 0, sim.turn)
+        self._file.write(header.ljust(HEADER_SIZE, b'\0'))
+        if self.keyframe_every is not None:
+            self._deltas = open(self.deltas_path, 'wb')
+        self._file.write(self.grid.tobytes())
+
+    def _reopen(self, turn, dtype):
+        """Otwórz istniejącą historię do dopisywania, obcinając tury po turn.
+
+        Zwraca False, gdy historia zaczyna się po turze wznowienia (wtedy zapisywana jest od nowa).
+        """
+        history = GridHistory(self.path)
+        if (history.size, history.dtype, history.keyframe_every) != (len(self.grid), dtype, self.keyframe_every):
+            raise ValueError(f"{self.path} was recorded with a different board size or keyframe interval")
+        if turn < history.first_turn:
+            return False
+        if turn > history.last_turn:
+            raise ValueError(f"{self.path} ends at turn {history.last_turn}, before the resume turn {turn}")
+        self.first_turn = history.first_turn
+        position = turn - history.first_turn
+        frames = position + 1 if self.keyframe_every is None else position // self.keyframe_every + 1
+        deltas_size = history.deltas_size(turn) if self.keyframe_every is not None else None
+        del history  # zamknij mapowania przed przycięciem plików
+
+        self._file = open(self.path, 'r+b')
+        self._file.truncate(HEADER_SIZE + frames * self.grid.nbytes)
+        self._file.seek(0, os.SEEK_END)
+        if deltas_size is not None:
+            self._deltas = open(self.deltas_path, 'r+b')
+            self._deltas.truncate(deltas_size)
+            self._deltas.seek(0, os.SEEK_END)
+        return True
+
+    def cell_changed(self, x, y, value):
+        value = EMPTY if value is None else value
+        self.grid[x, y] = value
+        if self._deltas is not None:
+            self._changed[x * len(self.grid) + y] = value
+
+    def end_turn(self, sim):
+        """Dopisz klatkę (lub zmiany) zakończonej tury"""
+        if not self._observing:
+            current = sim.grid.ravel()
+            changed = np.flatnonzero(current != self.grid.ravel())
+            self.grid.ravel()[changed] = current[changed]
+            if self._deltas is not None:
+                self._changed = dict(zip(changed.tolist(), current[changed].tolist()))
+
+        if self._deltas is None:
+            self._file.write(self.grid.tobytes())
+            return
+        indices = np.fromiter(self._changed.keys(), dtype=np.int32, count=len(self._changed))
+        values = np.fromiter(self._changed.values(), dtype=self.grid.dtype, count=len(self._changed))
+        self._changed = {}
+        self._deltas.write(_DELTA.pack(sim.turn, len(indices)))
+        self._deltas.write(indices.tobytes())
+        self._deltas.write(values.tobytes())
+        if (sim.turn - self.first_turn) % self.keyframe_every == 0:
+            self._file.write(self.grid.tobytes())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._deltas is not None:
+            self._deltas.close()
+            self._deltas = None
+
+
+class GridHistory:
+    """Odczyt historii siatki; klatki to widoki na plik mapowany w pamięci"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a grid history file")
+        _, version, self.size, itemsize, keyframe_every, self.first_turn = _HEADER.unpack_from(header)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported grid history version {version} (expected {FORMAT_VERSION})")
+        self.dtype = np.dtype(np.int16) if itemsize == 2 else np.dtype(np.int32)
+        self.keyframe_every = keyframe_every or None
+        frame_bytes = self.size * self.size * itemsize
+        # Liczba klatek z rozmiaru pliku - przerwany zapis zostawia czytelne pełne klatki
+        count = (os.path.getsize(path) - HEADER_SIZE) // frame_bytes
+        if count < 1:
+            raise ValueError(f"{path} has no frames")
+        self.frames = np.memmap(path, dtype=self.dtype, mode='r', offset=HEADER_SIZE,
+                                shape=(count, self.size, self.size))
+
+        self._deltas = None
+        if self.keyframe_every is None:
+            self.last_turn = self.first_turn + count - 1
+        else:
+            deltas_path = f"{path}.deltas"
+            # pustego pliku (przebieg bez tur) nie da się zmapować
+            self._deltas = (np.memmap(deltas_path, dtype=np.uint8, mode='r') if os.path.getsize(deltas_path)
+                            else np.zeros(0, dtype=np.uint8))
+            self._delta_offsets = self._index_deltas()
+            # zmiany za brakującą klatką kluczową (przerwany zapis) są pomijane
+            self.last_turn = self.first_turn + min(len(self._delta_offsets), count * self.keyframe_every - 1)
+
+    def _index_deltas(self):
+        """Pozycje rekordów zmian kolejnych tur (odczyt samych nagłówków rekordów)"""
+        offsets = []
+        data = self._deltas
+        offset = 0
+        while offset + _DELTA.size <= len(data):
+            _, count = _DELTA.unpack_from(data, offset)
+            end = offset + _DELTA.size + count * (4 + self.dtype.itemsize)
+            if end > len(data):
+                break  # niedokończony rekord przerwanego zapisu
+            offsets.append(offset)
+            offset = end
+        return offsets
+
+    def deltas_size(self, turn):
+        """Długość pliku zmian do końca podanej tury (w bajtach)"""
+        count = turn - self.first_turn
+        if count == 0:
+            return 0
+        offset = self._delta_offsets[count - 1]
+        _, changed = _DELTA.unpack_from(self._deltas, offset)
+        return offset + _DELTA.size + changed * (4 + self.dtype.itemsize)
+
+    @property
+    def turns(self):
+        """Zakres tur zapisanych w historii"""
+        return range(self.first_turn, self.last_turn + 1)
+
+    def __len__(self):
+        return len(self.turns)
+
+    def __getitem__(self, turn):
+        return self.frame(turn)
+
+    def _check_turn(self, turn):
+        if turn not in self.turns:
+            raise ValueError(f"Turn {turn} is outside the recorded range {self.first_turn}-{self.last_turn}")
+
+    def _delta(self, turn):
+        """Zmienione pola tury: (płaskie indeksy, wartości) - widoki na plik zmian"""
+        offset = self._delta_offsets[turn - self.first_turn - 1]
+        _, count = _DELTA.unpack_from(self._deltas, offset)
+        start = offset + _DELTA.size
+        indices = self._deltas[start:start + count * 4].view(np.int32)
+        start += count * 4
+        return indices, self._deltas[start:start + count * self.dtype.itemsize].view(self.dtype)
+
+    def frame(self, turn):
+        """Siatka z końca tury (rozmiar x rozmiar, -1 = puste pole).
+
+        Pełna klatka to widok tylko do odczytu na plik (bez kopiowania);
+        w trybie z klatkami co K tur pozostałe tury są odtwarzane do nowej tablicy.
+        """
+        self._check_turn(turn)
+        position = turn - self.first_turn
+        if self.keyframe_every is None:
+            return self.frames[position]
+        keyframe, rest = divmod(position, self.keyframe_every)
+        if rest == 0:
+            return self.frames[keyframe]
+        grid = np.array(self.frames[keyframe])
+        flat = grid.ravel()
+        for delta_turn in range(turn - rest + 1, turn + 1):
+            indices, values = self._delta(delta_turn)
+            flat[indices] = values
+        return grid
+
+    def iter_frames(self, start=None, stop=None):
+        """Kolejne pary (tura, siatka) z zakresu [start, stop]; w trybie zmian jedna siatka aktualizowana w miejscu"""
+        start = self.first_turn if start is None else start
+        stop = self.last_turn if stop is None else stop
+        self._check_turn(start)
+        self._check_turn(stop)
+        if self.keyframe_every is None:
+            for turn in range(start, stop + 1):
+                yield turn, self.frames[turn - self.first_turn]
+            return
+        grid = np.array(self.frame(start))
+        yield start, grid
+        flat = grid.ravel()
+        for turn in range(start + 1, stop + 1):
+            indices, values = self._delta(turn)
+            flat[indices] = values
+            yield turn, grid
+
+    def heatmap(self, tribe_id=None, start=None, stop=None):
+        """Liczba tur, w których pole było zajęte (przez dowolne plemię lub przez tribe_id)"""
+        counts = np.zeros((self.size, self.size), dtype=np.int64)
+        for block in self._blocks(start, stop):
+            counts += (block >= 0 if tribe_id is None else block == tribe_id).sum(axis=0)
+        return counts
+
+    def ownership_changes(self, start=None, stop=None):
+        """Liczba zmian właściciela każdego pola między kolejnymi turami (strefy konfliktów)"""
+        changes = np.zeros((self.size, self.size), dtype=np.int64)
+        previous = None
+        for block in self._blocks(start, stop):
+            if previous is not None:
+                changes += block[0] != previous
+            changes += (block[1:] != block[:-1]).sum(axis=0)
+            previous = np.array(block[-1])
+        return changes
+
+    def _blocks(self, start, stop):
+        """Klatki z zakresu tur porcjami po CHUNK_FRAMES (tablice kształtu klatki x rozmiar x rozmiar)"""
+        start = self.first_turn if start is None else start
+        stop = self.last_turn if stop is None else stop
+        if self.keyframe_every is None:
+            self._check_turn(start)
+            self._check_turn(stop)
+            for first in range(start, stop + 1, CHUNK_FRAMES):
+                last = min(first + CHUNK_FRAMES, stop + 1)
+                yield self.frames[first - self.first_turn:last - self.first_turn]
+            return
+        block = []
+        for _, grid in self.iter_frames(start, stop):
+            block.append(grid.copy())
+            if len(block) == CHUNK_FRAMES:
+                yield np.stack(block)
+                block = []
+        if block:
+            yield np.stack(block)
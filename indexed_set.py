@@ -0,0 +1,57 @@
+class IndexedSet:
+    """Zbiór z dostępem po indeksie: dodawanie, usuwanie i losowanie elementu w O(1).
+
+    Elementy trzymane są w liście, a słownik pamięta pozycję każdego z nich;
+    usunięcie przenosi ostatni element na zwolnione miejsce.
+    """
+
+    __slots__ = ('_items', '_positions')
+
+    def __init__(self, items=()):
+        self._items = []
+        self._positions = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __contains__(self, item):
+        return item in self._positions
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def add(self, item):
+        """Dodaj element (jeśli go jeszcze nie ma)"""
+        if item not in self._positions:
+            self._positions[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item):
+        """Usuń element, jeśli istnieje"""
+        position = self._positions.pop(item, None)
+        if position is None:
+            return
+        last = self._items.pop()
+        if position < len(self._items):
+            self._items[position] = last
+            self._positions[last] = position
+
+    def clear(self):
+        self._items.clear()
+        self._positions.clear()
+
+    def choice(self, rng):
+        """Wylosuj jeden element"""
+        return rng.choice(self._items)
+
+    def sample(self, rng, k):
+        """Wylosuj k różnych elementów"""
+        return rng.sample(self._items, k)
@@ -0,0 +1,281 @@
+"""Równoległy wariant silnika wektorowego dla pojedynczej, bardzo dużej symulacji.
+
+Siatka i tablice plemion leżą w blokach pamięci współdzielonej
+(``multiprocessing.shared_memory``). Niezależne fazy ekonomii (surowce,
+rekrutacja, ulepszenia, konsumpcja) wykonują procesy robocze, każdy na
+swoim zakresie plemion. Ekspansja jest jedyną fazą dotykającą wspólnej
+siatki, więc procesy tylko zgłaszają wybrane pola, a proces główny
+rozstrzyga konflikty deterministycznie: pole dostaje zgłoszenie z najniższym
+priorytetem (losowanym razem ze zgłoszeniem), przy remisie niższe id plemienia.
+
+Losowość pochodzi z osobnego strumienia dla każdego bloku ``BLOCK_SIZE``
+plemion w każdej turze, więc wynik nie zależy od liczby procesów. Walki,
+zapis danych i wyświetlanie działają w procesie głównym, jak w
+``VectorSimulation``.
+"""
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from vector_engine import VectorSimulation, TribeArrays, EXPAND, TRAIN_WORKERS, TRAIN_WARRIORS, UPGRADE_WARRIORS
+
+BLOCK_SIZE = 256  # plemion w bloku - jednostka strumienia losowego (niezależna od liczby procesów)
+
+
+class SharedState:
+    """Siatka i tablice plemion w pamięci współdzielonej (jeden blok na tablicę).
+
+    layout: nazwa -> (nazwa bloku, kształt, dtype) - wystarcza, by dołączyć się z innego procesu.
+    """
+
+    def __init__(self, layout, blocks, owner):
+        self.layout = layout
+        self._blocks = blocks
+        self._owner = owner
+        self.arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=blocks[name].buf)
+            for name, (_, shape, dtype) in layout.items()
+        }
+
+    @classmethod
+    def create(cls, arrays):
+        """Utwórz bloki dla podanych tablic i skopiuj do nich dane"""
+        layout = {}
+        blocks = {}
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            blocks[name] = block
+            layout[name] = (block.name, array.shape, array.dtype.str)
+        state = cls(layout, blocks, owner=True)
+        for name, array in arrays.items():
+            state.arrays[name][...] = array
+        return state
+
+    @classmethod
+    def attach(cls, layout):
+        """Dołącz do bloków utworzonych w innym procesie"""
+        blocks = {name: shared_memory.SharedMemory(name=block_name) for name, (block_name, _, _) in layout.items()}
+        return cls(layout, blocks, owner=False)
+
+    def close(self):
+        """Odłącz bloki (właściciel dodatkowo je usuwa)"""
+        self.arrays = {}
+        for block in self._blocks.values():
+            block.close()
+            if self._owner:
+                block.unlink()
+        self._blocks = {}
+
+    def discard(self):
+        """Usuń bloki porzuconej symulacji, także gdy zostały do nich widoki tablic"""
+        self.arrays = {}
+        for block in self._blocks.values():
+            if self._owner:
+                block.unlink()  # nazwa znika od razu, pamięć - razem z ostatnim widokiem
+            try:
+                block.close()
+            except BufferError:
+                pass  # istniejące widoki trzymają mapowanie - zostanie zwolnione wraz z nimi
+        self._blocks = {}
+
+
+# Stan procesu roboczego: (SharedState, silnik pomocniczy, ziarno strumieni)
+_WORKER = None
+
+
+def _init_worker(layout, board_size, tribes_count, stream_seed, settings, params):
+    """Inicjalizator procesu roboczego: dołącz do pamięci współdzielonej"""
+    _attach_worker(SharedState.attach(layout), board_size, tribes_count, stream_seed, settings, params)
+
+
+def _release(shared, executor):
+    """Zwolnij zasoby symulacji usuniętej bez shutdown (wywoływane przez weakref.finalize)"""
+    global _WORKER
+    if executor is not None:
+        executor.shutdown(wait=False)
+    if _WORKER is not None and _WORKER[0] is shared:
+        _WORKER = None
+    shared.discard()
+
+
+def _attach_worker(state, board_size, tribes_count, stream_seed, settings, params):
+    global _WORKER
+    # Silnik pomocniczy - tylko po to, by użyć metod faz VectorSimulation na widokach zakresu plemion
+    helper = VectorSimulation(board_size, tribes_count, 0, display='off', settings=settings, params=params)
+    helper.grid = state.arrays['grid']
+    _WORKER = (state, helper, stream_seed)
+
+
+def _economy_task(turn, first_block, last_block):
+    """Wykonaj fazy ekonomii dla bloków [first_block, last_block) i zwróć zgłoszenia ekspansji.
+
+    Zwraca trzy tablice: id plemienia, indeks pola i priorytet zgłoszenia.
+    """
+    state, helper, stream_seed = _WORKER
+    arrays = state.arrays
+    tribes_count = len(arrays['workers'])
+
+    # Kandydaci ekspansji z siatki na początku tury (procesy tylko ją czytają)
+    owners, cells = helper.frontier_candidates()
+    proposals = ([], [], [])
+    for block in range(first_block, last_block):
+        start = block * BLOCK_SIZE
+        end = min(start + BLOCK_SIZE, tribes_count)
+        view = TribeArrays.__new__(TribeArrays)
+        view.strength_table = helper.strength_table
+        for name in ParallelVectorSimulation.STATE_ARRAYS:
+            setattr(view, name, arrays[name][start:end])
+        helper.tribes = view
+        helper.rng = np.random.default_rng([stream_seed, turn, block])
+
+        # Te same fazy i ta sama kolejność co VectorSimulation.play_tribe_phases
+        alive = view.alive.copy()
+        helper.collect_resources(alive)
+        actions = helper.choose_actions(alive)
+        helper.train(actions == TRAIN_WORKERS, helper.params.worker_recruitment_cost, warriors=False)
+        helper.train(actions == TRAIN_WARRIORS, helper.params.warrior_recruitment_cost, warriors=True)
+        helper.upgrade_warriors(actions == UPGRADE_WARRIORS)
+        _propose_expansions(helper, actions == EXPAND, start, owners, cells, proposals)
+        helper.consume_food(alive)
+
+    return tuple(np.concatenate(part) if part else np.zeros(0, dtype=dtype)
+                 for part, dtype in zip(proposals, (np.int64, np.int64, np.float64)))
+
+
+def _propose_expansions(helper, mask, offset, owners, cells, proposals):
+    """Wybierz pola do zajęcia (jak VectorSimulation.expand), ale bez zapisu do siatki"""
+    params = helper.params
+    t = helper.tribes
+    mask = mask & (t.building_materials >= params.expansion_cost)
+    for local_id in np.flatnonzero(mask):
+        tribe_id = offset + local_id
+        start, end = np.searchsorted(owners, [tribe_id, tribe_id + 1])
+        neighbors = cells[start:end]
+        if len(neighbors) == 0:
+            continue
+
+        spend_percent = helper.rng.uniform(params.recruitment_min_percent, params.recruitment_max_percent)
+        materials_to_spend = int(t.building_materials[local_id] * spend_percent)
+        possible_expansions = min(materials_to_spend // params.expansion_cost, len(neighbors))
+        if possible_expansions == 0:
+            continue
+
+        chosen = helper.rng.choice(neighbors, size=possible_expansions, replace=False)
+        proposals[0].append(np.full(possible_expansions, tribe_id, dtype=np.int64))
+        proposals[1].append(chosen.astype(np.int64))
+        proposals[2].append(helper.rng.random(possible_expansions))
+
+
+class ParallelVectorSimulation(VectorSimulation):
+    """Symulacja wektorowa z fazami ekonomii w procesach roboczych (pamięć współdzielona).
+
+    workers: liczba procesów (domyślnie liczba rdzeni); 1 wykonuje wszystko w procesie głównym.
+    Przebieg zależy od ziarna, ale nie od liczby procesów; różni się od ``VectorSimulation``,
+    bo losowanie idzie blokami plemion, a ekspansje rozstrzygane są po zebraniu zgłoszeń.
+    """
+
+    ENGINE = 'parallel'
+
+    def __init__(self, board_size, tribes_count, time_per_turn, seed=None, workers=None, **options):
+        if seed is None:
+            # Strumienie bloków wymagają jawnego ziarna (zapisywanego też w checkpoincie)
+            seed = np.random.SeedSequence().entropy
+        super().__init__(board_size, tribes_count, time_per_turn, seed=seed, **options)
+        if workers is not None and workers < 1:
+            raise ValueError("Workers count must be at least 1")
+        self.workers = workers or os.cpu_count() or 1
+        self.shared = None
+        self._executor = None
+        self._finalizer = None  # sprząta pamięć współdzieloną i procesy, gdy zabraknie shutdown
+
+    def initialize(self):
+        super().initialize()
+        self.share_state()
+
+    def restore(self, meta, sections):
+        super().restore(meta, sections)
+        self.share_state()
+
+    def reseed(self, seed):
+        super().reseed(seed)
+        if self.shared is not None:
+            self.share_state()  # procesy robocze muszą dostać nowe ziarno strumieni
+
+    def share_state(self):
+        """Przenieś siatkę i tablice plemion do pamięci współdzielonej i uruchom procesy robocze"""
+        self.shutdown()
+        arrays = {'grid': self.grid}
+        arrays.update((name, getattr(self.tribes, name)) for name in self.STATE_ARRAYS)
+        self.shared = SharedState.create(arrays)
+        self.grid = self.shared.arrays['grid']
+        for name in self.STATE_ARRAYS:
+            setattr(self.tribes, name, self.shared.arrays[name])
+
+        args = (self.shared.layout, self.board_size, self.tribes_count, self.seed, self.settings, self.params)
+        if self.workers == 1:
+            _attach_worker(self.shared, *args[1:])
+        else:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=args)
+        # Symulacja porzucona przed save_to_csv (błąd, przerwany przebieg) nie zostawia bloków w /dev/shm
+        self._finalizer = weakref.finalize(self, _release, self.shared, self._executor)
+
+    def block_ranges(self):
+        """Podziel bloki plemion na równe zakresy - po jednym zadaniu na proces"""
+        blocks = -(-self.tribes_count // BLOCK_SIZE)
+        bounds = np.linspace(0, blocks, min(self.workers, blocks) + 1).astype(int)
+        return [(int(first), int(last)) for first, last in zip(bounds[:-1], bounds[1:]) if last > first]
+
+    def play_tribe_phases(self):
+        """Fazy ekonomii w procesach roboczych, potem rozstrzygnięcie ekspansji i zapis tury"""
+        profiler = self.profiler
+        ranges = self.block_ranges()
+        with profiler.phase('economy'):
+            if self._executor is None:
+                results = [_economy_task(self.turn, first, last) for first, last in ranges]
+            else:
+                results = list(self._executor.map(
+                    _economy_task, [self.turn] * len(ranges), *zip(*ranges)
+                ))
+        with profiler.phase('expand'):
+            self.resolve_expansions(*(np.concatenate(part) for part in zip(*results)))
+        with profiler.phase('record'):
+            self.record_turn(self.tribes.alive)
+
+    def resolve_expansions(self, owners, cells, priorities):
+        """Przydziel zgłoszone pola: wygrywa najniższy priorytet, przy remisie niższe id plemienia"""
+        if len(cells) == 0:
+            return
+        order = np.lexsort((owners, priorities, cells))
+        sorted_cells = cells[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = sorted_cells[1:] != sorted_cells[:-1]
+        granted = order[first]
+
+        self.grid.ravel()[cells[granted]] = owners[granted]
+        gained = np.bincount(owners[granted], minlength=self.tribes_count)
+        self.tribes.territory += gained
+        self.tribes.building_materials -= gained * self.params.expansion_cost
+
+    def shutdown(self):
+        """Zatrzymaj procesy robocze i zwolnij pamięć współdzieloną (stan zostaje skopiowany)"""
+        global _WORKER
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.shared is not None:
+            self.grid = self.grid.copy()
+            for name in self.STATE_ARRAYS:
+                setattr(self.tribes, name, getattr(self.tribes, name).copy())
+            self.shared.close()
+            self.shared = None
+            _WORKER = None
+
+    def save_to_csv(self):
+        super().save_to_csv()
+        self.shutdown()
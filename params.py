@@ -0,0 +1,185 @@
+"""Parametry rozgrywki jako niezmienny obiekt przekazywany do symulacji.
+
+Domyślne wartości pochodzą z ``config.py``. ``SimulationParams`` można
+wczytać z pliku TOML lub JSON (płaska tabela nazw pól, np.
+``food_per_territory = 30``) i nadpisać pojedyncze wartości dla przebiegu.
+Obiekt jest zamrożony, więc przekazywany do procesów roboczych (batch,
+sweep) nie może się między nimi rozjechać, a stałe pochodne (np. siła na
+każdym poziomie wojownika) liczone są raz, przy tworzeniu.
+
+Ustawienia samego przebiegu (limity tur, tryb walk, strategia plemion)
+przekazywane są osobnym, także zamrożonym obiektem ``RunSettings``.
+
+Przykład::
+
+    params = SimulationParams.load('hard.toml').with_overrides(expansion_cost=250)
+    settings = RunSettings(max_turns=5000, stalemate_turns=200, battle_mode='batched')
+    sim = Simulation(30, 20, 0, seed=1, params=params, settings=settings)
+"""
+import json
+from dataclasses import dataclass, field, fields, replace
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+import config
+from battles import BATTLE_MODES
+
+_PERCENT_PAIRS = (
+    ('stole_resources_min', 'stole_resources_max'),
+    ('recruitment_min_percent', 'recruitment_max_percent'),
+    ('materials_min_percent', 'materials_max_percent'),
+)
+
+
+@dataclass(frozen=True)
+class SimulationParams:
+    """Parametry surowców, kosztów, jednostek i populacji (nazwy jak w config.py, małymi literami)"""
+
+    # Parametry surowcowe
+    food_per_territory: int = config.FOOD_PER_TERRITORY
+    building_material_per_worker: int = config.BUILDING_MATERIAL_PER_WORKER
+    stole_resources_min: float = config.STOLE_RESOURCES_MIN
+    stole_resources_max: float = config.STOLE_RESOURCES_MAX
+    # Konsumpcja
+    worker_food_consumption: int = config.WORKER_FOOD_CONSUMPTION
+    warrior_food_consumption: int = config.WARRIOR_FOOD_CONSUMPTION
+    # Koszty rekrutacji
+    worker_recruitment_cost: int = config.WORKER_RECRUITMENT_COST
+    warrior_recruitment_cost: int = config.WARRIOR_RECRUITMENT_COST
+    recruitment_min_percent: float = config.RECRUITMENT_MIN_PERCENT
+    recruitment_max_percent: float = config.RECRUITMENT_MAX_PERCENT
+    # Koszty akcji
+    expansion_cost: int = config.EXPANSION_COST
+    upgrade_cost: int = config.UPGRADE_COST
+    materials_min_percent: float = config.MATERIALS_MIN_PERCENT
+    materials_max_percent: float = config.MATERIALS_MAX_PERCENT
+    # Parametry wojowników
+    base_warrior_strength: int = config.BASE_WARRIOR_STRENGTH
+    upgrade_strength_bonus: int = config.UPGRADE_STRENGTH_BONUS
+    max_warrior_level: int = config.MAX_WARRIOR_LEVEL
+    # Populacja
+    population_per_territory: int = config.POPULATION_PER_TERRITORY
+
+    # Stałe pochodne (nie są parametrami - liczone w __post_init__)
+    strength_table: tuple = field(init=False, repr=False, compare=False)  # siła na poziomie (indeks 0 = poziom 1)
+
+    def __post_init__(self):
+        for f in fields(self):
+            if not f.init:
+                continue
+            value = getattr(self, f.name)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Parameter {f.name} must be a number, got {value!r}")
+            if f.type in (int, 'int') and not isinstance(value, int):
+                raise ValueError(f"Parameter {f.name} must be an integer, got {value!r}")
+            if value < 0:
+                raise ValueError(f"Parameter {f.name} must not be negative")
+        for name in ('worker_food_consumption', 'warrior_food_consumption', 'worker_recruitment_cost',
+                     'warrior_recruitment_cost', 'expansion_cost', 'upgrade_cost', 'max_warrior_level'):
+            if getattr(self, name) < 1:
+                raise ValueError(f"Parameter {name} must be at least 1")
+        for low, high in _PERCENT_PAIRS:
+            if not getattr(self, low) <= getattr(self, high) <= 1:
+                raise ValueError(f"Parameters must satisfy 0 <= {low} <= {high} <= 1")
+
+        object.__setattr__(self, 'strength_table', tuple(
+            self.base_warrior_strength + level * self.upgrade_strength_bonus for level in range(self.max_warrior_level)
+        ))
+
+    def warrior_strength(self, level):
+        """Siła wojownika na danym poziomie"""
+        return self.strength_table[level - 1]
+
+    def with_overrides(self, **overrides):
+        """Zwróć kopię z nadpisanymi parametrami (sprawdzanymi jak w konstruktorze)"""
+        unknown = set(overrides) - set(self.to_dict())
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+        return replace(self, **overrides)
+
+    def to_dict(self):
+        """Parametry jako słownik (bez stałych pochodnych) - np. do checkpointu lub pliku JSON"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Utwórz parametry ze słownika; brakujące pola mają wartości domyślne"""
+        return cls().with_overrides(**data)
+
+    @classmethod
+    def load(cls, path):
+        """Wczytaj parametry z pliku .toml lub .json"""
+        if path.endswith('.toml'):
+            if tomllib is None:
+                raise ValueError("TOML parameters need Python 3.11+ or the tomli package")
+            with open(path, 'rb') as f:
+                data = tomllib.load(f)
+        elif path.endswith('.json'):
+            with open(path) as f:
+                data = json.load(f)
+        else:
+            raise ValueError(f"Parameters file must be .toml or .json, got {path}")
+        if not isinstance(data, dict):
+            raise ValueError(f"{path} must contain a table of parameters")
+        return cls.from_dict(data)
+
+
+def parse_override(text):
+    """Zamień tekst 'nazwa=wartość' (np. z linii poleceń) na parę (nazwa, liczba)"""
+    name, separator, value = text.partition('=')
+    name = name.strip()
+    if not separator:
+        raise ValueError(f"Override must look like name=value, got {text!r}")
+    types = {f.name: f.type for f in fields(SimulationParams) if f.init}
+    if name not in types:
+        raise ValueError(f"Unknown parameter {name!r}")
+    try:
+        return name, int(value) if types[name] in (int, 'int') else float(value)
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {value!r}") from None
+
+
+@dataclass(frozen=True)
+class RunSettings:
+    """Ustawienia przebiegu: warunki zakończenia, tryb walk i strategia plemion.
+
+    max_turns: limit tur, stalemate_turns: zakończ po tylu turach bez zmian
+    terytorium/populacji i bez walk (None - bez limitu), battle_mode:
+    'sequential' (para po parze) lub 'batched' (rundy rozłącznych par naraz,
+    wymaga NumPy), policy: strategia wyboru akcji (None - policy.DEFAULT_POLICY).
+    """
+
+    max_turns: int = None
+    stalemate_turns: int = None
+    battle_mode: str = 'sequential'
+    policy: object = None
+
+    def __post_init__(self):
+        if self.max_turns is not None and self.max_turns < 1:
+            raise ValueError("Max turns must be at least 1")
+        if self.stalemate_turns is not None and self.stalemate_turns < 1:
+            raise ValueError("Stalemate turns must be at least 1")
+        if self.battle_mode not in BATTLE_MODES:
+            raise ValueError(f"Battle mode must be one of {BATTLE_MODES}")
+
+    def with_overrides(self, **overrides):
+        """Zwróć kopię z podmienionymi ustawieniami"""
+        return replace(self, **overrides)
+
+    def to_dict(self):
+        """Ustawienia bez strategii (obiektu kodu) - np. do checkpointu"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != 'policy'}
+
+    @classmethod
+    def from_dict(cls, data, policy=None):
+        return cls(policy=policy, **data)
+
+
+DEFAULT_PARAMS = SimulationParams()
+DEFAULT_SETTINGS = RunSettings()
@@ -0,0 +1,196 @@
+"""Strategie wyboru akcji plemienia (AI).
+
+Strategia progowa (``ThresholdPolicy``) opisana jest deklaratywnie listą
+progów ``Threshold``: każdy dzieli wartość cechy plemienia (jedzenie, budulec,
+populacja, wojownicy) na przedziały poniżej / pomiędzy / powyżej progów i w
+każdym przedziale zmienia wagi akcji o stałe wartości. Kombinacji przedziałów
+jest niewiele, więc skumulowane wagi każdej z nich liczone są raz, przy
+tworzeniu strategii. Wybór akcji to wyznaczenie numeru kombinacji i jedno
+wyszukiwanie binarne wylosowanej liczby - dokładnie tak jak w
+``random.choices``, więc domyślna strategia daje ten sam przebieg co wcześniej
+liczone na bieżąco wagi.
+
+Progi mogą odwoływać się do parametrów rozgrywki po nazwie (np.
+``per_territory='food_per_territory'``); symulacja wiąże strategię ze swoimi
+parametrami (``ThresholdPolicy.bind``), więc domyślna strategia dopasowuje się
+do zmienionych kosztów i limitów.
+
+Inną strategię można przekazać symulacji (``Simulation(..., policy=...)``)
+albo benchmarkowi (``tribes-bench --policy moduł:NAZWA``).
+"""
+import importlib
+from bisect import bisect
+from itertools import accumulate, product
+
+from params import DEFAULT_PARAMS
+
+ACTIONS = ('expand', 'train_workers', 'train_warriors', 'upgrade_warriors', 'nothing')
+BELOW, BETWEEN, ABOVE = range(3)  # przedziały wartości cechy względem progów
+
+# Cechy plemienia, na których mogą opierać się progi
+FEATURES = {
+    'food': lambda tribe: tribe.food,
+    'building_materials': lambda tribe: tribe.building_materials,
+    'population': lambda tribe: tribe.total_population(),
+    'warriors': lambda tribe: len(tribe.warriors),
+}
+
+
+class Threshold:
+    """Próg dzielący wartość cechy plemienia na trzy przedziały.
+
+    Wartość odniesienia to ``terytorium * per_territory`` albo stała ``base``
+    (liczba lub nazwa pola ``params.SimulationParams``, np. ``'expansion_cost'``);
+    wartość mniejsza niż ``odniesienie * low`` trafia do przedziału BELOW,
+    większa niż ``odniesienie * high`` do ABOVE, pozostałe do BETWEEN
+    (brak ``low``/``high`` wyłącza dany przedział). ``below``, ``between``
+    i ``above`` to zmiany wag akcji w przedziale, np. ``{'expand': 0.5}``.
+    """
+
+    def __init__(self, feature, per_territory=None, base=None, low=None, high=None,
+                 below=None, between=None, above=None):
+        if feature not in FEATURES:
+            raise ValueError(f"Threshold feature must be one of {tuple(FEATURES)}")
+        if (per_territory is None) == (base is None):
+            raise ValueError("Threshold needs exactly one of per_territory and base")
+        if low is not None and high is not None and low > high:
+            raise ValueError("Threshold low factor must not exceed high factor")
+        self.feature = feature
+        self.per_territory = per_territory
+        self.base = base
+        self.low = low
+        self.high = high
+        self.deltas = (below or {}, between or {}, above or {})
+        for deltas in self.deltas:
+            for action in deltas:
+                if action not in ACTIONS:
+                    raise ValueError(f"Unknown action {action!r} (expected one of {ACTIONS})")
+        for value in (per_territory, base):
+            if isinstance(value, str) and value not in DEFAULT_PARAMS.to_dict():
+                raise ValueError(f"Unknown parameter {value!r} in threshold")
+
+    def resolve(self, params):
+        """Zwróć próg z nazwami parametrów zamienionymi na ich wartości w params"""
+        per_territory, base = (getattr(params, value) if isinstance(value, str) else value
+                               for value in (self.per_territory, self.base))
+        if (per_territory, base) == (self.per_territory, self.base):
+            return self
+        return Threshold(self.feature, per_territory, base, self.low, self.high, *self.deltas)
+
+    def reference(self, territory):
+        """Wartość odniesienia dla plemienia o danym terytorium (liczba lub tablica NumPy)"""
+        return self.base if self.base is not None else territory * self.per_territory
+
+    def bin(self, value, territory):
+        """Przedział wartości cechy jednego plemienia"""
+        reference = self.reference(territory)
+        if self.high is not None and value > reference * self.high:
+            return ABOVE
+        if self.low is not None and value < reference * self.low:
+            return BELOW
+        return BETWEEN
+
+    def bins(self, values, territory):
+        """Przedziały wartości cechy dla tablic NumPy (wszystkie plemiona naraz)"""
+        import numpy as np
+
+        reference = self.reference(territory)
+        bins = np.full(len(values), BETWEEN, dtype=np.int64)
+        if self.low is not None:
+            bins[values < reference * self.low] = BELOW
+        if self.high is not None:
+            bins[values > reference * self.high] = ABOVE  # jak w bin: ABOVE ma pierwszeństwo
+        return bins
+
+
+class ThresholdPolicy:
+    """Strategia z tablicą skumulowanych wag dla każdej kombinacji przedziałów progów.
+
+    Waga akcji w kombinacji to ``max(0, suma zmian z progów + base_weight)``.
+    Progi odwołujące się do parametrów rozgrywki mają wartości z ``params``.
+    """
+
+    def __init__(self, thresholds, base_weight=1, params=DEFAULT_PARAMS):
+        self.spec = tuple(thresholds)  # progi w postaci podanej (z nazwami parametrów)
+        self.params = params
+        self.thresholds = tuple(threshold.resolve(params) for threshold in self.spec)
+        self.base_weight = base_weight
+        self._arrays = None  # tablica jako tablice NumPy (tworzona przy pierwszym choose_batch)
+        # table[numer kombinacji] = (skumulowane wagi, suma wag); numer = przedziały progów w systemie trójkowym
+        self.table = []
+        for combination in product(range(3), repeat=len(self.thresholds)):
+            weights = dict.fromkeys(ACTIONS, 0)
+            for threshold, bin_ in zip(self.thresholds, combination):
+                for action, delta in threshold.deltas[bin_].items():
+                    weights[action] += delta
+            cum_weights = list(accumulate(max(0, weights[action] + base_weight) for action in ACTIONS))
+            self.table.append((cum_weights, cum_weights[-1] + 0.0))
+
+    def bind(self, params):
+        """Zwróć strategię z progami liczonymi dla podanych parametrów rozgrywki"""
+        if params == self.params:
+            return self
+        return ThresholdPolicy(self.spec, self.base_weight, params)
+
+    def table_index(self, tribe):
+        """Numer kombinacji przedziałów progów dla plemienia"""
+        territory = len(tribe.territory)
+        index = 0
+        for threshold in self.thresholds:
+            index = index * 3 + threshold.bin(FEATURES[threshold.feature](tribe), territory)
+        return index
+
+    def choose(self, tribe, rng):
+        """Wybierz akcję plemienia (nazwa z ACTIONS); losuje jedną liczbę jak random.choices"""
+        cum_weights, total = self.table[self.table_index(tribe)]
+        if total <= 0:
+            return 'nothing'  # wszystkie wagi zerowe - bez losowania
+        return ACTIONS[bisect(cum_weights, rng.random() * total, 0, len(ACTIONS) - 1)]
+
+    def choose_batch(self, features, territory, draws):
+        """Wybierz akcje wszystkich plemion naraz (tablice NumPy, wymaga NumPy).
+
+        features: nazwa cechy -> tablica wartości, territory: tablica terytoriów,
+        draws: liczby z [0, 1) - po jednej na plemię. Zwraca indeksy akcji w ACTIONS.
+        """
+        import numpy as np
+
+        index = np.zeros(len(territory), dtype=np.int64)
+        for threshold in self.thresholds:
+            index = index * 3 + threshold.bins(features[threshold.feature], territory)
+        if self._arrays is None:
+            self._arrays = (np.array([cum for cum, _ in self.table]), np.array([total for _, total in self.table]))
+        cum_weights = self._arrays[0][index]
+        totals = self._arrays[1][index]
+        actions = (draws[:, None] * totals[:, None] >= cum_weights).sum(axis=1)
+        actions = np.minimum(actions, len(ACTIONS) - 1)
+        actions[totals <= 0] = ACTIONS.index('nothing')
+        return actions
+
+
+# Dotychczasowa strategia plemion
+DEFAULT_POLICY = ThresholdPolicy([
+    # Jedzenie: dużo (2x więcej niż produkujemy) - rekrutuj; mało - gromadź
+    Threshold('food', per_territory='food_per_territory', low=0.5, high=2,
+              above={'train_workers': 0.5, 'train_warriors': 0.5},
+              below={'train_workers': -0.5, 'train_warriors': -0.5, 'nothing': 0.5}),
+    # Budulec: dużo - rozszerzaj i ulepszaj; mało - gromadź
+    Threshold('building_materials', base='expansion_cost', low=0.5, high=2,
+              above={'expand': 0.5, 'upgrade_warriors': 0.5},
+              below={'expand': -0.5, 'upgrade_warriors': -0.5, 'nothing': 0.5}),
+    # Populacja: jest miejsce - rekrutuj; blisko limitu - rozszerzaj terytorium
+    Threshold('population', per_territory='population_per_territory', low=0.8,
+              below={'train_workers': 0.5, 'train_warriors': 0.5},
+              between={'expand': 0.5}),
+    # Siła bojowa: relatywnie mało wojowników (poniżej 1/4 limitu populacji) - rekrutuj i ulepszaj
+    Threshold('warriors', per_territory='population_per_territory', low=0.25,
+              below={'train_warriors': 0.5, 'upgrade_warriors': 0.3}),
+])
+
+
+def load_policy(spec):
+    """Wczytaj strategię wskazaną jako 'moduł:NAZWA' (np. 'my_policies:AGGRESSIVE')"""
+    module_name, _, attribute = spec.partition(':')
+    if not module_name or not attribute:
+        raise ValueError(f"Policy must be given as module:NAME, got {spec!r}")
+    return getattr(importlib.import_module(module_name), attribute)
@@ -0,0 +1,142 @@
+"""Pomiar czasu poszczególnych faz tury symulacji.
+
+``PhaseProfiler`` sumuje czas ścienny i liczbę wywołań każdej fazy
+(np. ``collect_resources``, ``check_collisions``) w każdej turze i łącznie.
+``NullProfiler`` jest domyślny i praktycznie nic nie kosztuje.
+"""
+import csv
+from contextlib import nullcontext
+from time import perf_counter
+
+PHASE_COLUMNS = ['turn', 'phase', 'seconds', 'calls']
+
+
+class _PhaseTimer:
+    """Menedżer kontekstu mierzący jedno wywołanie fazy (jeden obiekt na fazę)"""
+
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.add(self._name, perf_counter() - self._start)
+
+
+class PhaseProfiler:
+    """Profiler faz tury: czas i liczba wywołań na fazę, na turę i łącznie.
+
+    csv_path: opcjonalny plik, do którego po każdej turze dopisywane są
+    wiersze ``turn, phase, seconds, calls``.
+    """
+
+    enabled = True
+
+    def __init__(self, csv_path=None):
+        self.csv_path = csv_path
+        self.totals = {}  # faza -> [sekundy, wywołania]
+        self.turns = 0
+        self._turn = None
+        self._current = {}  # faza -> [sekundy, wywołania] w bieżącej turze
+        self._timers = {}
+        self._file = None
+        self._writer = None
+        if csv_path is not None:
+            self._file = open(csv_path, 'w', newline='')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(PHASE_COLUMNS)
+
+    def start_turn(self, turn):
+        """Zakończ poprzednią turę i zacznij zbierać czasy nowej"""
+        self._finish_turn()
+        self._turn = turn
+
+    def phase(self, name):
+        """Zwróć menedżer kontekstu mierzący fazę `name`"""
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = _PhaseTimer(self, name)
+        return timer
+
+    def add(self, name, seconds, calls=1):
+        """Dolicz czas fazy w bieżącej turze"""
+        entry = self._current.get(name)
+        if entry is None:
+            self._current[name] = [seconds, calls]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+
+    def _finish_turn(self):
+        if self._turn is None:
+            return
+        for name, (seconds, calls) in self._current.items():
+            total = self.totals.setdefault(name, [0.0, 0])
+            total[0] += seconds
+            total[1] += calls
+            if self._writer is not None:
+                self._writer.writerow([self._turn, name, f"{seconds:.9f}", calls])
+        self.turns += 1
+        self._current = {}
+        self._turn = None
+
+    def close(self):
+        """Zakończ ostatnią turę i zamknij plik CSV"""
+        self._finish_turn()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def report(self):
+        """Zwróć raport: faza -> {'seconds', 'calls', 'per_turn', 'share'}, posortowany malejąco po czasie"""
+        self._finish_turn()
+        overall = sum(seconds for seconds, _ in self.totals.values()) or 1.0
+        turns = self.turns or 1
+        ordered = sorted(self.totals.items(), key=lambda item: item[1][0], reverse=True)
+        return {
+            name: {
+                'seconds': seconds,
+                'calls': calls,
+                'per_turn': seconds / turns,
+                'share': seconds / overall
+            }
+            for name, (seconds, calls) in ordered
+        }
+
+    def format_report(self):
+        """Zwróć raport jako tekstową tabelę"""
+        lines = [f"--- Profil faz ({self.turns} tur) ---",
+                 f"{'faza':<20} {'czas [s]':>10} {'wywołania':>10} {'s/turę':>10} {'udział':>7}"]
+        for name, stats in self.report().items():
+            lines.append(f"{name:<20} {stats['seconds']:>10.4f} {stats['calls']:>10} "
+                         f"{stats['per_turn']:>10.6f} {stats['share']:>7.1%}")
+        return "\n".join(lines)
+
+
+class NullProfiler:
+    """Profiler, który nic nie mierzy (domyślny)"""
+
+    enabled = False
+    _NULL_PHASE = nullcontext()
+
+    def start_turn(self, turn):
+        pass
+
+    def phase(self, name):
+        return self._NULL_PHASE
+
+    def add(self, name, seconds, calls=1):
+        pass
+
+    def close(self):
+        pass
+
+    def report(self):
+        return {}
@@ -0,0 +1,215 @@
+"""Zapis danych symulacji strumieniowo, w paczkach, w trakcie jej trwania.
+
+Rekorder dostaje wiersze po każdej turze i zapisuje je na dysk, gdy bufor
+osiągnie ``batch_size`` wierszy, więc zużycie pamięci nie zależy od długości
+przebiegu, a przerwanie symulacji nie traci już zapisanych tur.
+"""
+import csv
+import gzip
+import os
+from abc import ABC, abstractmethod
+
+# Kolumny plików wynikowych (ten sam schemat co wcześniej w Simulation.save_to_csv)
+TRIBE_COLUMNS = ['turn', 'tribe_id', 'workers', 'warriors', 'territory', 'food', 'building_materials', 'alive']
+BATTLE_COLUMNS = ['turn', 'attacker', 'defender', 'winner', 'attacker_losses', 'defender_losses']
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+class Recorder(ABC):
+    """Abstrakcyjna klasa bazowa rekorderów danych symulacji.
+
+    Wiersze plemion to krotki w kolejności ``TRIBE_COLUMNS`` (``alive`` jako 0/1),
+    walki to słowniki z kluczami ``BATTLE_COLUMNS``.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._tribe_rows = []
+        self._battle_rows = []
+        self.closed = False
+
+    def record_tribes(self, rows):
+        """Dodaj wiersze stanu plemion z jednej tury"""
+        self._tribe_rows.extend(rows)
+        if len(self._tribe_rows) >= self.batch_size:
+            self.flush()
+
+    def record_battle(self, battle):
+        """Dodaj wpis walki"""
+        self._battle_rows.append(tuple(battle[column] for column in BATTLE_COLUMNS))
+        if len(self._battle_rows) >= self.batch_size:
+            self.flush()
+
+    def offsets(self):
+        """Pozycje końca zapisanych danych (do wznowienia z checkpointu) lub None, jeśli nieobsługiwane"""
+        return None
+
+    def flush(self):
+        """Zapisz zbuforowane wiersze na dysk"""
+        if self._tribe_rows:
+            self._write_tribes(self._tribe_rows)
+            self._tribe_rows = []
+        if self._battle_rows:
+            self._write_battles(self._battle_rows)
+            self._battle_rows = []
+
+    def close(self):
+        """Zapisz resztę danych i zamknij pliki (wielokrotne wywołanie jest bezpieczne)"""
+        if self.closed:
+            return
+        self.flush()
+        self._close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @abstractmethod
+    def _write_tribes(self, rows):
+        pass
+
+    @abstractmethod
+    def _write_battles(self, rows):
+        pass
+
+    def _close(self):
+        pass
+
+
+class NullRecorder(Recorder):
+    """Rekorder, który niczego nie zapisuje (np. w przebiegach wsadowych)"""
+
+    def record_tribes(self, rows):
+        pass
+
+    def record_battle(self, battle):
+        pass
+
+    def _write_tribes(self, rows):
+        pass
+
+    def _write_battles(self, rows):
+        pass
+
+
+class MemoryRecorder(Recorder):
+    """Rekorder trzymający wszystkie wiersze w pamięci (testy, krótkie przebiegi)"""
+
+    def __init__(self):
+        super().__init__(batch_size=1)
+        self.tribe_rows = []
+        self.battle_rows = []
+
+    def _write_tribes(self, rows):
+        self.tribe_rows.extend(rows)
+
+    def _write_battles(self, rows):
+        self.battle_rows.extend(rows)
+
+
+class CsvRecorder(Recorder):
+    """Rekorder zapisujący ``tribes_data.csv`` i ``battles.csv`` (opcjonalnie skompresowane gzipem).
+
+    offsets: pozycje z checkpointu - istniejące pliki zostaną przycięte do tych
+    pozycji i dopisywanie będzie kontynuowane (tylko dla nieskompresowanego CSV).
+    """
+
+    def __init__(self, directory='.', batch_size=DEFAULT_BATCH_SIZE, compress=False, offsets=None):
+        super().__init__(batch_size)
+        suffix = '.csv.gz' if compress else '.csv'
+        self.compress = compress
+        self.tribes_path = os.path.join(directory, 'tribes_data' + suffix)
+        self.battles_path = os.path.join(directory, 'battles' + suffix)
+
+        self._tribes_file = self._open(self.tribes_path, TRIBE_COLUMNS, offsets and offsets.get('tribes'))
+        self._battles_file = self._open(self.battles_path, BATTLE_COLUMNS, offsets and offsets.get('battles'))
+        self._tribes_writer = csv.writer(self._tribes_file)
+        self._battles_writer = csv.writer(self._battles_file)
+
+    def _open(self, path, columns, offset):
+        """Otwórz plik do zapisu: nowy z nagłówkiem albo istniejący przycięty do `offset`"""
+        if offset is not None and not self.compress and os.path.exists(path):
+            f = open(path, 'r+', newline='')
+            f.truncate(offset)
+            f.seek(offset)
+            return f
+        f = (gzip.open if self.compress else open)(path, 'wt', newline='')
+        csv.writer(f).writerow(columns)
+        return f
+
+    def offsets(self):
+        """Rozmiary plików po zapisaniu bufora (do wznowienia z checkpointu)"""
+        if self.compress or self.closed:
+            return None
+        self.flush()
+        return {'tribes': self._tribes_file.tell(), 'battles': self._battles_file.tell()}
+
+    def _write_tribes(self, rows):
+        self._tribes_writer.writerows(rows)
+        self._tribes_file.flush()
+
+    def _write_battles(self, rows):
+        self._battles_writer.writerows(rows)
+        self._battles_file.flush()
+
+    def _close(self):
+        self._tribes_file.close()
+        self._battles_file.close()
+
+
+class ParquetRecorder(Recorder):
+    """Rekorder zapisujący pliki Parquet (każda paczka to osobna grupa wierszy); wymaga pyarrow"""
+
+    def __init__(self, directory='.', batch_size=DEFAULT_BATCH_SIZE):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(batch_size)
+        self._pa = pa
+        self.tribes_path = os.path.join(directory, 'tribes_data.parquet')
+        self.battles_path = os.path.join(directory, 'battles.parquet')
+        self._tribes_schema = pa.schema([
+            ('turn', pa.int32()), ('tribe_id', pa.int32()), ('workers', pa.int64()),
+            ('warriors', pa.int64()), ('territory', pa.int64()), ('food', pa.float64()),
+            ('building_materials', pa.float64()), ('alive', pa.int8())
+        ])
+        self._battles_schema = pa.schema([(column, pa.int64()) for column in BATTLE_COLUMNS])
+        self._tribes_writer = pq.ParquetWriter(self.tribes_path, self._tribes_schema)
+        self._battles_writer = pq.ParquetWriter(self.battles_path, self._battles_schema)
+
+    def _to_table(self, rows, schema):
+        columns = list(zip(*rows))
+        return self._pa.Table.from_arrays(
+            [self._pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        )
+
+    def _write_tribes(self, rows):
+        self._tribes_writer.write_table(self._to_table(rows, self._tribes_schema))
+
+    def _write_battles(self, rows):
+        self._battles_writer.write_table(self._to_table(rows, self._battles_schema))
+
+    def _close(self):
+        self._tribes_writer.close()
+        self._battles_writer.close()
+
+
+RECORDERS = {
+    'csv': CsvRecorder,
+    'csv.gz': lambda directory='.', batch_size=DEFAULT_BATCH_SIZE: CsvRecorder(directory, batch_size, compress=True),
+    'parquet': ParquetRecorder,
+}
+
+
+def create_recorder(kind='csv', directory='.', batch_size=DEFAULT_BATCH_SIZE):
+    """Utwórz rekorder o podanym formacie ('csv', 'csv.gz' lub 'parquet')"""
+    try:
+        factory = RECORDERS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown recorder format: {kind!r} (expected one of {sorted(RECORDERS)})")
+    return factory(directory=directory, batch_size=batch_size)
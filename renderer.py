@@ -0,0 +1,116 @@
+"""Wyświetlanie planszy w terminalu.
+
+``BoardRenderer`` składa każdą klatkę w jednym buforze i wypisuje ją jednym
+zapisem. W trybie różnicowym (``'diff'``) po pierwszej klatce przerysowuje
+tylko pola zmienione od poprzedniej klatki, ustawiając kursor sekwencjami
+ANSI. Wyświetlanie można ograniczyć do co N-tej tury lub całkiem wyłączyć.
+"""
+import sys
+
+RENDER_MODES = ('full', 'diff', 'off')
+
+CLEAR_SCREEN = '\033[2J\033[H'
+CLEAR_BELOW = '\033[J'
+
+# Kody kolorów ANSI przypisywane cyklicznie plemionom
+COLOR_CODES = [
+    '\033[31m',  # czerwony
+    '\033[32m',  # zielony
+    '\033[33m',  # żółty
+    '\033[34m',  # niebieski
+    '\033[35m',  # magenta
+    '\033[36m',  # cyjan
+    '\033[91m',  # jasny czerwony
+    '\033[92m',  # jasny zielony
+    '\033[93m',  # jasny żółty
+    '\033[94m',  # jasny niebieski
+    '\033[95m',  # jasny magenta
+    '\033[96m',  # jasny cyjan
+]
+RESET_CODE = '\033[0m'  # reset koloru (przywrócenie domyślnego)
+
+
+def cell_width_for(max_id):
+    """Szerokość pola: min 2 znaki, więcej dla dłuższych id plemion"""
+    return max(2, len(str(max_id)))
+
+
+def format_cell(cell, width):
+    """Tekst jednego pola (kolorowe id plemienia albo kropka)"""
+    if cell is None:
+        return '.'.rjust(width)
+    return f"{COLOR_CODES[cell % len(COLOR_CODES)]}{str(cell).rjust(width)}{RESET_CODE}"
+
+
+def format_grid(grid, width):
+    """Cała plansza jako jeden napis (ten sam wygląd co dawne Board.display_board)"""
+    lines = ["\n--- Plansza ---"]
+    for row in grid:
+        lines.append(''.join(format_cell(cell, width) + ' ' for cell in row))
+    lines.append("---------------\n")
+    return '\n'.join(lines) + '\n'
+
+
+class BoardRenderer:
+    """Renderer planszy: pełne klatki jednym zapisem lub przyrostowe przerysowanie zmian.
+
+    mode: 'full' (cała plansza co klatkę), 'diff' (tylko zmienione pola) lub 'off'.
+    every: wyświetlaj co N-tą turę.
+
+    W trybie 'diff' renderer musi być obserwatorem planszy (``cell_changed``).
+    Plansza jest rysowana od lewego górnego rogu ekranu, a tekst wypisywany
+    między klatkami trafia pod nią - jeśli przewinie ekran, pozycje pól się
+    rozjadą, więc ten tryb najlepiej łączyć z wyciszonymi statystykami.
+    """
+
+    def __init__(self, mode='full', every=1, stream=None):
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Render mode must be one of {RENDER_MODES}")
+        if every < 1:
+            raise ValueError("Render interval must be at least 1")
+        self.mode = mode
+        self.every = every
+        self.stream = stream
+        self._dirty = set()
+        self._width = None  # szerokość pola w ostatniej klatce (None = nic nie narysowano)
+
+    @property
+    def enabled(self):
+        return self.mode != 'off'
+
+    def cell_changed(self, x, y, value):
+        """Powiadomienie od planszy o zmianie pola"""
+        if self.mode == 'diff':
+            self._dirty.add((x, y))
+
+    def is_due(self, turn):
+        """Czy w tej turze należy wyświetlić planszę"""
+        return self.enabled and turn % self.every == 0
+
+    def render(self, turn, grid, max_id):
+        """Wyświetl planszę, jeśli wypada na tę turę (grid: wiersze z id plemion lub None)"""
+        if not self.is_due(turn):
+            return
+        stream = self.stream or sys.stdout
+        width = cell_width_for(max_id)
+
+        if self.mode == 'full':
+            stream.write(format_grid(grid, width))
+        elif self._width != width:
+            # Pierwsza klatka lub zmiana szerokości pól - pełne przerysowanie od góry ekranu
+            stream.write(CLEAR_SCREEN + format_grid(grid, width).lstrip('\n'))
+            self._width = width
+        else:
+            stream.write(self._changes(grid, width))
+        self._dirty.clear()
+        stream.flush()
+
+    def _changes(self, grid, width):
+        """Sekwencje ANSI przerysowujące tylko zmienione pola"""
+        parts = []
+        for x, y in sorted(self._dirty):
+            # Wiersz 1 to nagłówek, wiersze planszy zaczynają się od 2 (numeracja ANSI od 1)
+            parts.append(f"\033[{x + 2};{y * (width + 1) + 1}H{format_cell(grid[x][y], width)}")
+        # Kursor pod planszę (za stopką) i wyczyść tekst z poprzedniej tury
+        parts.append(f"\033[{len(grid) + 3};1H{CLEAR_BELOW}")
+        return ''.join(parts)
@@ -0,0 +1,302 @@
+"""Serwer podglądu trwającej symulacji na żywo (asyncio, lokalne HTTP).
+
+Serwer rozgrywa ``Simulation`` w pętli zdarzeń i po każdej turze rozsyła
+wszystkim podłączonym widzom zmiany: zmienione pola, statystyki plemion,
+walki i usunięte plemiona. Strumień to odpowiedź HTTP ``Transfer-Encoding:
+chunked``, w której każda klatka jest jedną linią JSON (NDJSON), więc
+wystarczy ``curl -N``. Pierwsza klatka (``"type": "snapshot"``) to pełny stan,
+kolejne (``"type": "turn"``) to zmiany, ostatnia (``"type": "end"``) to
+podsumowanie przebiegu.
+
+Każdy widz ma własną ograniczoną kolejkę klatek. Gdy kolejka jest pełna
+(wolny klient), klatki są pomijane, a klient dostaje potem pełny stan
+zamiast zmian - symulacja nigdy nie czeka na widzów.
+
+Przykład::
+
+    tribes-serve --board-size 50 --tribes 40 --seed 1 --turn-delay 0.1 --port 8765
+    curl -N http://127.0.0.1:8765/stream
+"""
+import argparse
+import asyncio
+import json
+import logging
+
+from simulation import Simulation
+from params import RunSettings
+from recorder import NullRecorder
+from console import configure_logging, logger
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 64  # klatek oczekujących na wysłanie do jednego widza
+
+
+def encode_chunk(frame):
+    """Zakoduj klatkę jako linię JSON w porcji HTTP chunked"""
+    data = json.dumps(frame, separators=(',', ':')).encode('utf-8') + b'\n'
+    return b'%X\r\n%s\r\n' % (len(data), data)
+
+
+class TurnDeltas:
+    """Obserwator planszy zbierający zmiany jednej tury (pola i usunięte plemiona)"""
+
+    def __init__(self):
+        self.cells = {}  # (x, y) -> id plemienia lub None - ostatnia wartość w turze
+        self.removed = []
+
+    def cell_changed(self, x, y, value):
+        self.cells[x, y] = value
+
+    def tribe_removed(self, tribe_id):
+        self.removed.append(tribe_id)
+
+    def take(self):
+        """Zwróć zmiany od ostatniego wywołania i zacznij zbierać od nowa"""
+        cells = [[x, y, value] for (x, y), value in self.cells.items()]
+        removed = self.removed
+        self.cells = {}
+        self.removed = []
+        return cells, removed
+
+
+class Viewer:
+    """Podłączony widz: ograniczona kolejka zakodowanych klatek i licznik pominiętych"""
+
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.resync = False  # po pominięciu klatek następna musi być pełnym stanem
+
+    def offer(self, chunk):
+        """Dodaj klatkę bez czekania; zwróć False, jeśli kolejka jest pełna"""
+        try:
+            self.queue.put_nowait(chunk)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self.resync = True
+            return False
+        return True
+
+    def finish(self, chunk):
+        """Dodaj klatkę końcową i znacznik końca strumienia (w razie potrzeby wypierając najstarsze klatki)"""
+        for item in (chunk, None):
+            if self.queue.full():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(item)
+
+
+class SimulationServer:
+    """Rozgrywa symulację w pętli asyncio i strumieniuje zmiany tur do widzów.
+
+    turn_delay: przerwa między turami w sekundach (0 - pełna prędkość, ale pętla
+    zdarzeń i tak obsługuje widzów między turami), queue_size: limit klatek w
+    kolejce jednego widza.
+    """
+
+    def __init__(self, sim, host=DEFAULT_HOST, port=DEFAULT_PORT, turn_delay=0.0, queue_size=DEFAULT_QUEUE_SIZE):
+        if sim.ENGINE != 'objects':
+            raise ValueError("Live server requires the objects engine (it streams Board events)")
+        if turn_delay < 0:
+            raise ValueError("Turn delay must not be negative")
+        if queue_size < 1:
+            raise ValueError("Viewer queue size must be at least 1")
+        self.sim = sim
+        self.host = host
+        self.port = port  # po uruchomieniu: faktyczny port (także dla port=0)
+        self.turn_delay = turn_delay
+        self.queue_size = queue_size
+        self.viewers = set()
+        self.deltas = TurnDeltas()
+        self._started = None
+        self._server = None
+
+    @property
+    def started(self):
+        """Zdarzenie ustawiane po otwarciu portu (tworzone w pętli, która je oczekuje)"""
+        # Na Pythonie 3.8/3.9 asyncio.Event wiąże się z pętlą z chwili utworzenia, a main()
+        # buduje serwer przed asyncio.run - dlatego zdarzenie powstaje dopiero przy pierwszym użyciu
+        if self._started is None:
+            self._started = asyncio.Event()
+        return self._started
+
+    def snapshot_frame(self):
+        """Pełny stan: wszystkie zajęte pola, plemiona i dotychczasowe walki"""
+        sim = self.sim
+        board = sim.board
+        return {
+            'type': 'snapshot',
+            'turn': sim.turn,
+            'size': board.size,
+            'cells': [[x, y, tribe.id] for tribe in board.tribes for x, y in sorted(tribe.territory)],
+            'tribes': self.tribe_stats(),
+            'battles': sim.battle_log
+        }
+
+    def tribe_stats(self):
+        return [
+            {
+                'id': tribe.id,
+                'workers': len(tribe.workers),
+                'warriors': len(tribe.warriors),
+                'strength': tribe.total_strength(),
+                'territory': len(tribe.territory),
+                'food': tribe.food,
+                'building_materials': tribe.building_materials
+            }
+            for tribe in self.sim.board.tribes
+        ]
+
+    def broadcast(self, frame):
+        """Wyślij klatkę zmian wszystkim widzom; zaległym zamiast niej pełny stan"""
+        chunk = encode_chunk(frame)
+        snapshot = None
+        for viewer in self.viewers:
+            if viewer.resync:
+                if viewer.queue.full():
+                    viewer.dropped += 1
+                    continue
+                if snapshot is None:
+                    snapshot = encode_chunk(self.snapshot_frame())
+                viewer.resync = False
+                viewer.offer(snapshot)
+            else:
+                viewer.offer(chunk)
+
+    def step(self):
+        """Rozegraj turę i roześlij jej zmiany"""
+        sim = self.sim
+        battles_before = len(sim.battle_log)
+        sim.step()
+        cells, removed = self.deltas.take()
+        self.broadcast({
+            'type': 'turn',
+            'turn': sim.turn,
+            'cells': cells,
+            'tribes': self.tribe_stats(),
+            'battles': sim.battle_log[battles_before:],
+            'removed': removed
+        })
+
+    def prepare(self):
+        """Zainicjalizuj symulację (jeśli trzeba) i podłącz zbieranie zmian do planszy"""
+        sim = self.sim
+        if sim.recorder is None:
+            sim.recorder = NullRecorder()
+        if not sim.is_initialized():
+            sim.initialize()
+        sim.board.add_observer(self.deltas)
+
+    async def run(self):
+        """Uruchom serwer, rozegraj całą symulację i zamknij strumienie widzów"""
+        sim = self.sim
+        self.prepare()
+
+        self._server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Podgląd symulacji: http://%s:%d/stream", self.host, self.port)
+        self.started.set()
+        try:
+            sim.termination_reason = None
+            while True:
+                sim.termination_reason = sim.check_termination()
+                if sim.termination_reason is not None:
+                    break
+                self.step()
+                await asyncio.sleep(self.turn_delay)  # oddaj pętlę obsłudze widzów
+        finally:
+            if sim.termination_reason is None:
+                sim.termination_reason = 'interrupted'
+            sim.save_to_csv()
+            end = encode_chunk({'type': 'end', 'summary': sim.summary()})
+            for viewer in self.viewers:
+                viewer.finish(end)
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def handle_client(self, reader, writer):
+        """Obsłuż jedno żądanie HTTP: /stream (strumień klatek) lub /state (pełny stan)"""
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+            method, path, *_ = request.split(b'\r\n', 1)[0].decode('latin-1').split()
+            if method != 'GET' or path not in ('/stream', '/state'):
+                writer.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+                return
+            if path == '/state':
+                body = json.dumps(self.snapshot_frame(), separators=(',', ':')).encode('utf-8')
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                             b'Content-Length: %d\r\nConnection: close\r\n\r\n%s' % (len(body), body))
+                return
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n'
+                         b'Transfer-Encoding: chunked\r\nCache-Control: no-cache\r\nConnection: close\r\n\r\n')
+            await self.stream(writer)
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass  # niepoprawne żądanie lub widz się rozłączył
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def stream(self, writer):
+        """Wysyłaj klatki z kolejki widza, zaczynając od pełnego stanu"""
+        viewer = Viewer(self.queue_size)
+        viewer.offer(encode_chunk(self.snapshot_frame()))
+        self.viewers.add(viewer)
+        try:
+            while True:
+                chunk = await viewer.queue.get()
+                if chunk is None:
+                    writer.write(b'0\r\n\r\n')  # koniec odpowiedzi chunked
+                    await writer.drain()
+                    return
+                writer.write(chunk)
+                await writer.drain()  # czeka tylko ten widz - symulacja dokłada klatki bez czekania
+        finally:
+            self.viewers.discard(viewer)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Symulacja plemion z podglądem na żywo przez HTTP.")
+    parser.add_argument('--board-size', type=int, required=True, help="rozmiar planszy")
+    parser.add_argument('--tribes', type=int, required=True, help="liczba plemion")
+    parser.add_argument('--seed', type=int, default=None, help="ziarno losowania")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="adres nasłuchiwania (domyślnie tylko lokalnie)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port HTTP")
+    parser.add_argument('--turn-delay', type=float, default=0.1, help="przerwa między turami w sekundach")
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="limit klatek w kolejce jednego widza (nadmiar jest pomijany)")
+    parser.add_argument('--max-turns', type=int, default=None, help="limit tur przebiegu")
+    args = parser.parse_args(argv)
+    if args.turn_delay < 0:
+        parser.error("--turn-delay must not be negative")
+    if args.queue_size < 1:
+        parser.error("--queue-size must be at least 1")
+    if args.max_turns is not None and args.max_turns < 1:
+        parser.error("--max-turns must be at least 1")
+    try:
+        Simulation(args.board_size, args.tribes, 0).validate_parameters()
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv=None):
+    """Punkt wejścia `tribes-serve`"""
+    args = parse_args(argv)
+    configure_logging(logging.INFO)
+    # Szczegóły tur na poziomie DEBUG - konsola pokazuje tylko adres i podsumowanie
+    sim = Simulation(args.board_size, args.tribes, 0, seed=args.seed, display='off', mode='fast',
+                     settings=RunSettings(max_turns=args.max_turns))
+    server = SimulationServer(sim, args.host, args.port, args.turn_delay, args.queue_size)
+    try:
+        asyncio.run(server.run())
+    except KeyboardInterrupt:
+        pass
+    logger.info(sim.format_summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,49 @@ setup(
     name="tribe-simulation",
     version="0.1.0",
     packages=find_packages(),
+    py_modules=[
+        "batch",
+        "battles",
+        "benchmark",
+        "board",
+        "checkpoint",
+        "config",
+        "console",
+        "events",
+        "graf",
+        "grid",
+        "history",
+        "indexed_set",
+        "main",
+        "parallel_engine",
+        "params",
+        "policy",
+        "profiling",
+        "recorder",
+        "renderer",
+        "server",
+        "simulation",
+        "sweep",
+        "tribe",
+        "units",
+        "vector_engine",
+    ],
     install_requires=[
-        # List your dependencies here, e.g.:
-        # 'numpy>=1.21.0',
+        'tomli>=1.1.0; python_version < "3.11"',
     ],
+    extras_require={
+        "vector": ["numpy>=1.21.0"],
+        "parquet": ["pyarrow"],
+        "charts": ["pandas", "matplotlib"],
+    },
     entry_points={
         "console_scripts": [
-            # Define command-line scripts if needed
+            "tribes-batch=batch:main",
+            "tribes-bench=benchmark:main",
+            "tribes-charts=graf:main",
+            "tribes-resume=checkpoint:main",
+            "tribes-serve=server:main",
+            "tribes-sweep=sweep:main",
         ],
     },
 )
@@ -1,166 +1,493 @@
-import time
-import csv
-import random
-from config import MIN_BOARD_SIZE, MAX_BOARD_SIZE, MIN_TRIBES, MAX_TRIBES_RATIO
-from board import Board
-from tribe import Tribe
-
-
-class Simulation:
-    """Główna klasa symulacji"""
-
-    def __init__(self, board_size, tribes_count, time_per_turn):
-        self.board_size = board_size
-        self.tribes_count = tribes_count
-        self.time_per_turn = time_per_turn
-        self.board = None
-        self.turn = 0
-        self.simulation_data = []
-        self.battle_log = []
-
-    def initialize(self):
-        """Inicjalizuj symulację"""
-        # Walidacja parametrów
-        if not MIN_BOARD_SIZE <= self.board_size <= MAX_BOARD_SIZE:
-            raise ValueError(f"Board size must be between {MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}")
-
-        max_tribes = (self.board_size ** 2) // MAX_TRIBES_RATIO
-        if not MIN_TRIBES <= self.tribes_count <= max_tribes:
-            raise ValueError(f"Tribes count must be between {MIN_TRIBES} and {max_tribes}")
-
-        # Stwórz planszę
-        self.board = Board(self.board_size)
-
-        # Umieść plemiona
-        for _ in range(self.tribes_count):
-            pos = self.board.get_random_empty_position()
-            if pos:
-                tribe = Tribe(self.board, pos[0], pos[1])
-                self.board.place_tribe(tribe)
-
-    def run(self):
-        """Uruchom symulację"""
-        self.initialize()
-
-        while sum(1 for tribe in self.board.tribes if tribe.is_alive) > 1:
-            self.turn += 1
-            print(f"\n===== Tura {self.turn} =====")
-            turn_data = []
-
-            # Wykonaj turę dla każdego plemienia
-            for tribe in list(self.board.tribes):
-                if not tribe.is_alive:
-                    continue
-
-                # Faza zbierania surowców
-                tribe.collect_resources()
-
-                # Faza akcji
-                tribe.perform_action()
-
-                # Faza konsumpcji
-                tribe.consume_food()
-
-                # Zapisz dane
-                turn_data.append({
-                    'tribe_id': tribe.id,
-                    'workers': len(tribe.workers),
-                    'warriors': len(tribe.warriors),
-                    'territory': len(tribe.territory),
-                    'food': tribe.food,
-                    'building_materials': tribe.building_materials,
-                    'alive': tribe.is_alive
-                })
-
-            # Zapisz dane tury
-            self.simulation_data.append({
-                'turn': self.turn,
-                'tribes': turn_data
-            })
-
-            # Sprawdź kolizje między plemionami
-            self.check_collisions()
-
-            # Wyświetl planszę i statystyki
-            
-            print("--- Statystyki Plemion ---")
-            for tribe in self.board.tribes:
-                print(tribe)
-
-            self.board.display_board()
-            # Oczekiwanie między turami
-            time.sleep(self.time_per_turn)
-
-        # Zapisz dane po zakończeniu
-        self.save_to_csv()
-
-    def check_collisions(self):
-        """Sprawdź kolizje między plemionami (walki)"""
-        alive_tribes = [t for t in self.board.tribes if t.is_alive]
-        if len(alive_tribes) < 2:
-            return
-
-        # Sprawdź każdą parę plemion, które mają wspólną granicę
-        for i in range(len(alive_tribes)):
-            tribe1 = alive_tribes[i]
-            for j in range(i + 1, len(alive_tribes)):
-                tribe2 = alive_tribes[j]
-                if self.board.have_shared_border(tribe1, tribe2):
-                    print(f"Plemiona {tribe1.id} i {tribe2.id} mają wspólną granicę. Rozpoczyna się walka!")
-                    # Losowo wybierz atakującego i broniącego
-                    if random.random() < 0.5:
-                        attacker, defender = tribe1, tribe2
-                    else:
-                        attacker, defender = tribe2, tribe1
-
-                    # Przeprowadź walkę
-                    result = self.board.battle(attacker, defender)
-                    if result[0] is not None:
-                        winner, loser, winner_losses, loser_losses = result
-                        print(f"Walka zakończona! Zwycięzca: Plemię {winner.id}, Przegrany: Plemię {loser.id}")
-                        print(f"Straty zwycięzcy: {winner_losses}, Straty przegranego: {loser_losses}")
-                        self.battle_log.append({
-                            'turn': self.turn,
-                            'attacker': attacker.id,
-                            'defender': defender.id,
-                            'winner': winner.id,
-                            'attacker_losses': winner_losses if winner == attacker else loser_losses,
-                            'defender_losses': loser_losses if winner == attacker else winner_losses
-                        })
-                    else:
-                        print("Remis - brak wojowników po obu stronach.")
-
-
-    def save_to_csv(self):
-        """Zapisz dane symulacji do pliku CSV"""
-        # Zapis stanów plemion
-        with open('tribes_data.csv', 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                ['turn', 'tribe_id', 'workers', 'warriors', 'territory', 'food', 'building_materials', 'alive'])
-            for turn_data in self.simulation_data:
-                for tribe in turn_data['tribes']:
-                    writer.writerow([
-                        turn_data['turn'],
-                        tribe['tribe_id'],
-                        tribe['workers'],
-                        tribe['warriors'],
-                        tribe['territory'],
-                        tribe['food'],
-                        tribe['building_materials'],
-                        1 if tribe['alive'] else 0
-                    ])
-
-        # Zapis logów walk
-        with open('battles.csv', 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['turn', 'attacker', 'defender', 'winner', 'attacker_losses', 'defender_losses'])
-            for battle in self.battle_log:
-                writer.writerow([
-                    battle['turn'],
-                    battle['attacker'],
-                    battle['defender'],
-                    battle['winner'],
-                    battle['attacker_losses'],
-                    battle['defender_losses']
-                ])
+import logging
+import time
+import random
+from array import array
+from config import MIN_BOARD_SIZE, MAX_BOARD_SIZE, DENSE_BOARD_LIMIT, MIN_TRIBES, MAX_TRIBES_RATIO
+from board import Board
+from tribe import Tribe
+from policy import DEFAULT_POLICY
+from params import DEFAULT_PARAMS, DEFAULT_SETTINGS
+from recorder import CsvRecorder, NullRecorder
+from profiling import NullProfiler
+from renderer import BoardRenderer
+from battles import battle_rounds, resolve_battles
+from checkpoint import save_checkpoint
+from console import configure_logging, logger
+
+# Tryby uruchomienia: 'normal' (wszystko co turę) lub 'fast' (bez czekania, wydruki co report_every tur)
+RUN_MODES = ('normal', 'fast')
+
+# Powody zakończenia przebiegu (Simulation.termination_reason)
+TERMINATION_REASONS = ('winner', 'extinction', 'max_turns', 'stalemate', 'interrupted')
+
+
+class Simulation:
+    """Główna klasa symulacji"""
+
+    ENGINE = 'objects'  # nazwa silnika zapisywana w checkpoincie
+
+    def __init__(self, board_size, tribes_count, time_per_turn, seed=None, recorder=None, profiler=None,
+                 display='full', display_every=1, checkpoint_every=None, checkpoint_path='simulation.ckpt',
+                 mode='normal', report_every=None, log_level=None, settings=None, event_log=None, params=None,
+                 history=None):
+        if mode not in RUN_MODES:
+            raise ValueError(f"Run mode must be one of {RUN_MODES}")
+        if report_every is not None and report_every < 1:
+            raise ValueError("Report interval must be at least 1")
+        self.board_size = board_size
+        self.tribes_count = tribes_count
+        self.time_per_turn = time_per_turn
+        # Każda symulacja ma własny generator - to samo ziarno daje ten sam przebieg
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.board = None
+        self.turn = 0
+        # Rekorder zapisuje dane tur na bieżąco (domyślnie CsvRecorder tworzony w run)
+        self.recorder = recorder
+        self.battle_log = []  # walk jest co najwyżej tyle, ile plemion
+        # Pomiar czasu faz tury (domyślnie wyłączony - NullProfiler)
+        self.profiler = profiler if profiler is not None else NullProfiler()
+        # Tryb szybki: bez czekania, szczegóły tur na poziomie DEBUG, raport co report_every tur
+        self.mode = mode
+        self.report_every = report_every
+        self.log_level = log_level
+        self.detail_level = logging.INFO if mode == 'normal' else logging.DEBUG
+        # Wyświetlanie planszy: 'full', 'diff' (tylko zmiany) lub 'off', co display_every tur
+        if mode == 'fast':
+            display, display_every = (display, report_every) if report_every else ('off', 1)
+        if board_size > DENSE_BOARD_LIMIT and display != 'off':
+            logger.warning("Board %dx%d is too large to display - board rendering disabled", board_size, board_size)
+            display = 'off'
+        self.renderer = BoardRenderer(display, display_every)
+        # Okresowy zapis stanu do wznowienia (co checkpoint_every tur, domyślnie wyłączony)
+        if checkpoint_every is not None and checkpoint_every < 1:
+            raise ValueError("Checkpoint interval must be at least 1")
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_path = checkpoint_path
+        # Ustawienia przebiegu (params.RunSettings): limit tur, wykrywanie patu (stalemate_turns tur
+        # bez zmian i walk), tryb walk ('sequential' lub 'batched', wymaga NumPy) i strategia plemion
+        self.settings = settings if settings is not None else DEFAULT_SETTINGS
+        self.quiet_turns = 0  # kolejne tury bez zmiany terytorium/populacji i bez rozstrzygniętej walki
+        self._last_signature = None
+        self.termination_reason = None
+        # Parametry rozgrywki (params.SimulationParams) - wspólne dla planszy i plemion
+        self.params = params if params is not None else DEFAULT_PARAMS
+        # Strategia wyboru akcji plemion (policy.ThresholdPolicy lub obiekt z metodą choose)
+        self.policy = self.settings.policy if self.settings.policy is not None else DEFAULT_POLICY
+        if hasattr(self.policy, 'bind'):
+            self.policy = self.policy.bind(self.params)  # progi liczone z parametrów tej symulacji
+        # Binarny log zdarzeń z klatkami kluczowymi (events.EventLog) - do odtwarzania dowolnej tury
+        self.event_log = event_log
+        # Historia siatki w pliku mapowanym w pamięci (history.GridHistoryWriter) - do analiz po przebiegu
+        self.history = history
+
+    def validate_parameters(self):
+        """Sprawdź poprawność rozmiaru planszy i liczby plemion"""
+        if not MIN_BOARD_SIZE <= self.board_size <= MAX_BOARD_SIZE:
+            raise ValueError(f"Board size must be between {MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}")
+
+        max_tribes = (self.board_size ** 2) // MAX_TRIBES_RATIO
+        if not MIN_TRIBES <= self.tribes_count <= max_tribes:
+            raise ValueError(f"Tribes count must be between {MIN_TRIBES} and {max_tribes}")
+
+    def initialize(self):
+        """Inicjalizuj symulację"""
+        # Walidacja parametrów
+        self.validate_parameters()
+
+        # Stwórz planszę
+        self.board = Board(self.board_size, rng=self.rng, params=self.params)
+        if self.renderer.mode == 'diff':
+            self.board.add_observer(self.renderer)
+
+        # Umieść plemiona
+        for _ in range(self.tribes_count):
+            pos = self.board.get_random_empty_position()
+            if pos:
+                tribe = Tribe(self.board, pos[0], pos[1], self.policy)
+                self.board.place_tribe(tribe)
+        if self.event_log is not None:
+            self.event_log.attach(self)
+        if self.history is not None:
+            self.history.attach(self)
+
+    def is_initialized(self):
+        """Czy plansza już istnieje (po initialize lub odtworzeniu z checkpointu)"""
+        return self.board is not None
+
+    def alive_tribes_count(self):
+        """Zwróć liczbę żywych plemion (pokonane plemiona są usuwane z planszy)"""
+        return len(self.board.tribes)
+
+    def alive_tribe_ids(self):
+        """Zwróć listę id żywych plemion"""
+        return [tribe.id for tribe in self.board.tribes if tribe.is_alive]
+
+    def is_report_turn(self):
+        """Czy w tej turze wypisać statystyki (tryb zwykły: zawsze, szybki: co report_every tur)"""
+        if self.mode == 'normal':
+            return True
+        return self.report_every is not None and self.turn % self.report_every == 0
+
+    def turn_log_level(self):
+        """Poziom logowania nagłówka i statystyk bieżącej tury (raportowana: INFO, pozostałe: szczegóły)"""
+        return logging.INFO if self.is_report_turn() else self.detail_level
+
+    def summary(self):
+        """Zwróć podsumowanie zakończonej (lub trwającej) symulacji"""
+        alive_ids = self.alive_tribe_ids()
+        return {
+            'board_size': self.board_size,
+            'tribes_count': self.tribes_count,
+            'turns': self.turn,
+            'tribes_alive': len(alive_ids),
+            'winner': alive_ids[0] if len(alive_ids) == 1 else None,
+            'battles': len(self.battle_log),
+            'termination_reason': self.termination_reason
+        }
+
+    def check_termination(self):
+        """Zwróć powód zakończenia przebiegu (z TERMINATION_REASONS) albo None, jeśli gra trwa dalej"""
+        alive = self.alive_tribes_count()
+        if alive == 1:
+            return 'winner'
+        if alive == 0:
+            return 'extinction'
+        settings = self.settings
+        if settings.max_turns is not None and self.turn >= settings.max_turns:
+            return 'max_turns'
+        if settings.stalemate_turns is not None and self.quiet_turns >= settings.stalemate_turns:
+            return 'stalemate'
+        return None
+
+    def stalemate_signature(self):
+        """Zwróć stan terytorium i populacji plemion do porównania między turami"""
+        return tuple((len(tribe.territory), len(tribe.workers) + len(tribe.warriors)) for tribe in self.board.tribes)
+
+    def update_stalemate(self, battles_before):
+        """Policz tury bez zmian terytorium/populacji i bez rozstrzygniętych walk.
+
+        Remisy (walki bez wojowników po obu stronach) niczego nie zmieniają,
+        więc takie styki nie przerywają patu.
+        """
+        signature = self.stalemate_signature()
+        if signature == self._last_signature and len(self.battle_log) == battles_before:
+            self.quiet_turns += 1
+        else:
+            self.quiet_turns = 0
+        self._last_signature = signature
+
+    def run(self, save=True):
+        """Uruchom symulację (save=False pomija zapis plików CSV)"""
+        if self.recorder is None:
+            self.recorder = CsvRecorder() if save else NullRecorder()
+        configure_logging(self.log_level)
+        # Symulacja odtworzona z checkpointu jest kontynuowana od zapisanej tury
+        if not self.is_initialized():
+            self.initialize()
+
+        self.termination_reason = None
+        try:
+            while True:
+                self.termination_reason = self.check_termination()
+                if self.termination_reason is not None:
+                    break
+                self.step()
+                if self.checkpoint_every and self.turn % self.checkpoint_every == 0:
+                    with self.profiler.phase('checkpoint'):
+                        save_checkpoint(self, self.checkpoint_path)
+                # Oczekiwanie między turami (tryb szybki działa z pełną prędkością)
+                if self.mode == 'normal' and self.time_per_turn > 0:
+                    with self.profiler.phase('sleep'):
+                        time.sleep(self.time_per_turn)
+        finally:
+            if self.termination_reason is None:
+                self.termination_reason = 'interrupted'
+            # Zapisz zbuforowane dane także po przerwaniu (np. Ctrl+C lub błąd)
+            self.save_to_csv()
+
+        if self.mode == 'fast':
+            logger.info(self.format_summary())
+        if self.profiler.enabled:
+            logger.info(self.profiler.format_report())
+
+    def format_summary(self):
+        """Zwróć podsumowanie przebiegu jako tekst"""
+        summary = self.summary()
+        winner = "brak" if summary['winner'] is None else f"Plemię {summary['winner']}"
+        return (f"--- Podsumowanie ---\n"
+                f"Tury: {summary['turns']}, żywe plemiona: {summary['tribes_alive']}, "
+                f"walki: {summary['battles']}, zwycięzca: {winner}, "
+                f"powód zakończenia: {summary['termination_reason']}")
+
+    def step(self):
+        """Rozegraj jedną pełną turę symulacji"""
+        self.turn += 1
+        if self.event_log is not None:
+            self.event_log.begin_turn(self.turn)
+        battles_before = len(self.battle_log)
+        profiler = self.profiler
+        profiler.start_turn(self.turn)
+        level = self.turn_log_level()
+        logger.log(level, "\n===== Tura %d =====", self.turn)
+
+        # Fazy plemion: surowce, akcja, konsumpcja
+        self.play_tribe_phases()
+
+        # Sprawdź kolizje między plemionami
+        with profiler.phase('check_collisions'):
+            self.check_collisions()
+
+        # Wyświetl planszę i statystyki
+        if logger.isEnabledFor(level):
+            with profiler.phase('print_stats'):
+                logger.log(level, "--- Statystyki Plemion ---")
+                self.print_stats()
+        with profiler.phase('display_board'):
+            self.display_board()
+
+        if self.settings.stalemate_turns is not None:
+            self.update_stalemate(battles_before)
+        if self.event_log is not None:
+            self.event_log.end_turn(self)
+        if self.history is not None:
+            self.history.end_turn(self)
+
+    def play_tribe_phases(self):
+        """Wykonaj fazy zbierania surowców, akcji i konsumpcji dla każdego plemienia"""
+        rows = []
+        collect_phase = self.profiler.phase('collect_resources')
+        action_phase = self.profiler.phase('perform_action')
+        consume_phase = self.profiler.phase('consume_food')
+
+        # Wykonaj turę dla każdego plemienia
+        for tribe in list(self.board.tribes):
+            if not tribe.is_alive:
+                continue
+
+            # Faza zbierania surowców
+            with collect_phase:
+                tribe.collect_resources()
+
+            # Faza akcji
+            with action_phase:
+                tribe.perform_action()
+
+            # Faza konsumpcji
+            with consume_phase:
+                tribe.consume_food()
+
+            # Zapisz dane (kolejność kolumn jak recorder.TRIBE_COLUMNS)
+            rows.append((
+                self.turn,
+                tribe.id,
+                len(tribe.workers),
+                len(tribe.warriors),
+                len(tribe.territory),
+                tribe.food,
+                tribe.building_materials,
+                1 if tribe.is_alive else 0
+            ))
+
+        # Przekaż dane tury do rekordera
+        with self.profiler.phase('record'):
+            self.recorder.record_tribes(rows)
+
+    def print_stats(self):
+        """Wypisz statystyki żywych plemion"""
+        level = self.turn_log_level()
+        for tribe in self.board.tribes:
+            logger.log(level, "%s", tribe)
+
+    def display_board(self):
+        """Wyświetl planszę (zgodnie z trybem i częstotliwością renderera)"""
+        self.renderer.render(self.turn, self.board.grid, self.board.max_tribe_id)
+
+    def check_collisions(self):
+        """Sprawdź kolizje między plemionami (walki)"""
+        if len(self.board.tribes) < 2:
+            return
+        if self.settings.battle_mode == 'batched':
+            self.check_collisions_batched()
+            return
+
+        # Sprawdź każdą parę plemion, które mają wspólną granicę (z indeksu styków planszy)
+        for id1, id2 in self.board.contacting_pairs():
+            # Para mogła przestać się stykać po wcześniejszej walce w tej turze
+            if (id1, id2) not in self.board.contacts:
+                continue
+            tribe1 = self.board.get_tribe(id1)
+            tribe2 = self.board.get_tribe(id2)
+            if tribe1 is None or tribe2 is None or not (tribe1.is_alive and tribe2.is_alive):
+                continue
+            logger.log(self.detail_level, "Plemiona %d i %d mają wspólną granicę. Rozpoczyna się walka!",
+                       tribe1.id, tribe2.id)
+            # Losowo wybierz atakującego i broniącego
+            if self.rng.random() < 0.5:
+                attacker, defender = tribe1, tribe2
+            else:
+                attacker, defender = tribe2, tribe1
+
+            # Przeprowadź walkę
+            result = self.board.battle(attacker, defender)
+            if result[0] is not None:
+                winner, loser, winner_losses, loser_losses = result
+                self.battle_finished(attacker.id, defender.id, winner.id, loser.id, winner_losses, loser_losses)
+            else:
+                logger.log(self.detail_level, "Remis - brak wojowników po obu stronach.")
+
+    def check_collisions_batched(self):
+        """Rozstrzygnij walki wszystkich stykających się par rundami rozłącznych par (battles.py)"""
+        board = self.board
+        for round_pairs in battle_rounds(board.contacting_pairs()):
+            # Plemiona pokonane we wcześniejszej rundzie zniknęły z planszy
+            fights = [(board.get_tribe(id1), board.get_tribe(id2)) for id1, id2 in round_pairs]
+            fights = [(tribe1, tribe2) for tribe1, tribe2 in fights if tribe1 is not None and tribe2 is not None]
+            if not fights:
+                continue
+
+            # Losowania całej rundy z góry: strona atakująca, potem udziały przejętych zasobów
+            sides = [(tribe1, tribe2) if self.rng.random() < 0.5 else (tribe2, tribe1) for tribe1, tribe2 in fights]
+            low, high = self.params.stole_resources_min, self.params.stole_resources_max
+            shares = [(self.rng.uniform(low, high), self.rng.uniform(low, high)) for _ in sides]
+            decisive, attacker_wins, winner_losses, _ = resolve_battles(
+                [attacker.total_strength() for attacker, _ in sides],
+                [defender.total_strength() for _, defender in sides],
+                [len(attacker.warriors) for attacker, _ in sides],
+                [len(defender.warriors) for _, defender in sides]
+            )
+
+            for i, (attacker, defender) in enumerate(sides):
+                logger.log(self.detail_level, "Plemiona %d i %d mają wspólną granicę. Rozpoczyna się walka!",
+                           min(attacker.id, defender.id), max(attacker.id, defender.id))
+                if not decisive[i]:
+                    logger.log(self.detail_level, "Remis - brak wojowników po obu stronach.")
+                    continue
+                winner, loser = (attacker, defender) if attacker_wins[i] else (defender, attacker)
+                losses = int(winner_losses[i])
+                loser_losses = board.apply_battle(winner, loser, losses, *shares[i])
+                self.battle_finished(attacker.id, defender.id, winner.id, loser.id, losses, loser_losses)
+
+    def battle_finished(self, attacker, defender, winner, loser, winner_losses, loser_losses):
+        """Wypisz i zapisz wynik rozstrzygniętej walki (argumenty to id plemion)"""
+        logger.log(self.detail_level, "Walka zakończona! Zwycięzca: Plemię %d, Przegrany: Plemię %d", winner, loser)
+        logger.log(self.detail_level, "Straty zwycięzcy: %d, Straty przegranego: %d", winner_losses, loser_losses)
+        self.record_battle(
+            attacker,
+            defender,
+            winner,
+            winner_losses if winner == attacker else loser_losses,
+            loser_losses if winner == attacker else winner_losses
+        )
+
+    def record_battle(self, attacker, defender, winner, attacker_losses, defender_losses):
+        """Zapisz wynik walki w logu i w rekorderze (argumenty to id plemion)"""
+        battle = {
+            'turn': self.turn,
+            'attacker': attacker,
+            'defender': defender,
+            'winner': winner,
+            'attacker_losses': attacker_losses,
+            'defender_losses': defender_losses
+        }
+        self.battle_log.append(battle)
+        self.recorder.record_battle(battle)
+        if self.event_log is not None:
+            self.event_log.battle_fought(battle)
+
+    def reseed(self, seed):
+        """Zmień ziarno generatora w trakcie przebiegu (np. rozgałęzienie z checkpointu)"""
+        self.seed = seed
+        self.rng.seed(seed)  # plansza i plemiona współdzielą ten sam obiekt generatora
+
+    def snapshot(self):
+        """Zwróć stan symulacji do checkpointu jako (meta, sections).
+
+        meta: dane serializowalne do JSON, sections: nazwa -> tablica ``array``
+        (siatka i pule pól zapisane jako płaskie indeksy ``x * rozmiar + y``).
+        """
+        board = self.board
+        size = self.board_size
+        territory = array('i')
+        frontier = array('i')
+        tribes = []
+        for tribe in board.tribes:
+            state = tribe.state()
+            # Terytorium posortowane - kolejność zbioru nie ma znaczenia dla przebiegu
+            state['territory'] = len(tribe.territory)
+            state['frontier'] = len(tribe.frontier)
+            territory.extend(x * size + y for x, y in sorted(tribe.territory))
+            frontier.extend(x * size + y for x, y in tribe.frontier)
+            tribes.append(state)
+
+        version, internal_state, gauss_next = self.rng.getstate()
+        meta = {
+            'engine': self.ENGINE,
+            'board_size': size,
+            'tribes_count': self.tribes_count,
+            'time_per_turn': self.time_per_turn,
+            'seed': self.seed,
+            'turn': self.turn,
+            'quiet_turns': self.quiet_turns,
+            'rng_state': [version, list(internal_state), gauss_next],
+            'next_tribe_id': board.next_tribe_id,
+            'battle_log': self.battle_log,
+            'params': self.params.to_dict(),
+            'settings': self.settings.to_dict(),
+            'mode': self.mode,
+            'report_every': self.report_every,
+            'recorder_offsets': self.recorder.offsets() if self.recorder is not None else None,
+            'tribes': tribes
+        }
+        # Siatka wynika z terytoriów; pula wolnych pól zapisywana tylko dla gęstej planszy (ważna kolejność)
+        sections = {'territory': territory, 'frontier': frontier}
+        if size <= DENSE_BOARD_LIMIT:
+            sections['free_cells'] = array('i', (x * size + y for x, y in board.free_cells))
+        return meta, sections
+
+    def restore(self, meta, sections):
+        """Odtwórz stan zapisany przez snapshot (plansza, plemiona, generator, numer tury)"""
+        size = self.board_size
+        version, internal_state, gauss_next = meta['rng_state']
+        self.rng.setstate((version, tuple(internal_state), gauss_next))
+        self.turn = meta['turn']
+        self.battle_log = [dict(battle) for battle in meta['battle_log']]
+
+        def cells(indices):
+            return [divmod(index, size) for index in indices]
+
+        self.board = Board(size, rng=self.rng, params=self.params)
+        if self.renderer.mode == 'diff':
+            self.board.add_observer(self.renderer)
+
+        tribes = []
+        territory_start = frontier_start = 0
+        for state in meta['tribes']:
+            territory_end = territory_start + state['territory']
+            frontier_end = frontier_start + state['frontier']
+            tribes.append(Tribe.from_state(
+                self.board,
+                state,
+                cells(sections['territory'][territory_start:territory_end]),
+                cells(sections['frontier'][frontier_start:frontier_end]),
+                self.policy
+            ))
+            territory_start, frontier_start = territory_end, frontier_end
+        free_cells = cells(sections['free_cells']) if 'free_cells' in sections else None
+        self.board.restore(free_cells, tribes, meta['next_tribe_id'])
+        self.quiet_turns = meta['quiet_turns']
+        self._last_signature = self.stalemate_signature()
+        if self.event_log is not None:
+            self.event_log.attach(self)
+        if self.history is not None:
+            self.history.attach(self)
+
+    def save_to_csv(self):
+        """Zapisz pozostałe zbuforowane dane symulacji i zamknij pliki wynikowe"""
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.event_log is not None:
+            self.event_log.close()
+        if self.history is not None:
+            self.history.close()
+        self.profiler.close()
@@ -0,0 +1,278 @@
+"""Przeszukiwanie parametrów rozgrywki z pamięcią podręczną wyników.
+
+Sweep rozwija siatkę (``--grid nazwa=1,2,3``) lub losową próbkę
+(``--random nazwa=od:do --samples N``) parametrów ``params.SimulationParams``,
+łączy każdy punkt z listą ziaren i uruchamia brakujące przebiegi w puli
+procesów (``batch.run_single``). Podsumowanie każdego przebiegu trafia do
+lokalnej bazy SQLite pod kluczem będącym skrótem parametrów, ziarna,
+ustawień przebiegu i wersji kodu symulacji, więc ponowne uruchomienie płaci
+tylko za nowe punkty, a zmiana kodu symulacji unieważnia stare wyniki.
+
+Przykład::
+
+    tribes-sweep --board-size 30 --tribes 20 --seeds 50 --grid food_per_territory=10,20,30 \\
+        --grid expansion_cost=100,200 --workers 8
+    tribes-sweep --board-size 30 --tribes 20 --seeds 20 --random expansion_cost=50:400 --samples 30
+"""
+import argparse
+import csv
+import hashlib
+import importlib.util
+import json
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields
+from functools import lru_cache
+from itertools import product
+
+from batch import ENGINES, create_simulation, RESULT_COLUMNS, DEFAULT_MAX_TURNS, DEFAULT_STALEMATE_TURNS, run_single
+from params import DEFAULT_PARAMS, DEFAULT_SETTINGS, RunSettings, SimulationParams, parse_override
+
+# Moduły, od których zależy wynik przebiegu - ich kod wchodzi do wersji kodu w kluczu wyników
+SIMULATION_MODULES = ('batch', 'battles', 'board', 'config', 'grid', 'indexed_set', 'params', 'policy',
+                      'simulation', 'tribe', 'units', 'vector_engine', 'parallel_engine')
+DEFAULT_CACHE = 'sweep_cache.sqlite'
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """Skrót kodu źródłowego modułów symulacji (liczony raz na proces)"""
+    digest = hashlib.sha256()
+    for name in SIMULATION_MODULES:
+        spec = importlib.util.find_spec(name)
+        digest.update(name.encode('utf-8'))
+        with open(spec.origin, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def run_key(params, seed, setup, version=None):
+    """Klucz wyniku: skrót parametrów, ziarna, ustawień przebiegu (setup) i wersji kodu"""
+    payload = {
+        'params': params.to_dict(),
+        'seed': seed,
+        'setup': setup,
+        'code_version': version if version is not None else code_version()
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Podsumowania przebiegów w bazie SQLite (klucz z run_key -> podsumowanie jako JSON)"""
+
+    def __init__(self, path=DEFAULT_CACHE):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " key TEXT PRIMARY KEY, seed INTEGER, params TEXT, setup TEXT,"
+            " code_version TEXT, summary TEXT, created REAL)"
+        )
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def get_many(self, keys):
+        """Zwróć słownik klucz -> podsumowanie dla kluczy obecnych w bazie"""
+        found = {}
+        keys = list(keys)
+        for start in range(0, len(keys), 500):  # limit parametrów zapytania SQLite
+            chunk = keys[start:start + 500]
+            rows = self.connection.execute(
+                f"SELECT key, summary FROM runs WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update((key, json.loads(summary)) for key, summary in rows)
+        return found
+
+    def put(self, key, params, seed, setup, summary, version=None):
+        """Zapisz podsumowanie przebiegu (od razu na dysk - przerwany sweep nie traci wyników)"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, seed, json.dumps(params.to_dict(), sort_keys=True), json.dumps(setup, sort_keys=True),
+             version if version is not None else code_version(), json.dumps(summary), time.time())
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def grid_points(base, axes):
+    """Wszystkie kombinacje wartości osi (nazwa parametru -> lista wartości) na bazie parametrów base"""
+    names = list(axes)
+    return [base.with_overrides(**dict(zip(names, values))) for values in product(*(axes[name] for name in names))]
+
+
+def random_points(base, ranges, samples, rng):
+    """Losowe punkty: każdy parametr z przedziału [od, do] (całkowite dla parametrów całkowitych)"""
+    types = {f.name: f.type for f in fields(SimulationParams) if f.init}
+    points = []
+    for _ in range(samples):
+        overrides = {}
+        for name, (low, high) in ranges.items():
+            if types.get(name) in (int, 'int'):
+                overrides[name] = rng.randint(int(low), int(high))
+            else:
+                overrides[name] = rng.uniform(low, high)
+        points.append(base.with_overrides(**overrides))
+    return points
+
+
+def run_sweep(points, seeds, board_size, tribes_count, cache, workers=None, engine='objects',
+              settings=DEFAULT_SETTINGS, progress=None):
+    """Uruchom brakujące przebiegi (punkt x ziarno) i zwróć wyniki wszystkich, w kolejności punktów i ziaren.
+
+    Wynik to podsumowanie przebiegu (jak batch.run_single) z kluczami 'params' (słownik)
+    i 'cached' (True, jeśli pochodzi z pamięci podręcznej). progress(gotowe, wszystkie)
+    wywoływane jest po każdym nowym przebiegu. Ustawienia przebiegu (params.RunSettings)
+    wchodzą do klucza wyników, więc sweep używa domyślnej strategii plemion.
+    """
+    if settings.policy is not None:
+        raise ValueError("Sweeps use the default policy (a policy object cannot be part of the cache key)")
+    seeds = list(seeds)
+    setup = {
+        'board_size': board_size,
+        'tribes_count': tribes_count,
+        'engine': engine,
+        **settings.to_dict()
+    }
+    runs = [(run_key(params, seed, setup), params, seed) for params in points for seed in seeds]
+    cached = cache.get_many(key for key, _, _ in runs)
+    # Ten sam punkt może wystąpić kilka razy (np. w próbce losowej) - liczymy go raz
+    missing = list({key: (params, seed) for key, params, seed in runs if key not in cached}.items())
+
+    summaries = dict(cached)
+
+    def finished(key, params, seed, summary):
+        cache.put(key, params, seed, setup, summary)
+        summaries[key] = summary
+        if progress is not None:
+            progress(len(summaries) - len(cached), len(missing))
+
+    options = dict(board_size=board_size, tribes_count=tribes_count, engine=engine, settings=settings)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(missing) <= 1:
+        for key, (params, seed) in missing:
+            finished(key, params, seed, run_single(seed, params=params, **options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_single, seed, params=params, **options): (key, params, seed)
+                       for key, (params, seed) in missing}
+            for future in as_completed(futures):
+                finished(*futures[future], future.result())
+
+    return [dict(summaries[key], params=params.to_dict(), cached=key in cached) for key, params, _ in runs]
+
+
+def write_results(results, filename, param_names):
+    """Zapisz wyniki sweepu do CSV: przeszukiwane parametry, potem kolumny batch.RESULT_COLUMNS"""
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(list(param_names) + RESULT_COLUMNS)
+        for result in results:
+            writer.writerow([result['params'][name] for name in param_names] +
+                            [result.get(column) for column in RESULT_COLUMNS])
+
+
+def parse_axis(text):
+    """Zamień 'nazwa=1,2,3' na (nazwa, [wartości])"""
+    name, separator, values = text.partition('=')
+    if not separator or not values:
+        raise ValueError(f"Grid axis must look like name=v1,v2,..., got {text!r}")
+    return name.strip(), [parse_override(f"{name}={value}")[1] for value in values.split(',')]
+
+
+def parse_range(text):
+    """Zamień 'nazwa=od:do' na (nazwa, (od, do))"""
+    name, separator, bounds = text.partition('=')
+    low, colon, high = bounds.partition(':')
+    if not separator or not colon:
+        raise ValueError(f"Random range must look like name=low:high, got {text!r}")
+    low, high = parse_override(f"{name}={low}")[1], parse_override(f"{name}={high}")[1]
+    if low > high:
+        raise ValueError(f"Random range of {name.strip()} is empty ({low} > {high})")
+    return name.strip(), (low, high)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Przeszukiwanie parametrów symulacji plemion z pamięcią wyników.")
+    parser.add_argument('--board-size', type=int, required=True, help="rozmiar planszy")
+    parser.add_argument('--tribes', type=int, required=True, help="liczba plemion")
+    parser.add_argument('--seed-start', type=int, default=0, help="pierwsze ziarno (domyślnie 0)")
+    parser.add_argument('--seeds', type=int, default=10, help="liczba ziaren na punkt parametrów")
+    search = parser.add_mutually_exclusive_group(required=True)
+    search.add_argument('--grid', metavar='NAME=V1,V2', action='append', help="oś siatki (można powtarzać)")
+    search.add_argument('--random', metavar='NAME=LOW:HIGH', action='append', help="przedział losowania (można powtarzać)")
+    parser.add_argument('--samples', type=int, default=20, help="liczba losowych punktów (z --random)")
+    parser.add_argument('--sample-seed', type=int, default=0, help="ziarno losowania punktów (z --random)")
+    parser.add_argument('--params', metavar='FILE', default=None, help="parametry bazowe z pliku .toml lub .json")
+    parser.add_argument('--set', metavar='NAME=VALUE', action='append', default=[], dest='overrides',
+                        help="nadpisz parametr bazowy (można powtarzać)")
+    parser.add_argument('--workers', type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument('--engine', choices=ENGINES, default='objects', help="silnik symulacji")
+    parser.add_argument('--max-turns', type=int, default=DEFAULT_MAX_TURNS, help="limit tur jednego przebiegu")
+    parser.add_argument('--stalemate-turns', type=int, default=DEFAULT_STALEMATE_TURNS,
+                        help="zakończ po tylu turach bez zmian terytorium/populacji i bez walk")
+    parser.add_argument('--cache', default=DEFAULT_CACHE, help="plik bazy wyników SQLite")
+    parser.add_argument('--output', default='sweep_results.csv', help="plik wynikowy CSV")
+    args = parser.parse_args(argv)
+
+    if args.seeds < 1:
+        parser.error("--seeds must be at least 1")
+    if args.samples < 1:
+        parser.error("--samples must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_turns < 1:
+        parser.error("--max-turns must be at least 1")
+    if args.stalemate_turns < 1:
+        parser.error("--stalemate-turns must be at least 1")
+    try:
+        create_simulation(args.board_size, args.tribes, None, args.engine).validate_parameters()
+        base = SimulationParams.load(args.params) if args.params is not None else DEFAULT_PARAMS
+        base = base.with_overrides(**dict(parse_override(text) for text in args.overrides))
+        if args.grid:
+            axes = dict(parse_axis(text) for text in args.grid)
+            args.points = grid_points(base, axes)
+        else:
+            axes = dict(parse_range(text) for text in args.random)
+            args.points = random_points(base, axes, args.samples, random.Random(args.sample_seed))
+    except (ValueError, OSError, ImportError) as e:
+        parser.error(str(e))
+    args.param_names = list(axes)
+    return args
+
+
+def main(argv=None):
+    """Punkt wejścia `tribes-sweep`"""
+    args = parse_args(argv)
+    seeds = range(args.seed_start, args.seed_start + args.seeds)
+
+    def progress(done, total):
+        print(f"\rNowe przebiegi: {done}/{total}", end='\n' if done == total else '', flush=True)
+
+    start = time.perf_counter()
+    settings = RunSettings(max_turns=args.max_turns, stalemate_turns=args.stalemate_turns)
+    with ResultCache(args.cache) as cache:
+        results = run_sweep(args.points, seeds, args.board_size, args.tribes, cache, args.workers, args.engine,
+                            settings, progress=progress)
+    elapsed = time.perf_counter() - start
+    write_results(results, args.output, args.param_names)
+
+    computed = sum(not result['cached'] for result in results)
+    print(f"Zakończono {len(results)} przebiegów ({len(args.points)} punktów x {args.seeds} ziaren) w {elapsed:.2f} s: "
+          f"{computed} nowych, {len(results) - computed} z pamięci {args.cache}. Wyniki zapisano do {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import contextlib
+import csv
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import batch
+from batch import RESULT_COLUMNS, run_batch, run_single
+from params import RunSettings
+
+SETTINGS = RunSettings(max_turns=150)
+
+
+def without_elapsed(result):
+    return {key: value for key, value in result.items() if key != 'elapsed'}
+
+
+class TestBatch(unittest.TestCase):
+    def test_run_batch_keeps_seed_order(self):
+        """Wyniki z jednego i dwóch procesów wracają w kolejności ziaren i zgadzają się z run_single."""
+        seeds = [5, 1, 3, 2]
+        expected = [without_elapsed(run_single(seed, 12, 8, settings=SETTINGS)) for seed in seeds]
+        for workers in (1, 2):
+            results = run_batch(12, 8, seeds, workers=workers, settings=SETTINGS)
+            self.assertEqual([result['seed'] for result in results], seeds)
+            self.assertEqual([without_elapsed(result) for result in results], expected,
+                             f"Wyniki z workers={workers} różnią się od run_single.")
+
+    def test_main_writes_result_columns(self):
+        """tribes-batch zapisuje do pliku wyjściowego wiersz na przebieg z kolumnami RESULT_COLUMNS."""
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'results.csv')
+            with contextlib.redirect_stdout(io.StringIO()):
+                batch.main(['--board-size', '12', '--tribes', '8', '--runs', '3', '--workers', '1',
+                            '--max-turns', '150', '--output', output])
+            with open(output, newline='') as f:
+                reader = csv.DictReader(f)
+                rows = list(reader)
+            self.assertEqual(reader.fieldnames, RESULT_COLUMNS)
+            self.assertEqual([row['seed'] for row in rows], ['0', '1', '2'])
+            self.assertEqual(rows[1]['turns'], str(run_single(1, 12, 8, settings=SETTINGS)['turns']))
+
+
+if __name__ == "__main__":
+    unittest.main()
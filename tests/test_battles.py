@@ -0,0 +1,82 @@
+import contextlib
+import io
+import os
+import random
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from battles import battle_rounds, resolve_battles
+from board import Board
+from tribe import Tribe
+from simulation import Simulation
+from params import RunSettings
+from recorder import MemoryRecorder
+
+try:
+    import numpy as np
+except ImportError:  # zbiorcze walki wymagają NumPy
+    np = None
+
+
+class TestBattleRounds(unittest.TestCase):
+    def test_rounds_are_disjoint_and_keep_order(self):
+        """W rundzie każde plemię walczy raz, a jego walki zachowują kolejność par."""
+        pairs = [(0, 1), (0, 2), (1, 3), (2, 3), (4, 5)]
+        rounds = battle_rounds(pairs)
+        self.assertEqual(rounds, [[(0, 1), (4, 5)], [(0, 2), (1, 3)], [(2, 3)]])
+
+
+@unittest.skipUnless(np is not None, "Zbiorcze walki wymagają biblioteki NumPy")
+class TestResolveBattles(unittest.TestCase):
+    def test_matches_board_battle(self):
+        """Wektorowe wyniki rundy są takie same jak z Board.battle dla każdej pary osobno."""
+        rng = random.Random(5)
+        cases = []
+        for _ in range(50):
+            board = Board(size=10)
+            attacker = Tribe(board, 0, 0)
+            defender = Tribe(board, 5, 5)
+            for tribe in (attacker, defender):
+                board.place_tribe(tribe)
+                tribe.warriors.clear()
+                for level, count in enumerate(rng.choices(range(4), k=3), start=1):
+                    tribe.warriors.add(count, level)
+            cases.append((board, attacker, defender))
+
+        decisive, attacker_wins, winner_losses, loser_losses = resolve_battles(
+            [attacker.total_strength() for _, attacker, _ in cases],
+            [defender.total_strength() for _, _, defender in cases],
+            [len(attacker.warriors) for _, attacker, _ in cases],
+            [len(defender.warriors) for _, _, defender in cases]
+        )
+        for i, (board, attacker, defender) in enumerate(cases):
+            winner, _, expected_winner_losses, expected_loser_losses = board.battle(attacker, defender)
+            self.assertEqual(bool(decisive[i]), winner is not None)
+            if winner is None:
+                continue
+            self.assertEqual(bool(attacker_wins[i]), winner is attacker)
+            self.assertEqual(int(winner_losses[i]), expected_winner_losses)
+            self.assertEqual(int(loser_losses[i]), expected_loser_losses)
+
+    def test_batched_simulation_is_deterministic(self):
+        """Tryb zbiorczy daje powtarzalny przebieg z tym samym schematem logu walk."""
+        logs = []
+        for _ in range(2):
+            sim = Simulation(15, 12, 0, seed=9, recorder=MemoryRecorder(), display='off',
+                             settings=RunSettings(battle_mode='batched'))
+            with contextlib.redirect_stdout(io.StringIO()):
+                sim.run(save=False)
+            logs.append(sim.battle_log)
+        self.assertEqual(logs[0], logs[1], "Logi walk powinny być identyczne.")
+        self.assertTrue(logs[0], "Przebieg powinien zawierać walki.")
+        self.assertEqual(
+            set(logs[0][0]),
+            {'turn', 'attacker', 'defender', 'winner', 'attacker_losses', 'defender_losses'}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
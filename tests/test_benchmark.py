@@ -0,0 +1,48 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmark import benchmark_cases, compare, format_result, parse_args, run_case, tribe_counts
+from config import MIN_BOARD_SIZE, MIN_TRIBES
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_cases_cover_engines_and_tribe_counts(self):
+        """Każdy silnik dostaje każdy rozmiar planszy z każdą liczbą plemion."""
+        cases = benchmark_cases((MIN_BOARD_SIZE,), engines=('objects', 'vector'))
+        counts = tribe_counts(MIN_BOARD_SIZE)
+        self.assertEqual(counts[0], MIN_TRIBES)
+        self.assertEqual(cases, [(engine, MIN_BOARD_SIZE, tribes) for engine in ('objects', 'vector')
+                                 for tribes in counts])
+
+    def test_run_case_smoke(self):
+        """Pomiar małej planszy zwraca komplet wyników, które formatują się w jeden wiersz."""
+        result = run_case('objects', MIN_BOARD_SIZE, MIN_TRIBES, max_turns=20, memory=False, repeat=1)
+        self.assertEqual(result['case'], f"objects-{MIN_BOARD_SIZE}x{MIN_BOARD_SIZE}-{MIN_TRIBES}")
+        self.assertTrue(1 <= result['turns'] <= 20)
+        self.assertGreater(result['turns_per_second'], 0)
+        self.assertIsNone(result['peak_memory_kb'])
+        self.assertTrue(result['phases'], "Profiler powinien zmierzyć fazy tury.")
+
+        line = format_result(result)
+        self.assertTrue(line.startswith(result['case']))
+        self.assertNotIn('\n', line)
+        self.assertEqual(compare([result], {'results': [result]}), [], "Wynik nie jest regresją względem siebie.")
+
+    def test_counts_must_be_positive(self):
+        """Zerowa lub ujemna liczba tur i powtórzeń jest odrzucana."""
+        for argv in (['--turns', '0'], ['--turns', '-5'], ['--repeat', '0'], ['--repeat', '-1']):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                parse_args(argv)
+        for kwargs in ({'max_turns': 0}, {'repeat': 0}):
+            with self.assertRaises(ValueError):
+                run_case('objects', MIN_BOARD_SIZE, MIN_TRIBES, memory=False, **kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+import io
+import os
+import random
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from board import Board
+from grid import ChunkedGrid
+from tribe import Tribe
+from renderer import BoardRenderer
+
+
+class TestContactIndex(unittest.TestCase):
+    def setUp(self):
+        self.board = Board(size=10)
+        self.tribe1 = Tribe(self.board, x=0, y=0)
+        self.tribe2 = Tribe(self.board, x=0, y=2)
+        self.board.place_tribe(self.tribe1)
+        self.board.place_tribe(self.tribe2)
+
+    def test_no_contact_between_distant_tribes(self):
+        """Plemiona oddzielone pustym polem nie powinny się stykać."""
+        self.assertFalse(
+            self.board.have_shared_border(self.tribe1, self.tribe2),
+            "Plemiona (0,0) i (0,2) nie mają wspólnej granicy."
+        )
+        self.assertEqual(self.board.contacting_pairs(), [], "Indeks styków powinien być pusty.")
+
+    def test_contact_after_expansion(self):
+        """Zajęcie pola sąsiadującego z innym plemieniem powinno utworzyć styk."""
+        self.tribe1.add_territory(0, 1)
+        key = Board.contact_key(self.tribe1.id, self.tribe2.id)
+        self.assertTrue(self.board.have_shared_border(self.tribe2, self.tribe1))
+        self.assertEqual(
+            self.board.contacting_pairs(),
+            [key],
+            f"Oczekiwano pary {key} w indeksie styków."
+        )
+
+    def test_contact_removed_with_tribe(self):
+        """Usunięcie plemienia z planszy powinno usunąć jego styki i zwolnić pola."""
+        self.tribe1.add_territory(0, 1)
+        self.tribe1.add_territory(1, 1)
+        self.board.remove_tribe(self.tribe1)
+
+        self.assertEqual(self.board.contacts, {}, "Po usunięciu plemienia indeks styków powinien być pusty.")
+        self.assertIsNone(self.board.grid[0][1], "Pole (0,1) powinno zostać zwolnione.")
+        self.assertIsNone(self.board.get_tribe(self.tribe1.id))
+
+
+
+class TestFreeCells(unittest.TestCase):
+    def test_free_cells_follow_claims_and_releases(self):
+        """Pula wolnych pól zawiera dokładnie puste pola planszy."""
+        board = Board(size=10, rng=random.Random(1))
+        tribe = Tribe(board, x=4, y=4)
+        board.place_tribe(tribe)
+        tribe.add_territory(4, 5)
+        self.assertEqual(len(board.free_cells), 98, "Dwa zajęte pola - 98 wolnych.")
+        self.assertNotIn((4, 5), board.free_cells)
+
+        board.remove_tribe(tribe)
+        self.assertEqual(len(board.free_cells), 100, "Po usunięciu plemienia wszystkie pola są wolne.")
+
+    def test_random_empty_position_is_empty(self):
+        """get_random_empty_position zwraca wolne pole, a na pełnej planszy None."""
+        board = Board(size=10, rng=random.Random(2))
+        placed = []
+        for _ in range(100):
+            x, y = board.get_random_empty_position()
+            self.assertIsNone(board.grid[x][y], f"Pole {(x, y)} powinno być puste.")
+            placed.append(Tribe(board, x, y))
+        self.assertIsNone(board.get_random_empty_position(), "Na zapełnionej planszy brak wolnych pól.")
+
+
+class TestFrontier(unittest.TestCase):
+    def expected_frontier(self, board, tribe):
+        """Granica liczona od zera: puste pola sąsiadujące z terytorium plemienia."""
+        return {
+            (nx, ny)
+            for x, y in tribe.territory if board.grid[x][y] == tribe.id
+            for nx, ny in board.neighbors(x, y)
+            if board.grid[nx][ny] is None
+        }
+
+    def test_frontier_matches_full_scan(self):
+        """Przyrostowo utrzymywana granica musi być równa granicy liczonej skanem terytorium."""
+        board = Board(size=10, rng=random.Random(3))
+        tribes = [Tribe(board, x=x, y=y) for x, y in [(0, 0), (5, 5), (9, 9), (2, 7)]]
+        for tribe in tribes:
+            board.place_tribe(tribe)
+
+        for _ in range(60):
+            tribe = board.rng.choice(board.tribes)
+            if tribe.frontier:
+                tribe.add_territory(*tribe.frontier.choice(board.rng))
+        board.remove_tribe(tribes[1])
+
+        for tribe in board.tribes:
+            self.assertEqual(
+                set(tribe.frontier),
+                self.expected_frontier(board, tribe),
+                f"Granica plemienia {tribe.id} różni się od wyliczonej skanem."
+            )
+
+
+class TestLargeBoard(unittest.TestCase):
+    def test_tiles_follow_occupied_area(self):
+        """Duża plansza tworzy kafle tylko pod zajętymi polami i zwalnia je po opróżnieniu."""
+        board = Board(size=5000, rng=random.Random(4))
+        self.assertIsInstance(board.grid, ChunkedGrid)
+        tribe = Tribe(board, x=4999, y=0)
+        board.place_tribe(tribe)
+        tribe.add_territory(4998, 0)
+        tribe.add_territory(4999, 1)
+        self.assertEqual(board.grid[4998][0], tribe.id)
+        self.assertIsNone(board.grid[0][4999])
+        self.assertEqual(len(board.grid.tiles), 1, "Trzy sąsiednie pola mieszczą się w jednym kaflu.")
+        self.assertEqual(len(board.free_cells), 5000 ** 2 - 3)
+        self.assertEqual(set(tribe.frontier), {(4997, 0), (4998, 1), (4999, 2)})
+
+        board.remove_tribe(tribe)
+        self.assertEqual(board.grid.tiles, {}, "Pusta plansza nie powinna trzymać kafli.")
+        self.assertEqual(len(board.free_cells), 5000 ** 2)
+
+    def test_contacts_and_random_positions(self):
+        """Indeks styków i losowanie wolnych pól działają tak samo jak na gęstej planszy."""
+        board = Board(size=1000, rng=random.Random(5))
+        tribe1 = Tribe(board, x=63, y=10)
+        tribe2 = Tribe(board, x=65, y=10)
+        board.place_tribe(tribe1)
+        board.place_tribe(tribe2)
+        tribe1.add_territory(64, 10)  # styk na granicy kafli
+        self.assertTrue(board.have_shared_border(tribe1, tribe2))
+
+        for _ in range(100):
+            x, y = board.get_random_empty_position()
+            self.assertIsNone(board.grid[x][y], f"Pole {(x, y)} powinno być puste.")
+
+
+class TestBoardRenderer(unittest.TestCase):
+    def test_diff_mode_redraws_only_changed_cells(self):
+        """Po pierwszej pełnej klatce tryb 'diff' wypisuje tylko zmienione pola."""
+        board = Board(size=10, rng=random.Random(4))
+        stream = io.StringIO()
+        renderer = BoardRenderer(mode='diff', stream=stream)
+        board.add_observer(renderer)
+        tribe = Tribe(board, x=3, y=3)
+
+        renderer.render(1, board.grid, board.max_tribe_id)
+        self.assertIn("--- Plansza ---", stream.getvalue(), "Pierwsza klatka powinna być pełna.")
+
+        stream.seek(0)
+        stream.truncate()
+        tribe.add_territory(3, 4)
+        renderer.render(2, board.grid, board.max_tribe_id)
+        frame = stream.getvalue()
+        self.assertNotIn("--- Plansza ---", frame, "Kolejna klatka nie powinna rysować całej planszy.")
+        self.assertEqual(frame.count("H"), 2, "Jedno zmienione pole i przejście kursora pod planszę.")
+
+    def test_render_every_n_turns(self):
+        """Z every=3 plansza jest wyświetlana tylko w co trzeciej turze."""
+        stream = io.StringIO()
+        renderer = BoardRenderer(mode='full', every=3, stream=stream)
+        board = Board(size=10)
+        for turn in range(1, 7):
+            renderer.render(turn, board.grid, board.max_tribe_id)
+        self.assertEqual(stream.getvalue().count("--- Plansza ---"), 2)
+
+
+class TestBoardObservers(unittest.TestCase):
+    def test_observer_without_cell_changed(self):
+        """Obserwator bez cell_changed dostaje tylko zdarzenia, które obsługuje."""
+        class RemovalLog:
+            def __init__(self):
+                self.removed = []
+
+            def tribe_removed(self, tribe_id):
+                self.removed.append(tribe_id)
+
+        board = Board(size=10, rng=random.Random(4))
+        log = RemovalLog()
+        board.add_observer(log)
+        tribe = Tribe(board, x=3, y=3)
+        board.place_tribe(tribe)
+        tribe.add_territory(3, 4)
+        board.remove_tribe(tribe)
+        self.assertEqual(log.removed, [tribe.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from simulation import Simulation
+from params import RunSettings
+from recorder import MemoryRecorder
+from events import EventLog, Replay
+from checkpoint import encode_checkpoint, load_checkpoint, save_checkpoint
+
+
+def board_state(sim):
+    """Stan planszy do porównań: siatka, plemiona z liczebnością i granicą, styki."""
+    board = sim.board
+    return {
+        'grid': [list(row) for row in board.grid],
+        'tribes': [
+            (tribe.id, sorted(tribe.territory), set(tribe.frontier), len(tribe.workers), list(tribe.warriors.counts))
+            for tribe in board.tribes
+        ],
+        'contacts': board.contacts
+    }
+
+
+class TestEventLog(unittest.TestCase):
+    def test_replay_matches_every_turn(self):
+        """Odtworzony stan każdej tury jest taki sam jak w trakcie przebiegu."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'run.events')
+            sim = Simulation(12, 8, 0, seed=4, recorder=MemoryRecorder(), display='off',
+                             event_log=EventLog(path, keyframe_every=7))
+            sim.initialize()
+            states = {0: board_state(sim)}
+            with contextlib.redirect_stdout(io.StringIO()):
+                while sim.alive_tribes_count() > 1 and sim.turn < 60:
+                    sim.step()
+                    states[sim.turn] = board_state(sim)
+            sim.save_to_csv()
+            self.assertTrue(sim.battle_log, "Przebieg powinien zawierać walki.")
+
+            replay = Replay(path)
+            self.assertEqual(replay.keyframe_turns, list(range(0, sim.turn + 1, 7)))
+            for turn, expected in states.items():
+                self.assertEqual(board_state(replay.simulation_at(turn)), expected, f"Stan tury {turn} się różni.")
+
+            final = replay.simulation_at(sim.turn)
+            self.assertEqual(final.battle_log, sim.battle_log, "Log walk powinien zostać odtworzony.")
+
+    def test_resume_appends_to_the_log(self):
+        """Wznowienie z checkpointu przycina log do tury checkpointu i dopisuje dalej, zamiast go nadpisać."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'run.events')
+            checkpoint_path = os.path.join(tmp, 'run.ckpt')
+            sim = Simulation(12, 8, 0, seed=4, recorder=MemoryRecorder(), display='off',
+                             event_log=EventLog(path, keyframe_every=7))
+            sim.initialize()
+            states = {0: board_state(sim)}
+            with contextlib.redirect_stdout(io.StringIO()):
+                while sim.alive_tribes_count() > 1 and sim.turn < 40:
+                    sim.step()
+                    states[sim.turn] = board_state(sim)
+                    if sim.turn == 17:
+                        save_checkpoint(sim, checkpoint_path)
+            sim.save_to_csv()
+
+            resumed = load_checkpoint(checkpoint_path, recorder=MemoryRecorder(), display='off',
+                                      event_log=EventLog(path, keyframe_every=7))
+            with contextlib.redirect_stdout(io.StringIO()):
+                while resumed.turn < sim.turn:
+                    resumed.step()
+            resumed.save_to_csv()
+
+            replay = Replay(path)
+            self.assertEqual(replay.keyframe_turns, [0, 7, 14, 17] + list(range(21, sim.turn + 1, 7)))
+            for turn, expected in states.items():
+                self.assertEqual(board_state(replay.simulation_at(turn)), expected, f"Stan tury {turn} się różni.")
+
+    def test_log_is_smaller_than_snapshots(self):
+        """Log z klatkami co 100 tur zajmuje mniej niż pełny stan zapisywany w każdej turze."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'run.events')
+            sim = Simulation(20, 15, 0, seed=2, recorder=MemoryRecorder(), display='off',
+                             settings=RunSettings(max_turns=100), event_log=EventLog(path))
+            with contextlib.redirect_stdout(io.StringIO()):
+                sim.run()
+            snapshot_size = len(encode_checkpoint(*sim.snapshot()))
+            self.assertLess(os.path.getsize(path), snapshot_size * sim.turn / 5)
+            self.assertEqual(board_state(Replay(path).simulation_at(sim.turn)), board_state(sim))
+
+    def test_invalid_file(self):
+        with tempfile.NamedTemporaryFile(suffix='.events') as f:
+            f.write(b'not an event log')
+            f.flush()
+            with self.assertRaises(ValueError):
+                Replay(f.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
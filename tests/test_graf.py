@@ -0,0 +1,79 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from simulation import Simulation
+from recorder import CsvRecorder
+
+try:
+    import matplotlib
+    from graf import TribeCharts
+except ImportError:  # wykresy wymagają pandas i Matplotlib
+    matplotlib = None
+
+
+@unittest.skipUnless(matplotlib is not None, "Wykresy wymagają bibliotek pandas i Matplotlib")
+class TestTribeCharts(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        sim = Simulation(12, 8, 0, seed=2, recorder=CsvRecorder(directory=cls.tmp.name), display='off')
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.run()
+        cls.filename = os.path.join(cls.tmp.name, 'tribes_data.csv')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_matrix_matches_rows(self):
+        """Macierz tury x plemiona zawiera te same wartości co wiersze pliku, w kompaktowych typach."""
+        charts = TribeCharts(self.filename, columns=['food', 'warriors'])
+        self.assertEqual(set(charts.df.columns), {'turn', 'tribe_id', 'food', 'warriors'})
+        self.assertEqual(str(charts.df['food'].dtype), 'float64')
+        self.assertEqual(str(charts.df['warriors'].dtype), 'int32')
+        for row in charts.df.sample(20, random_state=0).itertuples():
+            self.assertEqual(charts.matrix['warriors'].at[row.turn, row.tribe_id], row.warriors)
+        self.assertEqual(charts.tribes_to_compare, sorted(charts.df['tribe_id'].unique()))
+
+    def test_top_view_sums_remaining_tribes(self):
+        """Widok top-N pokazuje N plemion o najwyższym maksimum i sumę pozostałych."""
+        charts = TribeCharts(self.filename, columns=['food'], top=3)
+        view = charts.series('food')
+        self.assertEqual(len(view.columns), 4)
+        self.assertEqual(view.columns[-1], 'Pozostałe (suma)')
+        total = charts.matrix['food'].sum(axis=1)
+        self.assertTrue(((view.sum(axis=1) - total).abs() < 1e-3).all(), "Top-N i reszta sumują się do całości.")
+
+    def test_headless_save(self):
+        """Z output_dir wykresy zapisywane są do plików bez otwierania okien."""
+        with tempfile.TemporaryDirectory() as out:
+            charts = TribeCharts(self.filename, columns=['food', 'workers'], aggregate=True)
+            saved = charts.draw_charts(output_dir=out, fmt='svg')
+            self.assertEqual(saved, [os.path.join(out, 'food.svg'), os.path.join(out, 'workers.svg')])
+            self.assertTrue(all(os.path.getsize(path) > 0 for path in saved))
+
+    def test_large_resources_keep_precision(self):
+        """Zasoby powyżej 2**24 są wczytywane dokładnie (float32 zaokrągliłby je do parzystych)."""
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'tribes_data.csv')
+            with open(filename, 'w') as f:
+                f.write("turn,tribe_id,workers,warriors,territory,food,building_materials,alive\n")
+                f.write(f"1,1,5,5,5,{2 ** 24 + 1},{2 ** 30 + 3},1\n")
+            charts = TribeCharts(filename, columns=['food', 'building_materials'])
+            self.assertEqual(charts.matrix['food'].at[1, 1], 2 ** 24 + 1)
+            self.assertEqual(charts.matrix['building_materials'].at[1, 1], 2 ** 30 + 3)
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            TribeCharts(self.filename, columns=['gold'])
+
+
+if __name__ == "__main__":
+    unittest.main()
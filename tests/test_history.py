@@ -0,0 +1,133 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from simulation import Simulation
+from recorder import MemoryRecorder
+from checkpoint import load_checkpoint, save_checkpoint
+
+try:
+    import numpy as np
+    from history import GridHistory, GridHistoryWriter
+    from vector_engine import VectorSimulation
+except ImportError:  # historia siatki wymaga NumPy
+    np = None
+
+
+def grid_of(sim):
+    """Siatka symulacji jako tablica NumPy (-1 = puste pole)."""
+    if sim.board is None:
+        return np.array(sim.grid)
+    grid = np.full((sim.board_size, sim.board_size), -1)
+    for tribe in sim.board.tribes:
+        for x, y in tribe.territory:
+            grid[x, y] = tribe.id
+    return grid
+
+
+@unittest.skipUnless(np is not None, "Historia siatki wymaga NumPy")
+class TestGridHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run.grid')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record(self, engine=Simulation, keyframe_every=None, turns=120):
+        """Rozegraj przebieg z historią i zwróć siatki każdej tury."""
+        sim = engine(15, 10, 0, seed=3, recorder=MemoryRecorder(), display='off',
+                     history=GridHistoryWriter(self.path, keyframe_every=keyframe_every))
+        sim.initialize()
+        states = {0: grid_of(sim)}
+        with contextlib.redirect_stdout(io.StringIO()):
+            while sim.check_termination() is None and sim.turn < turns:
+                sim.step()
+                states[sim.turn] = grid_of(sim)
+        sim.save_to_csv()
+        return states
+
+    def test_frames_are_views_of_every_turn(self):
+        """Każda tura jest zapisana, a klatka to widok na plik mapowany w pamięci."""
+        states = self.record()
+        history = GridHistory(self.path)
+        self.assertEqual(list(history.turns), sorted(states))
+        self.assertEqual(history.dtype, np.int16)
+        for turn, expected in states.items():
+            np.testing.assert_array_equal(history[turn], expected)
+        self.assertIsInstance(history[10], np.memmap)
+        self.assertFalse(history[10].flags.owndata, "Klatka nie powinna być kopią.")
+        with self.assertRaises(ValueError):
+            history[len(states)]
+
+    def test_keyframes_with_deltas(self):
+        """Z klatkami co K tur każda tura jest odtwarzana z klatki i zmian, a plik jest mniejszy."""
+        states = self.record(keyframe_every=16)
+        history = GridHistory(self.path)
+        for turn, expected in states.items():
+            np.testing.assert_array_equal(history.frame(turn), expected)
+        for turn, grid in history.iter_frames(5, 40):
+            np.testing.assert_array_equal(grid, states[turn])
+        full_size = 15 * 15 * 2 * len(states)
+        self.assertLess(os.path.getsize(self.path) + os.path.getsize(self.path + '.deltas'), full_size / 2)
+
+    def test_analysis_matches_frames(self):
+        """Mapa zajętości i liczba zmian właściciela zgadzają się z siatkami wszystkich tur."""
+        for keyframe_every in (None, 9):
+            states = self.record(engine=VectorSimulation, keyframe_every=keyframe_every)
+            grids = np.stack([states[turn] for turn in sorted(states)])
+            history = GridHistory(self.path)
+            np.testing.assert_array_equal(history.heatmap(), (grids >= 0).sum(axis=0))
+            np.testing.assert_array_equal(history.heatmap(tribe_id=2), (grids == 2).sum(axis=0))
+            np.testing.assert_array_equal(history.ownership_changes(), (grids[1:] != grids[:-1]).sum(axis=0))
+
+    def test_resume_appends_to_history(self):
+        """Wznowienie z checkpointu przycina historię do tury checkpointu i dopisuje dalej."""
+        checkpoint_path = os.path.join(self.tmp.name, 'run.ckpt')
+        for keyframe_every in (None, 5):
+            sim = Simulation(15, 10, 0, seed=3, recorder=MemoryRecorder(), display='off',
+                             history=GridHistoryWriter(self.path, keyframe_every=keyframe_every))
+            sim.initialize()
+            states = {0: grid_of(sim)}
+            with contextlib.redirect_stdout(io.StringIO()):
+                while sim.turn < 40:
+                    sim.step()
+                    states[sim.turn] = grid_of(sim)
+                    if sim.turn == 17:
+                        save_checkpoint(sim, checkpoint_path)
+            sim.save_to_csv()
+
+            resumed = load_checkpoint(checkpoint_path, recorder=MemoryRecorder(), display='off',
+                                      history=GridHistoryWriter(self.path, keyframe_every=keyframe_every))
+            with contextlib.redirect_stdout(io.StringIO()):
+                while resumed.turn < 30:
+                    resumed.step()
+            resumed.save_to_csv()
+
+            history = GridHistory(self.path)
+            self.assertEqual(list(history.turns), list(range(31)))
+            for turn in history.turns:
+                np.testing.assert_array_equal(history.frame(turn), states[turn])
+
+    def test_large_sparse_board_is_refused(self):
+        """Rzadka plansza Board powyżej DENSE_BOARD_LIMIT nie jest zamieniana na pełną siatkę."""
+        sim = Simulation(300, 10, 0, seed=3, recorder=MemoryRecorder(), display='off',
+                         history=GridHistoryWriter(self.path, keyframe_every=10))
+        with self.assertRaises(ValueError):
+            sim.initialize()
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a grid history')
+        with self.assertRaises(ValueError):
+            GridHistory(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import contextlib
+import gc
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from config import *
+from recorder import MemoryRecorder
+from batch import run_single
+
+try:
+    import numpy as np
+    from multiprocessing import shared_memory
+    import parallel_engine
+    from parallel_engine import ParallelVectorSimulation
+except ImportError:  # silnik równoległy wymaga NumPy
+    np = None
+
+
+@unittest.skipUnless(np is not None, "ParallelVectorSimulation wymaga biblioteki NumPy")
+class TestParallelVectorSimulation(unittest.TestCase):
+    def run_simulation(self, workers):
+        sim = ParallelVectorSimulation(20, 30, 0, seed=8, workers=workers, recorder=MemoryRecorder(), display='off')
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.run(save=False)
+        return sim
+
+    def test_result_does_not_depend_on_workers(self):
+        """Ten sam przebieg w procesie głównym i w dwóch procesach roboczych."""
+        single = self.run_simulation(workers=1)
+        pooled = self.run_simulation(workers=2)
+        self.assertEqual(single.summary(), pooled.summary(), "Podsumowania powinny być równe.")
+        self.assertEqual(single.recorder.tribe_rows, pooled.recorder.tribe_rows, "Dane tur powinny być identyczne.")
+        self.assertIsNone(pooled.shared, "Pamięć współdzielona powinna zostać zwolniona po zakończeniu.")
+
+    def test_batch_run_does_not_nest_process_pools(self):
+        """Przebieg z puli batch/sweep liczy silnik równoległy w swoim procesie, bez własnej puli."""
+        with mock.patch.object(parallel_engine, 'ProcessPoolExecutor') as executor:
+            result = run_single(8, 20, 30, engine='parallel')
+        executor.assert_not_called()
+        self.assertEqual(result['turns'], self.run_simulation(workers=1).turn)
+
+    def test_dropped_simulation_releases_shared_memory(self):
+        """Symulacja porzucona bez save_to_csv usuwa bloki pamięci współdzielonej i zatrzymuje procesy."""
+        for workers in (1, 2):
+            sim = ParallelVectorSimulation(20, 30, 0, seed=8, workers=workers, display='off')
+            sim.initialize()
+            names = [name for name, _, _ in sim.shared.layout.values()]
+            del sim
+            gc.collect()
+            for name in names:
+                with self.assertRaises(FileNotFoundError, msg=f"Blok {name} nie został usunięty."):
+                    shared_memory.SharedMemory(name=name)
+
+    def test_conflicting_claims_are_resolved_deterministically(self):
+        """Pole zgłoszone przez dwa plemiona dostaje zgłoszenie z niższym priorytetem."""
+        sim = ParallelVectorSimulation(10, 3, 0, seed=1, workers=1, display='off')
+        sim.initialize()
+        try:
+            empty = np.flatnonzero(sim.grid.ravel() == -1)[:2]
+            materials = sim.tribes.building_materials.copy()
+            sim.resolve_expansions(
+                owners=np.array([2, 0, 1]),
+                cells=np.array([empty[0], empty[0], empty[1]]),
+                priorities=np.array([0.1, 0.7, 0.5])
+            )
+            self.assertEqual(sim.grid.ravel()[empty[0]], 2, "Pole powinno przypaść zgłoszeniu z priorytetem 0.1.")
+            self.assertEqual(sim.grid.ravel()[empty[1]], 1)
+            self.assertEqual(sim.tribes.territory.tolist(), [1, 2, 2])
+            self.assertEqual(materials[0] - sim.tribes.building_materials[0], 0, "Przegrany nie płaci za pole.")
+        finally:
+            sim.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
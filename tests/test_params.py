@@ -0,0 +1,169 @@
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import config
+import params as params_module
+from params import DEFAULT_PARAMS, RunSettings, SimulationParams, parse_override
+from policy import DEFAULT_POLICY
+from simulation import Simulation
+from recorder import MemoryRecorder
+from checkpoint import load_checkpoint, save_checkpoint
+
+try:
+    import numpy as np
+except ImportError:  # silnik wektorowy wymaga NumPy
+    np = None
+
+
+def run(sim, turns=None):
+    """Rozegraj symulację (lub podaną liczbę tur) bez wypisywania i zwróć jej podsumowanie."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        if turns is None:
+            sim.run(save=False)
+        else:
+            sim.initialize()
+            for _ in range(turns):
+                sim.step()
+    return sim.summary()
+
+
+class TestSimulationParams(unittest.TestCase):
+    def test_defaults_match_config(self):
+        """Parametry domyślne mają wartości z config.py, a tablica siły jest policzona z góry."""
+        for name, value in DEFAULT_PARAMS.to_dict().items():
+            self.assertEqual(value, getattr(config, name.upper()), name)
+        self.assertEqual(len(DEFAULT_PARAMS.strength_table), config.MAX_WARRIOR_LEVEL)
+        self.assertEqual(DEFAULT_PARAMS.warrior_strength(2),
+                         config.BASE_WARRIOR_STRENGTH + config.UPGRADE_STRENGTH_BONUS)
+
+    def test_params_are_immutable(self):
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            DEFAULT_PARAMS.food_per_territory = 1
+        params = DEFAULT_PARAMS.with_overrides(max_warrior_level=3)
+        self.assertEqual(DEFAULT_PARAMS.max_warrior_level, config.MAX_WARRIOR_LEVEL)
+        self.assertEqual(len(params.strength_table), 3)
+
+    def test_invalid_values(self):
+        for overrides in ({'expansion_cost': 0}, {'food_per_territory': -1}, {'food_per_territory': 2.5},
+                          {'stole_resources_min': 0.9, 'stole_resources_max': 0.1}, {'upgrade_cost': '5'},
+                          {'gold': 1}):
+            with self.assertRaises(ValueError, msg=str(overrides)):
+                DEFAULT_PARAMS.with_overrides(**overrides)
+
+    def test_load_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'hard.json')
+            with open(path, 'w') as f:
+                json.dump({'food_per_territory': 30, 'stole_resources_max': 0.5}, f)
+
+            params = SimulationParams.load(path)
+            self.assertEqual(params, DEFAULT_PARAMS.with_overrides(food_per_territory=30, stole_resources_max=0.5))
+            self.assertEqual(params.expansion_cost, config.EXPANSION_COST)
+            with self.assertRaises(ValueError):
+                SimulationParams.load(os.path.join(tmp, 'hard.yaml'))
+
+    @unittest.skipUnless(params_module.tomllib is not None, "Pliki TOML wymagają Pythona 3.11+ lub tomli")
+    def test_load_toml(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            toml_path = os.path.join(tmp, 'hard.toml')
+            with open(toml_path, 'w') as f:
+                f.write("food_per_territory = 30\nstole_resources_max = 0.5\n")
+            json_path = os.path.join(tmp, 'hard.json')
+            with open(json_path, 'w') as f:
+                json.dump({'food_per_territory': 30, 'stole_resources_max': 0.5}, f)
+
+            params = SimulationParams.load(toml_path)
+            self.assertEqual(params, SimulationParams.load(json_path))
+            self.assertEqual(params.food_per_territory, 30)
+
+    def test_load_toml_without_parser(self):
+        """Bez tomllib/tomli wczytanie TOML zgłasza ValueError (obsługiwany przez linię poleceń)."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'hard.toml')
+            with open(path, 'w') as f:
+                f.write("food_per_territory = 30\n")
+            with mock.patch.object(params_module, 'tomllib', None):
+                with self.assertRaises(ValueError):
+                    SimulationParams.load(path)
+
+    def test_parse_override(self):
+        self.assertEqual(parse_override('expansion_cost=250'), ('expansion_cost', 250))
+        self.assertEqual(parse_override('stole_resources_max = 0.5'), ('stole_resources_max', 0.5))
+        for text in ('expansion_cost', 'gold=1', 'expansion_cost=cheap'):
+            with self.assertRaises(ValueError):
+                parse_override(text)
+
+
+class TestRunSettings(unittest.TestCase):
+    def test_settings_round_trip_and_validation(self):
+        """Ustawienia przebiegu (bez strategii) przechodzą przez słownik; złe wartości zgłaszają ValueError."""
+        settings = RunSettings(max_turns=50, stalemate_turns=10, battle_mode='batched', policy=DEFAULT_POLICY)
+        self.assertEqual(settings.to_dict(), {'max_turns': 50, 'stalemate_turns': 10, 'battle_mode': 'batched'})
+        self.assertEqual(RunSettings.from_dict(settings.to_dict(), policy=DEFAULT_POLICY), settings)
+        self.assertEqual(settings.with_overrides(max_turns=60).max_turns, 60)
+        for options in ({'max_turns': 0}, {'stalemate_turns': 0}, {'battle_mode': 'random'}):
+            with self.assertRaises(ValueError, msg=str(options)):
+                RunSettings(**options)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            settings.max_turns = 1
+
+
+class TestParamsInSimulation(unittest.TestCase):
+    def test_params_are_shared_and_change_the_run(self):
+        """Plansza i plemiona używają parametrów symulacji; inne parametry dają inny, powtarzalny przebieg."""
+        params = DEFAULT_PARAMS.with_overrides(food_per_territory=30, expansion_cost=150, max_warrior_level=3)
+        sim = Simulation(12, 8, 0, seed=3, recorder=MemoryRecorder(), display='off', params=params)
+        sim.initialize()
+        self.assertIs(sim.board.params, params)
+        self.assertTrue(all(tribe.params is params for tribe in sim.board.tribes))
+        self.assertEqual(sim.policy.thresholds[1].base, 150, "Progi strategii liczone są z parametrów.")
+        self.assertIs(Simulation(12, 8, 0).policy, DEFAULT_POLICY)
+
+        changed = run(Simulation(12, 8, 0, seed=3, recorder=MemoryRecorder(), display='off', params=params))
+        again = run(Simulation(12, 8, 0, seed=3, recorder=MemoryRecorder(), display='off', params=params))
+        default = run(Simulation(12, 8, 0, seed=3, recorder=MemoryRecorder(), display='off'))
+        self.assertEqual(changed, again)
+        self.assertNotEqual(changed, default)
+
+    def test_checkpoint_keeps_params(self):
+        """Symulacja wznowiona z checkpointu używa zapisanych w nim parametrów."""
+        params = DEFAULT_PARAMS.with_overrides(worker_recruitment_cost=5, upgrade_cost=40)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'run.ckpt')
+            original = Simulation(12, 8, 0, seed=5, recorder=MemoryRecorder(), display='off', params=params)
+            run(original, turns=20)
+            save_checkpoint(original, path)
+            resumed = load_checkpoint(path, recorder=MemoryRecorder(), display='off')
+            self.assertEqual(resumed.params, params)
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(30):
+                    original.step()
+                    resumed.step()
+            self.assertEqual(resumed.battle_log, original.battle_log)
+            self.assertEqual([str(tribe) for tribe in resumed.board.tribes],
+                             [str(tribe) for tribe in original.board.tribes])
+
+    @unittest.skipUnless(np is not None, "Silnik wektorowy wymaga NumPy")
+    def test_vector_engine_uses_params(self):
+        """Silnik wektorowy ma tyle poziomów wojowników i taką tablicę siły, jak w parametrach."""
+        from vector_engine import VectorSimulation
+
+        params = DEFAULT_PARAMS.with_overrides(max_warrior_level=3, upgrade_strength_bonus=5)
+        sim = VectorSimulation(12, 8, 0, seed=3, recorder=MemoryRecorder(), display='off', params=params)
+        run(sim)
+        self.assertEqual(sim.tribes.warriors.shape[1], 3)
+        self.assertEqual(sim.strength_table.tolist(), list(params.strength_table))
+
+
+if __name__ == "__main__":
+    unittest.main()
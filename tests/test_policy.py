@@ -0,0 +1,130 @@
+import contextlib
+import io
+import os
+import random
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from board import Board
+from tribe import Tribe
+from simulation import Simulation
+from params import RunSettings
+from recorder import MemoryRecorder
+from policy import ACTIONS, DEFAULT_POLICY, Threshold, ThresholdPolicy
+from config import *
+
+try:
+    import numpy as np
+except ImportError:  # wsadowy wybór akcji wymaga NumPy
+    np = None
+
+
+def legacy_choice(tribe, rng):
+    """Wybór akcji liczony na bieżąco, jak przed wprowadzeniem tablicy strategii."""
+    weights = dict.fromkeys(ACTIONS, 0)
+    territory = len(tribe.territory)
+    if tribe.food > FOOD_PER_TERRITORY * territory * 2:
+        weights['train_workers'] += 0.5
+        weights['train_warriors'] += 0.5
+    elif tribe.food < FOOD_PER_TERRITORY * territory * 0.5:
+        weights['train_workers'] -= 0.5
+        weights['train_warriors'] -= 0.5
+        weights['nothing'] += 0.5
+    if tribe.building_materials > EXPANSION_COST * 2:
+        weights['expand'] += 0.5
+        weights['upgrade_warriors'] += 0.5
+    elif tribe.building_materials < EXPANSION_COST * 0.5:
+        weights['expand'] -= 0.5
+        weights['upgrade_warriors'] -= 0.5
+        weights['nothing'] += 0.5
+    if tribe.total_population() < territory * POPULATION_PER_TERRITORY * 0.8:
+        weights['train_workers'] += 0.5
+        weights['train_warriors'] += 0.5
+    else:
+        weights['expand'] += 0.5
+    if len(tribe.warriors) < territory * (POPULATION_PER_TERRITORY / 4):
+        weights['train_warriors'] += 0.5
+        weights['upgrade_warriors'] += 0.3
+    return rng.choices(ACTIONS, weights=[max(0, w + 1) for w in weights.values()], k=1)[0]
+
+
+def random_tribes(count, seed):
+    """Plemiona o losowych zasobach, populacji i terytorium."""
+    rng = random.Random(seed)
+    board = Board(size=10, rng=rng)
+    tribes = []
+    for _ in range(count):
+        tribe = Tribe(board, *board.get_random_empty_position())
+        for _ in range(rng.randrange(3)):
+            if tribe.frontier:
+                tribe.add_territory(*tribe.frontier.choice(rng))
+        tribe.food = rng.choice([0, rng.uniform(0, 200), FOOD_PER_TERRITORY * len(tribe.territory) * 2])
+        tribe.building_materials = rng.choice([0, rng.uniform(0, 300), EXPANSION_COST * 2])
+        tribe.workers.add(rng.randrange(10))
+        tribe.warriors.add(rng.randrange(10), level=rng.randint(1, MAX_WARRIOR_LEVEL))
+        tribes.append(tribe)
+        board.remove_tribe(tribe)  # zwolnij pola dla kolejnych plemion
+    return tribes
+
+
+class TestThresholdPolicy(unittest.TestCase):
+    def test_default_policy_matches_legacy_choice(self):
+        """Tablica strategii wybiera te same akcje i zużywa te same losowania co wcześniejsze wagi."""
+        tribes = random_tribes(40, seed=1)
+        rng, legacy_rng = random.Random(2), random.Random(2)
+        for _ in range(5):
+            for tribe in tribes:
+                self.assertEqual(DEFAULT_POLICY.choose(tribe, rng), legacy_choice(tribe, legacy_rng))
+        self.assertEqual(rng.random(), legacy_rng.random(), "Strumienie losowe powinny pozostać zgodne.")
+
+    @unittest.skipUnless(np is not None, "Wsadowy wybór akcji wymaga biblioteki NumPy")
+    def test_batch_matches_single_choice(self):
+        """choose_batch daje dla każdego plemienia tę samą akcję co choose przy tej samej liczbie losowej."""
+        tribes = random_tribes(40, seed=3)
+        draws = np.random.default_rng(4).random(len(tribes))
+        features = {
+            'food': np.array([tribe.food for tribe in tribes]),
+            'building_materials': np.array([tribe.building_materials for tribe in tribes]),
+            'population': np.array([tribe.total_population() for tribe in tribes]),
+            'warriors': np.array([len(tribe.warriors) for tribe in tribes])
+        }
+        territory = np.array([len(tribe.territory) for tribe in tribes])
+        actions = DEFAULT_POLICY.choose_batch(features, territory, draws)
+
+        class FixedDraw:
+            def __init__(self, value):
+                self.value = value
+
+            def random(self):
+                return self.value
+
+        for tribe, draw, action in zip(tribes, draws, actions):
+            self.assertEqual(ACTIONS[action], DEFAULT_POLICY.choose(tribe, FixedDraw(float(draw))))
+
+    def test_custom_policy_drives_simulation(self):
+        """Strategia przekazana symulacji zastępuje domyślną - bez ekspansji plemiona nie rosną."""
+        # Jedzenie nigdy nie jest ujemne, więc zawsze działa przedział 'between' - waga ma tylko 'nothing'
+        passive = ThresholdPolicy([
+            Threshold('food', base=0, low=0, between={action: -1 for action in ACTIONS if action != 'nothing'})
+        ])
+        sim = Simulation(12, 6, 0, seed=5, recorder=MemoryRecorder(), display='off',
+                         settings=RunSettings(max_turns=30, policy=passive))
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.run(save=False)
+        self.assertTrue(all(len(tribe.territory) == 1 for tribe in sim.board.tribes))
+
+    def test_invalid_thresholds(self):
+        """Nieznana cecha, akcja lub brak wartości odniesienia zgłaszają ValueError."""
+        with self.assertRaises(ValueError):
+            Threshold('gold', base=1)
+        with self.assertRaises(ValueError):
+            Threshold('food', base=1, below={'attack': 1})
+        with self.assertRaises(ValueError):
+            Threshold('food')
+
+
+if __name__ == "__main__":
+    unittest.main()
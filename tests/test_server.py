@@ -0,0 +1,117 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from simulation import Simulation
+from params import RunSettings
+from recorder import MemoryRecorder
+from server import SimulationServer, Viewer
+
+
+async def read_stream(port):
+    """Odczytaj cały strumień /stream i zwróć listę klatek."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b'GET /stream HTTP/1.1\r\nHost: localhost\r\n\r\n')
+    headers = await reader.readuntil(b'\r\n\r\n')
+    assert b'Transfer-Encoding: chunked' in headers
+    frames = []
+    while True:
+        size = int((await reader.readline()).strip(), 16)
+        if size == 0:
+            break
+        frames.append(json.loads(await reader.readexactly(size)))
+        await reader.readexactly(2)
+    writer.close()
+    return frames
+
+
+def apply_frames(frames):
+    """Odtwórz planszę widza z klatek (pełny stan zastępuje wszystko, zmiany nadpisują pola)."""
+    cells = {}
+    for frame in frames:
+        if frame['type'] == 'snapshot':
+            cells = {(x, y): tribe_id for x, y, tribe_id in frame['cells']}
+        elif frame['type'] == 'turn':
+            for x, y, tribe_id in frame['cells']:
+                if tribe_id is None:
+                    cells.pop((x, y), None)
+                else:
+                    cells[x, y] = tribe_id
+    return cells
+
+
+def board_cells(sim):
+    return {(x, y): tribe.id for tribe in sim.board.tribes for x, y in tribe.territory}
+
+
+class TestSimulationServer(unittest.IsolatedAsyncioTestCase):
+    async def test_viewers_rebuild_the_board(self):
+        """Dwóch widzów odtwarza z pełnego stanu i zmian tę samą planszę co symulacja."""
+        sim = Simulation(12, 8, 0, seed=4, recorder=MemoryRecorder(), display='off', mode='fast')
+        server = SimulationServer(sim, port=0, turn_delay=0.002, queue_size=10000)
+        with contextlib.redirect_stdout(io.StringIO()):
+            task = asyncio.create_task(server.run())
+            await server.started.wait()
+            streams = await asyncio.gather(read_stream(server.port), read_stream(server.port))
+            await task
+
+        for frames in streams:
+            self.assertEqual(frames[0]['type'], 'snapshot')
+            self.assertEqual(frames[-1], {'type': 'end', 'summary': sim.summary()})
+            turns = [frame['turn'] for frame in frames if frame['type'] == 'turn']
+            self.assertEqual(turns, list(range(frames[0]['turn'] + 1, sim.turn + 1)))
+            self.assertEqual(apply_frames(frames), board_cells(sim))
+            self.assertEqual(frames[-2]['tribes'][0]['territory'], len(sim.board.tribes[0].territory))
+
+    async def test_slow_viewer_drops_frames_and_resyncs(self):
+        """Pełna kolejka wolnego widza nie zatrzymuje symulacji; po zwolnieniu dostaje pełny stan."""
+        sim = Simulation(12, 8, 0, seed=4, recorder=MemoryRecorder(), display='off', mode='fast')
+        server = SimulationServer(sim, queue_size=2)
+        server.prepare()
+        viewer = Viewer(queue_size=2)
+        server.viewers.add(viewer)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(10):
+                server.step()
+        self.assertEqual(sim.turn, 10)
+        self.assertEqual(viewer.dropped, 8)
+        self.assertTrue(viewer.resync)
+
+        frames = [json.loads(viewer.queue.get_nowait().split(b'\r\n')[1]) for _ in range(2)]
+        self.assertEqual([frame['turn'] for frame in frames], [1, 2])
+        with contextlib.redirect_stdout(io.StringIO()):
+            server.step()
+        resync = json.loads(viewer.queue.get_nowait().split(b'\r\n')[1])
+        self.assertEqual((resync['type'], resync['turn']), ('snapshot', 11))
+        self.assertEqual(apply_frames([resync]), board_cells(sim))
+
+
+class TestServerOutsideLoop(unittest.TestCase):
+    def test_server_built_before_event_loop(self):
+        """Serwer zbudowany przed asyncio.run (jak w main()) działa w pętli, która go uruchamia."""
+        sim = Simulation(12, 8, 0, seed=4, recorder=MemoryRecorder(), display='off', mode='fast',
+                         settings=RunSettings(max_turns=20))
+        server = SimulationServer(sim, port=0, queue_size=10000)
+
+        async def watch():
+            task = asyncio.create_task(server.run())
+            await server.started.wait()
+            frames = await read_stream(server.port)
+            await task
+            return frames
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            frames = asyncio.run(watch())
+        self.assertEqual(frames[-1], {'type': 'end', 'summary': sim.summary()})
+        self.assertEqual(apply_frames(frames), board_cells(sim))
+
+
+if __name__ == "__main__":
+    unittest.main()
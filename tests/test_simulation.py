@@ -0,0 +1,249 @@
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from simulation import Simulation
+from params import RunSettings
+from recorder import CsvRecorder, MemoryRecorder, NullRecorder, TRIBE_COLUMNS
+from profiling import PhaseProfiler
+import checkpoint
+from checkpoint import load_checkpoint, save_checkpoint
+
+try:
+    import numpy as np
+except ImportError:  # zbiorcze walki wymagają NumPy
+    np = None
+
+
+def run_quietly(sim):
+    """Uruchom symulację bez zapisu plików i bez wypisywania na konsolę."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.run(save=False)
+    return sim
+
+
+class TestSimulationDeterminism(unittest.TestCase):
+    def test_same_seed_replays_identically(self):
+        """Dwie symulacje z tym samym ziarnem muszą mieć identyczny przebieg."""
+        first = run_quietly(Simulation(12, 6, 0, seed=42, recorder=MemoryRecorder()))
+        second = run_quietly(Simulation(12, 6, 0, seed=42, recorder=MemoryRecorder()))
+
+        self.assertEqual(first.summary(), second.summary(), "Podsumowania przebiegów powinny być równe.")
+        self.assertEqual(first.battle_log, second.battle_log, "Logi walk powinny być identyczne.")
+        self.assertEqual(
+            first.recorder.tribe_rows,
+            second.recorder.tribe_rows,
+            "Dane tur powinny być identyczne."
+        )
+
+    def test_tribe_ids_are_per_simulation(self):
+        """Każda symulacja numeruje plemiona od zera, niezależnie od innych symulacji w procesie."""
+        for _ in range(2):
+            sim = Simulation(board_size=10, tribes_count=3, time_per_turn=0, seed=1)
+            sim.initialize()
+            self.assertEqual(
+                [tribe.id for tribe in sim.board.tribes],
+                [0, 1, 2],
+                "Id plemion powinny być przydzielane od 0 w każdej symulacji."
+            )
+
+
+    def test_fast_mode_prints_only_reports_and_summary(self):
+        """Tryb szybki pomija wydruki tur poza raportowanymi i kończy się podsumowaniem."""
+        sim = Simulation(12, 6, 5, seed=42, recorder=NullRecorder(), mode='fast', report_every=10,
+                         log_level=logging.INFO)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            sim.run()
+        output = out.getvalue()
+
+        self.assertGreater(sim.turn, 10, "Przebieg powinien trwać dłużej niż 10 tur.")
+        self.assertIn("===== Tura 10 =====", output, "Tura raportowana powinna zostać wypisana.")
+        self.assertNotIn("===== Tura 1 =====", output, "Pozostałe tury nie powinny być wypisywane.")
+        self.assertNotIn("Rozpoczyna się walka", output, "Komunikaty walk należą do szczegółów (DEBUG).")
+        self.assertIn("--- Podsumowanie ---", output, "Na końcu powinno pojawić się podsumowanie.")
+        self.assertEqual(
+            sim.summary(),
+            run_quietly(Simulation(12, 6, 0, seed=42, recorder=NullRecorder())).summary(),
+            "Tryb szybki nie może zmieniać przebiegu symulacji."
+        )
+
+
+class TestTermination(unittest.TestCase):
+    def quiet_simulation(self, **options):
+        return Simulation(12, 6, 0, seed=42, recorder=NullRecorder(), mode='fast', log_level=logging.WARNING,
+                          **options)
+
+    def test_winner_is_recorded(self):
+        """Przebieg do ostatniego plemienia kończy się powodem 'winner'."""
+        sim = self.quiet_simulation()
+        sim.run()
+        self.assertEqual(sim.summary()['termination_reason'], 'winner')
+
+    def test_max_turns_stops_the_run(self):
+        """Limit tur przerywa przebieg po podanej liczbie tur."""
+        sim = self.quiet_simulation(settings=RunSettings(max_turns=7))
+        sim.run()
+        self.assertEqual(sim.turn, 7, "Przebieg powinien zakończyć się po 7 turach.")
+        self.assertEqual(sim.termination_reason, 'max_turns')
+
+    def test_stalemate_is_detected(self):
+        """Plemiona, które niczego nie zmieniają i nie walczą, kończą przebieg jako pat."""
+        sim = Simulation(10, 2, 0, seed=0, recorder=NullRecorder(), mode='fast', log_level=logging.WARNING,
+                         settings=RunSettings(stalemate_turns=5))
+        sim.initialize()
+        for tribe in sim.board.tribes:
+            tribe.perform_action = lambda: None
+        sim.run()
+        # Pierwsza tura zapamiętuje stan, kolejne 5 tur bez zmian kończy przebieg
+        self.assertEqual(sim.turn, 6)
+        self.assertEqual(sim.termination_reason, 'stalemate')
+
+
+class TestPhaseProfiler(unittest.TestCase):
+    def test_phases_are_counted_per_tribe_and_turn(self):
+        """Profiler zlicza fazy plemion raz na plemię, a fazy planszy raz na turę."""
+        sim = Simulation(10, 3, 0, seed=7, recorder=NullRecorder(), profiler=PhaseProfiler())
+        sim.initialize()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.step()
+            sim.step()
+        report = sim.profiler.report()
+
+        self.assertEqual(sim.profiler.turns, 2, "Profiler powinien zarejestrować 2 tury.")
+        self.assertEqual(report['check_collisions']['calls'], 2)
+        self.assertGreaterEqual(
+            report['collect_resources']['calls'],
+            2 * len(sim.board.tribes),
+            "collect_resources jest wywoływane dla każdego plemienia w każdej turze."
+        )
+
+
+class TestCsvRecorder(unittest.TestCase):
+    def test_rows_are_streamed_in_batches(self):
+        """Pełna paczka wierszy trafia na dysk od razu, reszta przy zamknięciu."""
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = CsvRecorder(directory=tmp, batch_size=2)
+            recorder.record_tribes([(1, 0, 2, 1, 1, 25, 8, 1), (1, 1, 2, 1, 1, 25, 8, 1)])
+            with open(recorder.tribes_path) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines[0], ",".join(TRIBE_COLUMNS), "Pierwszy wiersz to nagłówek.")
+            self.assertEqual(len(lines), 3, "Pełna paczka (2 wiersze) powinna być już zapisana.")
+
+            recorder.record_tribes([(2, 0, 2, 1, 1, 50, 16, 1)])
+            recorder.close()
+            with open(recorder.tribes_path) as f:
+                self.assertEqual(len(f.read().splitlines()), 4, "Po zamknięciu zapisane są wszystkie wiersze.")
+
+
+class TestCheckpoint(unittest.TestCase):
+    def play(self, sim, turns):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(turns):
+                if sim.alive_tribes_count() <= 1:
+                    break
+                sim.step()
+
+    def test_resume_is_bit_identical(self):
+        """Przebieg wznowiony z checkpointu jest identyczny z przebiegiem nieprzerwanym."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sim.ckpt')
+            original = Simulation(15, 8, 0, seed=3, recorder=MemoryRecorder(), display='off')
+            original.initialize()
+            self.play(original, 10)
+            save_checkpoint(original, path)
+            self.play(original, 40)
+
+            resumed = load_checkpoint(path, recorder=MemoryRecorder(), display='off')
+            self.assertEqual(resumed.turn, 10, "Symulacja powinna być wznowiona od zapisanej tury.")
+            self.play(resumed, 40)
+
+            self.assertEqual(resumed.summary(), original.summary(), "Podsumowania powinny być równe.")
+            self.assertEqual(resumed.battle_log, original.battle_log, "Logi walk powinny być identyczne.")
+            self.assertEqual(
+                resumed.recorder.tribe_rows,
+                [row for row in original.recorder.tribe_rows if row[0] > 10],
+                "Dane tur po wznowieniu powinny być identyczne."
+            )
+
+    def test_resume_large_board(self):
+        """Checkpoint dużej (rzadkiej) planszy odtwarza siatkę i styki z terytoriów plemion."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sim.ckpt')
+            original = Simulation(300, 40, 0, seed=6, recorder=MemoryRecorder(), display='off')
+            original.initialize()
+            self.play(original, 15)
+            save_checkpoint(original, path)
+            self.play(original, 15)
+
+            resumed = load_checkpoint(path, recorder=MemoryRecorder(), display='off')
+            self.assertEqual(resumed.board.grid.occupied, sum(len(t.territory) for t in resumed.board.tribes))
+            self.play(resumed, 15)
+            self.assertEqual(resumed.summary(), original.summary(), "Podsumowania powinny być równe.")
+            self.assertEqual(resumed.battle_log, original.battle_log, "Logi walk powinny być identyczne.")
+
+    @unittest.skipUnless(np is not None, "Zbiorcze walki wymagają NumPy")
+    def test_resume_keeps_run_settings(self):
+        """Tryb walk, limity zakończenia i tryb uruchomienia przechodzą przez checkpoint."""
+        settings = RunSettings(max_turns=30, stalemate_turns=50, battle_mode='batched')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sim.ckpt')
+            original = Simulation(20, 30, 0, seed=3, recorder=MemoryRecorder(), mode='fast',
+                                  log_level=logging.WARNING, settings=settings)
+            original.initialize()
+            self.play(original, 10)
+            save_checkpoint(original, path)
+            original.run(save=False)
+
+            resumed = load_checkpoint(path, recorder=MemoryRecorder(), log_level=logging.WARNING)
+            self.assertEqual(resumed.settings, settings)
+            self.assertEqual(resumed.mode, 'fast')
+            resumed.run(save=False)
+            self.assertEqual(resumed.termination_reason, 'max_turns')
+            self.assertEqual(resumed.summary(), original.summary(), "Podsumowania powinny być równe.")
+            self.assertEqual(resumed.battle_log, original.battle_log, "Logi walk powinny być identyczne.")
+
+    def test_resume_command_overrides_limits(self):
+        """tribes-resume bierze limity z checkpointu, a --max-turns je zastępuje."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sim.ckpt')
+            original = Simulation(20, 30, 0, seed=3, recorder=MemoryRecorder(), display='off',
+                                  settings=RunSettings(max_turns=40, stalemate_turns=50))
+            original.initialize()
+            self.play(original, 10)
+            save_checkpoint(original, path)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                checkpoint.main([path, '--display', 'off', '--output-dir', tmp, '--max-turns', '15'])
+            with open(os.path.join(tmp, 'tribes_data.csv')) as f:
+                turns = [int(line.split(',')[0]) for line in f.read().splitlines()[1:]]
+            self.assertEqual((min(turns), max(turns)), (11, 15))
+            resumed = load_checkpoint(path, settings=RunSettings(max_turns=15))
+            self.assertEqual(resumed.settings.stalemate_turns, None, "Podane settings zastępują zapisane.")
+            self.assertEqual(load_checkpoint(path).settings.stalemate_turns, 50)
+
+    def test_csv_is_truncated_to_checkpoint(self):
+        """Wznowiony rekorder CSV obcina wiersze zapisane po checkpoincie i dopisuje dalej."""
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = CsvRecorder(directory=tmp)
+            recorder.record_tribes([(1, 0, 2, 1, 1, 25, 8, 1)])
+            offsets = recorder.offsets()
+            recorder.record_tribes([(2, 0, 2, 1, 1, 50, 16, 1)])
+            recorder.close()
+
+            resumed = CsvRecorder(directory=tmp, offsets=offsets)
+            resumed.record_tribes([(2, 0, 3, 1, 1, 40, 16, 1)])
+            resumed.close()
+            with open(resumed.tribes_path) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines, [",".join(TRIBE_COLUMNS), "1,0,2,1,1,25,8,1", "2,0,3,1,1,40,16,1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
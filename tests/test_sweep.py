@@ -0,0 +1,107 @@
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import sweep
+from batch import run_single
+from params import DEFAULT_PARAMS, RunSettings
+from sweep import ResultCache, grid_points, random_points, run_sweep, run_key, parse_axis, parse_range
+
+SETTINGS = RunSettings(max_turns=300)
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp.name, 'cache.sqlite')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sweep(self, points, seeds):
+        with ResultCache(self.cache_path) as cache:
+            return run_sweep(points, seeds, 12, 8, cache, workers=1, settings=SETTINGS)
+
+    def test_grid_points(self):
+        points = grid_points(DEFAULT_PARAMS, {'expansion_cost': [100, 200], 'food_per_territory': [10, 20, 30]})
+        self.assertEqual(len(points), 6)
+        self.assertEqual((points[1].expansion_cost, points[1].food_per_territory), (100, 20))
+
+    def test_random_points_stay_in_range(self):
+        points = random_points(DEFAULT_PARAMS, {'upgrade_cost': (20, 80), 'stole_resources_max': (0.3, 0.6)}, 10,
+                               random.Random(1))
+        self.assertTrue(all(20 <= p.upgrade_cost <= 80 and isinstance(p.upgrade_cost, int) for p in points))
+        self.assertTrue(all(0.3 <= p.stole_resources_max <= 0.6 for p in points))
+        self.assertEqual(points, random_points(DEFAULT_PARAMS, {'upgrade_cost': (20, 80),
+                                                                'stole_resources_max': (0.3, 0.6)},
+                                               10, random.Random(1)))
+
+    def test_second_sweep_only_runs_new_points(self):
+        """Powtórzony sweep bierze wyniki z bazy i liczy tylko nowe punkty i ziarna."""
+        points = grid_points(DEFAULT_PARAMS, {'expansion_cost': [100, 200]})
+        first = self.sweep(points, range(3))
+        self.assertFalse(any(result['cached'] for result in first))
+
+        with mock.patch.object(sweep, 'run_single', wraps=run_single) as runner:
+            second = self.sweep(points + grid_points(DEFAULT_PARAMS, {'expansion_cost': [300]}), range(4))
+        self.assertEqual(runner.call_count, 2 * 1 + 1 * 4, "Tylko nowe ziarno starych punktów i nowy punkt.")
+        self.assertEqual([result['cached'] for result in second[:3]], [True] * 3)
+        for old, new in zip(first, second[0:3] + second[4:7]):
+            self.assertEqual({k: v for k, v in old.items() if k != 'cached'},
+                             {k: v for k, v in new.items() if k != 'cached'})
+        self.assertEqual(second[0]['params']['expansion_cost'], 100)
+        self.assertEqual(second[0]['turns'], run_single(0, 12, 8, settings=SETTINGS, params=points[0])['turns'])
+
+    def test_key_depends_on_code_version_and_setup(self):
+        setup = {'board_size': 12}
+        key = run_key(DEFAULT_PARAMS, 1, setup, version='a')
+        self.assertEqual(key, run_key(DEFAULT_PARAMS.with_overrides(), 1, dict(setup), version='a'))
+        self.assertNotEqual(key, run_key(DEFAULT_PARAMS, 1, setup, version='b'))
+        self.assertNotEqual(key, run_key(DEFAULT_PARAMS, 2, setup, version='a'))
+        self.assertNotEqual(key, run_key(DEFAULT_PARAMS, 1, {'board_size': 13}, version='a'))
+        self.assertNotEqual(key, run_key(DEFAULT_PARAMS.with_overrides(upgrade_cost=1), 1, setup, version='a'))
+
+    def test_code_version_follows_module_sources(self):
+        """Zmiana kodu dowolnego modułu z SIMULATION_MODULES (także batch) zmienia wersję kodu."""
+        self.assertIn('batch', sweep.SIMULATION_MODULES)
+        edited = os.path.join(self.tmp.name, 'batch.py')
+        with open(importlib.util.find_spec('batch').origin, 'rb') as f:
+            source = f.read()
+        find_spec = importlib.util.find_spec
+
+        def version_with(batch_source):
+            with open(edited, 'wb') as f:
+                f.write(batch_source)
+            spec = mock.Mock(origin=edited)
+            sweep.code_version.cache_clear()
+            with mock.patch.object(sweep.importlib.util, 'find_spec',
+                                   lambda name: spec if name == 'batch' else find_spec(name)):
+                return sweep.code_version()
+
+        try:
+            original = version_with(source)
+            self.assertEqual(original, version_with(source))
+            self.assertNotEqual(original, version_with(source + b'\n# zmiana\n'))
+        finally:
+            sweep.code_version.cache_clear()
+
+    def test_parse_axis_and_range(self):
+        self.assertEqual(parse_axis('expansion_cost=100,200'), ('expansion_cost', [100, 200]))
+        self.assertEqual(parse_range('stole_resources_max=0.2:0.6'), ('stole_resources_max', (0.2, 0.6)))
+        for text in ('expansion_cost', 'gold=1,2'):
+            with self.assertRaises(ValueError):
+                parse_axis(text)
+        for text in ('expansion_cost=100', 'expansion_cost=200:100'):
+            with self.assertRaises(ValueError):
+                parse_range(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
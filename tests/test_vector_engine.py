@@ -0,0 +1,105 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import batch
+from batch import create_simulation
+from config import *
+
+try:
+    import numpy as np
+    from vector_engine import VectorSimulation, EMPTY
+except ImportError:  # silnik wektorowy wymaga NumPy
+    np = None
+
+
+@unittest.skipUnless(np is not None, "VectorSimulation wymaga biblioteki NumPy")
+class TestVectorSimulation(unittest.TestCase):
+    def setUp(self):
+        self.sim = VectorSimulation(board_size=10, tribes_count=5, time_per_turn=0, seed=1)
+        self.sim.initialize()
+
+    def test_initial_state(self):
+        """Każde plemię zaczyna z jednym polem, 2 robotnikami i 1 wojownikiem."""
+        tribes = self.sim.tribes
+        self.assertEqual(int((self.sim.grid != EMPTY).sum()), 5, "Na planszy powinno być 5 zajętych pól.")
+        self.assertTrue((tribes.workers == 2).all(), "Każde plemię powinno mieć 2 robotników.")
+        self.assertTrue((tribes.warriors_total() == 1).all(), "Każde plemię powinno mieć 1 wojownika.")
+
+    def test_consume_food_removes_warriors_first(self):
+        """Przy braku jedzenia najpierw giną wojownicy, potem robotnicy (jak w Tribe.reduce_population)."""
+        tribes = self.sim.tribes
+        tribes.food[:] = 0
+        tribes.workers[0] = 4
+        tribes.warriors[0] = [2, 1, 0, 0, 0]
+        # Konsumpcja: 4 * 3 + 3 * 5 = 27, deficyt 27 -> 3 wojowników (15) i 4 robotników (12)
+        self.sim.consume_food(tribes.alive)
+
+        self.assertEqual(int(tribes.warriors_total()[0]), 0, "Wszyscy wojownicy powinni zginąć.")
+        self.assertEqual(int(tribes.workers[0]), 0, "Wszyscy robotnicy powinni zginąć.")
+        self.assertEqual(float(tribes.food[0]), 0.0, "Jedzenie powinno spaść do zera.")
+
+    def test_run_writes_standard_csv(self):
+        """Silnik wektorowy zapisuje tribes_data.csv z tymi samymi kolumnami co Simulation."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                sim = VectorSimulation(board_size=10, tribes_count=3, time_per_turn=0, seed=2)
+                sim.print_stats = lambda: None
+                sim.display_board = lambda: None
+                with contextlib.redirect_stdout(io.StringIO()):
+                    sim.run()
+                with open('tribes_data.csv') as f:
+                    header = f.readline().strip()
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(header, "turn,tribe_id,workers,warriors,territory,food,building_materials,alive")
+
+    def test_resume_from_checkpoint(self):
+        """Wznowienie z checkpointu daje ten sam przebieg co symulacja nieprzerwana."""
+        from checkpoint import load_checkpoint, save_checkpoint
+        from recorder import MemoryRecorder
+
+        def play(sim, turns):
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(turns):
+                    if sim.alive_tribes_count() > 1:
+                        sim.step()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sim.ckpt')
+            original = VectorSimulation(15, 8, 0, seed=4, recorder=MemoryRecorder(), display='off')
+            original.initialize()
+            play(original, 10)
+            save_checkpoint(original, path)
+            play(original, 40)
+
+            resumed = load_checkpoint(path, recorder=MemoryRecorder(), display='off')
+            play(resumed, 40)
+        self.assertEqual(resumed.summary(), original.summary())
+        self.assertTrue((resumed.grid == original.grid).all(), "Siatki powinny być identyczne.")
+        self.assertEqual(resumed.recorder.tribe_rows, [row for row in original.recorder.tribe_rows if row[0] > 10])
+
+    def test_dense_grid_limit(self):
+        """Silniki wektorowe odrzucają plansze większe niż VECTOR_BOARD_LIMIT, obiektowy je przyjmuje."""
+        VectorSimulation(VECTOR_BOARD_LIMIT, 10, 0).validate_parameters()
+        for engine in ('vector', 'parallel'):
+            sim = create_simulation(VECTOR_BOARD_LIMIT + 1, 10, 1, engine)
+            with self.assertRaisesRegex(ValueError, 'objects engine'):
+                sim.initialize()
+            self.assertIsNone(sim.grid, "Pełna siatka nie powinna zostać zaalokowana.")
+        create_simulation(VECTOR_BOARD_LIMIT + 1, 10, 1, 'objects').validate_parameters()
+
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            batch.parse_args(['--board-size', str(VECTOR_BOARD_LIMIT + 1), '--tribes', '10', '--engine', 'vector'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,52 +1,284 @@
-from abc import ABC, abstractmethod
-from config import *
-
-class Unit(ABC):
-    """Abstrakcyjna klasa bazowa dla jednostek (wojowników oraz robotników)"""
-
-    def __init__(self, tribe):
-        self._tribe = tribe  # hermetyzacja - plemię przypisane do jednostki
-
-    # Property ukrywa, że jest to wywołanie metody dla klas wywołujących tribe
-    @property
-    def tribe(self):
-        return self._tribe
-
-    @abstractmethod
-    def food_consumption(self):
-        pass
-
-
-class Worker(Unit):
-    """Klasa robotnika dziedzicząca z klasy Unit"""
-
-    def food_consumption(self):
-        return WORKER_FOOD_CONSUMPTION
-
-
-class Warrior(Unit):
-    """Klasa wojownika z mechanizmem ulepszania dziedzicząca z klasy Unit"""
-
-    def __init__(self, tribe, level=1):
-        super().__init__(tribe)
-        self._level = level  # hermetyzacja - poziom wojownika
-        self._strength = BASE_WARRIOR_STRENGTH + (level - 1) * UPGRADE_STRENGTH_BONUS
-
-    @property
-    def level(self):
-        return self._level
-
-    @property
-    def strength(self):
-        return self._strength
-
-    def food_consumption(self):
-        return WARRIOR_FOOD_CONSUMPTION
-
-    def upgrade(self):
-        """Ulepsz wojownika jeśli to możliwe"""
-        if self._level < MAX_WARRIOR_LEVEL:
-            self._level += 1
-            self._strength += UPGRADE_STRENGTH_BONUS
-            return True
-        return False
\ No newline at end of file
+import random
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from itertools import accumulate
+from params import DEFAULT_PARAMS
+
+# Tryb kontroli spójności (dla testów): po każdej zmianie grupy porównuj agregaty z przeliczeniem od zera
+CHECK_AGGREGATES = False
+
+
+class Unit(ABC):
+    """Abstrakcyjna klasa bazowa dla jednostek (wojowników oraz robotników)"""
+
+    def __init__(self, tribe):
+        self._tribe = tribe  # hermetyzacja - plemię przypisane do jednostki
+
+    # Property ukrywa, że jest to wywołanie metody dla klas wywołujących tribe
+    @property
+    def tribe(self):
+        return self._tribe
+
+    @property
+    def params(self):
+        """Parametry rozgrywki plemienia jednostki (domyślne dla jednostki bez plemienia)"""
+        return self._tribe.params if self._tribe is not None else DEFAULT_PARAMS
+
+    @abstractmethod
+    def food_consumption(self):
+        pass
+
+
+class Worker(Unit):
+    """Klasa robotnika dziedzicząca z klasy Unit"""
+
+    def food_consumption(self):
+        return self.params.worker_food_consumption
+
+
+class Warrior(Unit):
+    """Klasa wojownika z mechanizmem ulepszania dziedzicząca z klasy Unit"""
+
+    def __init__(self, tribe, level=1):
+        super().__init__(tribe)
+        self._level = level  # hermetyzacja - poziom wojownika
+        self._strength = self.params.warrior_strength(level)
+
+    @property
+    def level(self):
+        return self._level
+
+    @property
+    def strength(self):
+        return self._strength
+
+    def food_consumption(self):
+        return self.params.warrior_food_consumption
+
+    def upgrade(self):
+        """Ulepsz wojownika jeśli to możliwe"""
+        params = self.params
+        if self._level < params.max_warrior_level:
+            self._level += 1
+            self._strength += params.upgrade_strength_bonus
+            return True
+        return False
+
+class WorkerGroup:
+    """Robotnicy plemienia przechowywani jako licznik.
+
+    Zachowuje interfejs listy obiektów ``Worker`` (len, in, iteracja, append,
+    pop, remove), ale nie tworzy obiektu dla każdego robotnika.
+    """
+
+    def __init__(self, tribe, count=0, params=DEFAULT_PARAMS):
+        self._tribe = tribe
+        self._count = count
+        self._food_consumption = params.worker_food_consumption
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __iter__(self):
+        for _ in range(self._count):
+            yield Worker(self._tribe)
+
+    def __contains__(self, unit):
+        """Jednostka należy do grupy, jeśli jest robotnikiem przypisanym do tego plemienia"""
+        return isinstance(unit, Worker) and unit.tribe is self._tribe and self._count > 0
+
+    def append(self, unit=None):
+        """Dodaj robotnika (obiekt jest tylko fasadą - liczy się licznik)"""
+        if unit is not None and unit.tribe is None:
+            unit._tribe = self._tribe
+        self._count += 1
+
+    def add(self, count):
+        """Dodaj wielu robotników naraz"""
+        self._count += count
+
+    def pop(self):
+        """Usuń jednego robotnika i zwróć go jako obiekt Worker"""
+        if not self._count:
+            raise IndexError("pop from empty WorkerGroup")
+        self._count -= 1
+        return Worker(None)
+
+    def pop_many(self, count):
+        """Usuń do `count` robotników, zwróć liczbę faktycznie usuniętych"""
+        removed = min(count, self._count)
+        self._count -= removed
+        return removed
+
+    def remove(self, unit):
+        """Usuń konkretnego robotnika i odłącz go od plemienia"""
+        if unit not in self:
+            raise ValueError("WorkerGroup.remove(x): x not in group")
+        self._count -= 1
+        unit._tribe = None
+
+    def clear(self):
+        self._count = 0
+
+    def food_consumption(self):
+        """Łączna konsumpcja jedzenia wszystkich robotników"""
+        return self._count * self._food_consumption
+
+
+class WarriorGroup:
+    """Wojownicy plemienia przechowywani jako histogram liczności poziomów.
+
+    ``counts[level - 1]`` to liczba wojowników na danym poziomie. Liczba
+    wojowników i ich łączna siła aktualizowane są przy każdej zmianie, więc
+    ``len``, konsumpcja i ``total_strength`` kosztują O(1). Histogramu nie
+    należy zmieniać w miejscu - tylko metodami grupy lub przypisaniem ``counts``.
+    Konstruktor przyjmuje te same argumenty co ``WorkerGroup``: plemię,
+    początkowy stan (tu histogram) i parametry.
+    """
+
+    def __init__(self, tribe, counts=None, params=DEFAULT_PARAMS):
+        self._tribe = tribe
+        self._params = params
+        self.counts = counts if counts is not None else [0] * params.max_warrior_level
+
+    @property
+    def counts(self):
+        return self._counts
+
+    @counts.setter
+    def counts(self, counts):
+        """Zastąp histogram (np. przy odtwarzaniu z checkpointu) i przelicz agregaty"""
+        self._counts = list(counts)
+        self._size, self._strength = self._recount()
+
+    def _recount(self):
+        """Liczba wojowników i łączna siła policzone od zera z histogramu"""
+        return (sum(self._counts),
+                sum(count * strength for count, strength in zip(self._counts, self._params.strength_table)))
+
+    def _changed(self):
+        if CHECK_AGGREGATES:
+            self.check_aggregates()
+
+    def check_aggregates(self):
+        """Porównaj utrzymywane agregaty z przeliczonymi od zera (tryb kontroli spójności)"""
+        expected = self._recount()
+        if (self._size, self._strength) != expected:
+            raise AssertionError(
+                f"WarriorGroup aggregates out of sync: size/strength {(self._size, self._strength)}, expected {expected}"
+            )
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        for level, count in enumerate(self._counts, start=1):
+            for _ in range(count):
+                yield Warrior(self._tribe, level)
+
+    def __contains__(self, unit):
+        """Jednostka należy do grupy, jeśli jest wojownikiem tego plemienia o obecnym w grupie poziomie"""
+        return (isinstance(unit, Warrior) and unit.tribe is self._tribe
+                and self._counts[unit.level - 1] > 0)
+
+    def append(self, unit=None):
+        """Dodaj wojownika (domyślnie na poziomie 1)"""
+        level = 1
+        if unit is not None:
+            level = unit.level
+            if unit.tribe is None:
+                unit._tribe = self._tribe
+        self.add(1, level)
+
+    def add(self, count, level=1):
+        """Dodaj wielu wojowników na danym poziomie"""
+        self._counts[level - 1] += count
+        self._size += count
+        self._strength += count * self._params.warrior_strength(level)
+        self._changed()
+
+    def pop(self):
+        """Usuń jednego wojownika (najniższego poziomu) i zwróć go jako obiekt Warrior"""
+        for index, count in enumerate(self._counts):
+            if count:
+                self._take(index, 1)
+                self._changed()
+                return Warrior(None, index + 1)
+        raise IndexError("pop from empty WarriorGroup")
+
+    def _take(self, index, count):
+        """Usuń `count` wojowników z poziomu index + 1 (bez sprawdzania)"""
+        self._counts[index] -= count
+        self._size -= count
+        self._strength -= count * self._params.strength_table[index]
+
+    def pop_many(self, count):
+        """Usuń do `count` wojowników, zaczynając od najniższych poziomów; zwróć liczbę usuniętych.
+
+        Histogram nie pamięta kolejności rekrutacji, więc zamiast ostatnio dodanego
+        wojownika (lista obiektów) giną najpierw najsłabsi - zwykle najmłodsi rekruci,
+        bo nowi wojownicy zaczynają od poziomu 1. Tak samo liczą straty silniki wektorowe.
+        """
+        removed = 0
+        for index, level_count in enumerate(self._counts):
+            if removed >= count:
+                break
+            taken = min(level_count, count - removed)
+            if taken:
+                self._take(index, taken)
+                removed += taken
+        self._changed()
+        return removed
+
+    def remove(self, unit):
+        """Usuń konkretnego wojownika i odłącz go od plemienia"""
+        if unit not in self:
+            raise ValueError("WarriorGroup.remove(x): x not in group")
+        self._take(unit.level - 1, 1)
+        self._changed()
+        unit._tribe = None
+
+    def clear(self):
+        self._counts = [0] * self._params.max_warrior_level
+        self._size = 0
+        self._strength = 0
+        self._changed()
+
+    def food_consumption(self):
+        """Łączna konsumpcja jedzenia wszystkich wojowników"""
+        return self._size * self._params.warrior_food_consumption
+
+    def total_strength(self):
+        """Łączna siła wszystkich wojowników"""
+        return self._strength
+
+    def upgradable_count(self):
+        """Liczba wojowników poniżej maksymalnego poziomu"""
+        return self._size - self._counts[-1]
+
+    def upgrade(self, count, rng=random):
+        """Ulepsz o jeden poziom `count` losowo wybranych (bez zwracania) wojowników, którzy mogą być ulepszeni"""
+        upgradable = self.upgradable_count()
+        count = min(count, upgradable)
+        if count <= 0:
+            return 0
+
+        # Granice przedziałów numerów wojowników na kolejnych poziomach
+        bounds = list(accumulate(self._counts[:-1]))
+        chosen = [0] * len(bounds)
+        for position in rng.sample(range(upgradable), count):
+            chosen[bisect_right(bounds, position)] += 1
+
+        for index, amount in enumerate(chosen):
+            self._counts[index] -= amount
+            self._counts[index + 1] += amount
+        # Każde ulepszenie podnosi siłę wojownika o stałą premię
+        self._strength += count * self._params.upgrade_strength_bonus
+        self._changed()
+        return count
@@ -0,0 +1,489 @@
+"""Alternatywny silnik symulacji oparty na tablicach NumPy.
+
+Plansza jest tablicą ``int32`` (``EMPTY`` = puste pole), a stan plemion
+przechowywany jest w równoległych tablicach (struct-of-arrays), dzięki czemu
+zbieranie surowców, konsumpcja, siła i zapis statystyk wykonują się jedną
+operacją dla wszystkich plemion naraz.
+
+Siatka jest zawsze pełna (``board_size ** 2`` pól), więc plansze większe niż
+``config.VECTOR_BOARD_LIMIT`` są odrzucane - rzadkie światy aż do
+``MAX_BOARD_SIZE`` obsługuje silnik obiektowy (``grid.ChunkedGrid``).
+"""
+import numpy as np
+
+from config import VECTOR_BOARD_LIMIT
+from params import DEFAULT_PARAMS
+from board import Board
+from simulation import Simulation
+from console import logger
+from battles import battle_rounds, resolve_battles
+from policy import ACTIONS
+
+EMPTY = -1  # wartość pustego pola w siatce
+
+# Indeksy akcji w policy.ACTIONS
+EXPAND, TRAIN_WORKERS, TRAIN_WARRIORS, UPGRADE_WARRIORS, NOTHING = range(len(ACTIONS))
+
+# Siła wojownika na każdym poziomie przy domyślnych parametrach (indeks 0 = poziom 1)
+STRENGTH_TABLE = np.array(DEFAULT_PARAMS.strength_table, dtype=np.int64)
+
+
+class TribeArrays:
+    """Stan wszystkich plemion w równoległych tablicach (indeks = id plemienia)"""
+
+    def __init__(self, count, strength_table=STRENGTH_TABLE):
+        self.strength_table = strength_table  # siła wojownika na każdym poziomie
+        self.workers = np.zeros(count, dtype=np.int64)
+        # Liczba wojowników na każdym poziomie (kolumna 0 = poziom 1)
+        self.warriors = np.zeros((count, len(strength_table)), dtype=np.int64)
+        self.food = np.zeros(count, dtype=np.float64)
+        self.building_materials = np.zeros(count, dtype=np.float64)
+        self.territory = np.zeros(count, dtype=np.int64)
+        self.alive = np.ones(count, dtype=bool)
+
+    def __len__(self):
+        return len(self.workers)
+
+    def warriors_total(self):
+        """Liczba wojowników każdego plemienia"""
+        return self.warriors.sum(axis=1)
+
+    def total_population(self):
+        """Populacja (robotnicy + wojownicy) każdego plemienia"""
+        return self.workers + self.warriors_total()
+
+    def total_strength(self):
+        """Całkowita siła wojowników każdego plemienia"""
+        return self.warriors @ self.strength_table
+
+    def remove_warriors(self, counts, rows=slice(None)):
+        """Usuń podaną liczbę wojowników z wybranych plemion, zaczynając od najniższych poziomów"""
+        warriors = self.warriors[rows]
+        before = np.cumsum(warriors, axis=-1) - warriors
+        removed = np.clip(np.asarray(counts)[..., None] - before, 0, warriors)
+        self.warriors[rows] -= removed
+
+
+class VectorSimulation(Simulation):
+    """Symulacja, w której plansza i plemiona są tablicami NumPy.
+
+    Zapisuje dane w tym samym formacie co ``Simulation`` (``tribes_data.csv``
+    i ``battles.csv``), więc ``TribeCharts`` działa bez zmian.
+    """
+
+    ENGINE = 'vector'
+
+    # Tablice zapisywane w checkpoincie: nazwa -> atrybut TribeArrays
+    STATE_ARRAYS = ('workers', 'warriors', 'food', 'building_materials', 'territory', 'alive')
+
+    def __init__(self, board_size, tribes_count, time_per_turn, seed=None, recorder=None, profiler=None,
+                 display='full', display_every=1, checkpoint_every=None, checkpoint_path='simulation.ckpt',
+                 mode='normal', report_every=None, log_level=None, settings=None, event_log=None, params=None,
+                 history=None):
+        if event_log is not None:
+            raise ValueError("Event log requires the objects engine (it records Board events)")
+        super().__init__(board_size, tribes_count, time_per_turn, seed, recorder, profiler, display, display_every,
+                         checkpoint_every, checkpoint_path, mode, report_every, log_level, settings,
+                         params=params, history=history)
+        self.rng = np.random.default_rng(seed)
+        self.strength_table = np.array(self.params.strength_table, dtype=np.int64)
+        self.grid = None
+        self.tribes = None
+        self._last_frame = None  # siatka z ostatniej wyświetlonej klatki (tryb 'diff')
+
+    def validate_parameters(self):
+        """Sprawdź parametry jak Simulation oraz limit pełnej siatki silnika wektorowego"""
+        super().validate_parameters()
+        if self.board_size > VECTOR_BOARD_LIMIT:
+            raise ValueError(f"The {self.ENGINE} engine allocates a dense grid - boards larger than "
+                             f"{VECTOR_BOARD_LIMIT} need the objects engine")
+
+    def initialize(self):
+        """Inicjalizuj siatkę i tablice plemion"""
+        self.validate_parameters()
+
+        self.grid = np.full((self.board_size, self.board_size), EMPTY, dtype=np.int32)
+        self.tribes = TribeArrays(self.tribes_count, self.strength_table)
+
+        # Losowe, różne pozycje startowe
+        positions = self.rng.choice(self.board_size ** 2, size=self.tribes_count, replace=False)
+        self.grid.flat[positions] = np.arange(self.tribes_count, dtype=np.int32)
+        self.tribes.territory[:] = 1
+
+        # Początkowa populacja: 2 robotników i 1 wojownik
+        self.tribes.workers[:] = 2
+        self.tribes.warriors[:, 0] = 1
+        if self.history is not None:
+            self.history.attach(self)
+
+    def is_initialized(self):
+        return self.grid is not None
+
+    def reseed(self, seed):
+        """Zmień ziarno generatora NumPy w trakcie przebiegu"""
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def snapshot(self):
+        """Zwróć stan do checkpointu: siatka i tablice plemion jako surowe bajty"""
+        arrays = {'grid': self.grid}
+        arrays.update((name, getattr(self.tribes, name)) for name in self.STATE_ARRAYS)
+        meta = {
+            'engine': self.ENGINE,
+            'board_size': self.board_size,
+            'tribes_count': self.tribes_count,
+            'time_per_turn': self.time_per_turn,
+            'seed': self.seed,
+            'turn': self.turn,
+            'quiet_turns': self.quiet_turns,
+            'rng_state': self.rng.bit_generator.state,
+            'battle_log': self.battle_log,
+            'params': self.params.to_dict(),
+            'settings': self.settings.to_dict(),
+            'mode': self.mode,
+            'report_every': self.report_every,
+            'recorder_offsets': self.recorder.offsets() if self.recorder is not None else None,
+            'arrays': {name: [array.dtype.str, list(array.shape)] for name, array in arrays.items()}
+        }
+        sections = {name: np.ascontiguousarray(array).tobytes() for name, array in arrays.items()}
+        return meta, sections
+
+    def restore(self, meta, sections):
+        """Odtwórz siatkę, tablice plemion, generator i numer tury z checkpointu"""
+        arrays = {
+            name: np.frombuffer(sections[name], dtype=dtype).reshape(shape).copy()
+            for name, (dtype, shape) in meta['arrays'].items()
+        }
+        self.rng.bit_generator.state = meta['rng_state']
+        self.turn = meta['turn']
+        self.battle_log = [dict(battle) for battle in meta['battle_log']]
+        self.grid = arrays['grid']
+        self.tribes = TribeArrays(self.tribes_count, self.strength_table)
+        for name in self.STATE_ARRAYS:
+            setattr(self.tribes, name, arrays[name])
+        self.quiet_turns = meta['quiet_turns']
+        self._last_signature = self.stalemate_signature()
+        if self.history is not None:
+            self.history.attach(self)
+
+    def alive_tribes_count(self):
+        """Zwróć liczbę żywych plemion"""
+        return int(self.tribes.alive.sum())
+
+    def stalemate_signature(self):
+        """Terytorium i populacja wszystkich plemion jako bajty (do porównania między turami)"""
+        t = self.tribes
+        return np.concatenate([t.territory, t.total_population()]).tobytes()
+
+    def alive_tribe_ids(self):
+        """Zwróć listę id żywych plemion"""
+        return np.flatnonzero(self.tribes.alive).tolist()
+
+    def play_tribe_phases(self):
+        """Wykonaj fazy surowców, akcji i konsumpcji dla wszystkich plemion naraz"""
+        alive = self.tribes.alive
+        profiler = self.profiler
+        with profiler.phase('collect_resources'):
+            self.collect_resources(alive)
+        with profiler.phase('perform_action'):
+            self.perform_actions(alive)
+        with profiler.phase('consume_food'):
+            self.consume_food(alive)
+        with profiler.phase('record'):
+            self.record_turn(alive)
+
+    def collect_resources(self, mask):
+        """Zbierz surowce dla plemion wskazanych maską"""
+        t = self.tribes
+        t.building_materials[mask] += t.workers[mask] * self.params.building_material_per_worker
+        t.food[mask] += t.territory[mask] * self.params.food_per_territory
+
+    def choose_actions(self, mask):
+        """Wylosuj akcję dla każdego plemienia naraz (wsadowy wariant strategii plemion)"""
+        t = self.tribes
+        features = {
+            'food': t.food,
+            'building_materials': t.building_materials,
+            'population': t.total_population(),
+            'warriors': t.warriors_total()
+        }
+        actions = self.policy.choose_batch(features, t.territory, self.rng.random(len(t)))
+        actions[~mask] = NOTHING
+        return actions
+
+    def perform_actions(self, mask):
+        """Wykonaj wylosowane akcje wszystkich plemion"""
+        actions = self.choose_actions(mask)
+        self.train(actions == TRAIN_WORKERS, self.params.worker_recruitment_cost, warriors=False)
+        self.train(actions == TRAIN_WARRIORS, self.params.warrior_recruitment_cost, warriors=True)
+        self.upgrade_warriors(actions == UPGRADE_WARRIORS)
+        self.expand(actions == EXPAND)
+
+    def train(self, mask, cost, warriors):
+        """Rekrutuj robotników lub wojowników za procent dostępnego jedzenia"""
+        params = self.params
+        t = self.tribes
+        mask = mask & (t.food >= cost)
+        spend_percent = self.rng.uniform(params.recruitment_min_percent, params.recruitment_max_percent, len(t))
+        recruits_from_food = np.floor(t.food * spend_percent) // cost
+        max_possible_recruits = t.territory * params.population_per_territory - t.total_population()
+        recruits = np.minimum(recruits_from_food, max_possible_recruits).astype(np.int64)
+        recruits[~mask | (recruits < 0)] = 0
+
+        t.food -= recruits * cost
+        if warriors:
+            t.warriors[:, 0] += recruits
+        else:
+            t.workers += recruits
+
+    def upgrade_warriors(self, mask):
+        """Ulepsz losowo wybranych wojowników za procent dostępnego budulca"""
+        params = self.params
+        t = self.tribes
+        mask = mask & (t.building_materials >= params.upgrade_cost)
+        spend_percent = self.rng.uniform(params.materials_min_percent, params.materials_max_percent, len(t))
+        possible_upgrades = np.floor(t.building_materials * spend_percent) // params.upgrade_cost
+        upgradable = t.warriors[:, :-1].sum(axis=1)
+        upgrades = np.minimum(possible_upgrades, upgradable).astype(np.int64)
+        upgrades[~mask] = 0
+
+        # Losowanie bez zwracania, ile wojowników z każdego poziomu zostanie ulepszonych
+        for tribe_id in np.flatnonzero(upgrades):
+            chosen = self.rng.multivariate_hypergeometric(t.warriors[tribe_id, :-1], upgrades[tribe_id])
+            t.warriors[tribe_id, :-1] -= chosen
+            t.warriors[tribe_id, 1:] += chosen
+        t.building_materials -= upgrades * params.upgrade_cost
+
+    def frontier_candidates(self):
+        """Zwróć pary (id plemienia, indeks pustego pola) dla pustych pól sąsiadujących z terytorium"""
+        padded = np.pad(self.grid, 1, constant_values=EMPTY)
+        empty = (self.grid == EMPTY).ravel()
+        owners = []
+        cells = []
+        cell_index = np.arange(self.grid.size)
+        size = self.board_size
+        for dx, dy in Board.NEIGHBOR_OFFSETS:
+            neighbor = padded[1 + dx:1 + dx + size, 1 + dy:1 + dy + size].ravel()
+            valid = empty & (neighbor != EMPTY)
+            owners.append(neighbor[valid])
+            cells.append(cell_index[valid])
+        pairs = np.unique(np.stack([np.concatenate(owners), np.concatenate(cells)], axis=1), axis=0)
+        return pairs[:, 0], pairs[:, 1]
+
+    def expand(self, mask):
+        """Rozszerz terytorium plemion po kolei (kolejność id), bo współdzielą siatkę"""
+        params = self.params
+        t = self.tribes
+        mask = mask & (t.building_materials >= params.expansion_cost)
+        if not mask.any():
+            return
+
+        owners, cells = self.frontier_candidates()
+        flat_grid = self.grid.ravel()
+        for tribe_id in np.flatnonzero(mask):
+            start, end = np.searchsorted(owners, [tribe_id, tribe_id + 1])
+            # Pola mogły zostać zajęte przez plemiona, które rozszerzały się wcześniej w tej turze
+            neighbors = cells[start:end]
+            neighbors = neighbors[flat_grid[neighbors] == EMPTY]
+            if len(neighbors) == 0:
+                continue
+
+            spend_percent = self.rng.uniform(params.recruitment_min_percent, params.recruitment_max_percent)
+            materials_to_spend = int(t.building_materials[tribe_id] * spend_percent)
+            possible_expansions = min(materials_to_spend // params.expansion_cost, len(neighbors))
+            if possible_expansions == 0:
+                continue
+
+            chosen = self.rng.choice(neighbors, size=possible_expansions, replace=False)
+            flat_grid[chosen] = tribe_id
+            t.territory[tribe_id] += possible_expansions
+            t.building_materials[tribe_id] -= possible_expansions * params.expansion_cost
+
+    def consume_food(self, mask):
+        """Konsumuj jedzenie i redukuj populację (najpierw wojownicy) tam, gdzie go brakuje"""
+        params = self.params
+        t = self.tribes
+        warriors_total = t.warriors_total()
+        consumption = t.workers * params.worker_food_consumption + warriors_total * params.warrior_food_consumption
+        deficit = np.where(mask, consumption - t.food, 0)
+        starving = deficit > 0
+
+        # Usuwanie wojowników, aż deficyt zostanie pokryty, potem robotników
+        warriors_lost = np.minimum(warriors_total, np.ceil(np.maximum(deficit, 0) / params.warrior_food_consumption))
+        deficit = deficit - warriors_lost * params.warrior_food_consumption
+        workers_lost = np.minimum(t.workers, np.ceil(np.maximum(deficit, 0) / params.worker_food_consumption))
+        t.remove_warriors(warriors_lost.astype(np.int64))
+        t.workers -= workers_lost.astype(np.int64)
+
+        # Zapis w miejscu - tablice mogą być widokami pamięci współdzielonej (parallel_engine)
+        t.food[:] = np.where(starving, 0.0, np.where(mask, t.food - consumption, t.food))
+
+    def record_turn(self, mask):
+        """Przekaż statystyki żywych plemion do rekordera (ten sam format co Simulation)"""
+        t = self.tribes
+        ids = np.flatnonzero(mask)
+        count = len(ids)
+        rows = zip(
+            [self.turn] * count,
+            ids.tolist(),
+            t.workers[ids].tolist(),
+            t.warriors_total()[ids].tolist(),
+            t.territory[ids].tolist(),
+            t.food[ids].tolist(),
+            t.building_materials[ids].tolist(),
+            [1] * count
+        )
+        self.recorder.record_tribes(rows)
+
+    def contacting_pairs(self):
+        """Zwróć posortowane pary id plemion, które mają wspólną granicę"""
+        horizontal = np.stack([self.grid[:, :-1].ravel(), self.grid[:, 1:].ravel()], axis=1)
+        vertical = np.stack([self.grid[:-1, :].ravel(), self.grid[1:, :].ravel()], axis=1)
+        pairs = np.concatenate([horizontal, vertical])
+        pairs = pairs[(pairs[:, 0] != EMPTY) & (pairs[:, 1] != EMPTY) & (pairs[:, 0] != pairs[:, 1])]
+        return np.unique(np.sort(pairs, axis=1), axis=0).tolist()
+
+    def check_collisions(self):
+        """Sprawdź kolizje między plemionami (walki)"""
+        t = self.tribes
+        if self.alive_tribes_count() < 2:
+            return
+        if self.settings.battle_mode == 'batched':
+            self.check_collisions_batched()
+            return
+
+        defeated = []
+        for id1, id2 in self.contacting_pairs():
+            # Przegrany z wcześniejszej walki w tej turze już nie walczy
+            if not (t.alive[id1] and t.alive[id2]):
+                continue
+            logger.log(self.detail_level, "Plemiona %d i %d mają wspólną granicę. Rozpoczyna się walka!", id1, id2)
+            if self.rng.random() < 0.5:
+                attacker, defender = id1, id2
+            else:
+                attacker, defender = id2, id1
+
+            result = self.battle(attacker, defender)
+            if result[0] is not None:
+                winner, loser, winner_losses, loser_losses = result
+                defeated.append(loser)
+                self.battle_finished(attacker, defender, winner, loser, winner_losses, loser_losses)
+            else:
+                logger.log(self.detail_level, "Remis - brak wojowników po obu stronach.")
+        self.clear_territory(defeated)
+
+    def clear_territory(self, tribe_ids):
+        """Zwolnij pola pokonanych plemion jednym przejściem po siatce (zamiast przejścia na walkę)"""
+        if len(tribe_ids):
+            self.grid[np.isin(self.grid, tribe_ids)] = EMPTY
+
+    def check_collisions_batched(self):
+        """Rozstrzygnij walki rundami rozłącznych par: siły, straty i przejęcia dla całej rundy naraz"""
+        t = self.tribes
+        params = self.params
+        defeated = []
+        for round_pairs in battle_rounds(self.contacting_pairs()):
+            pairs = np.array(round_pairs, dtype=np.int64)
+            pairs = pairs[t.alive[pairs[:, 0]] & t.alive[pairs[:, 1]]]
+            if len(pairs) == 0:
+                continue
+
+            # Losowania całej rundy z góry: strona atakująca, potem udziały przejętych zasobów
+            swap = self.rng.random(len(pairs)) >= 0.5
+            shares = self.rng.uniform(params.stole_resources_min, params.stole_resources_max, (len(pairs), 2))
+            attackers = np.where(swap, pairs[:, 1], pairs[:, 0])
+            defenders = np.where(swap, pairs[:, 0], pairs[:, 1])
+            decisive, attacker_wins, winner_losses, loser_losses = resolve_battles(
+                t.warriors[attackers] @ t.strength_table,
+                t.warriors[defenders] @ t.strength_table,
+                t.warriors[attackers].sum(axis=1),
+                t.warriors[defenders].sum(axis=1)
+            )
+
+            # Zastosowanie wyników wszystkich rozstrzygniętych walk rundy naraz
+            winners = np.where(attacker_wins, attackers, defenders)[decisive]
+            losers = np.where(attacker_wins, defenders, attackers)[decisive]
+            t.remove_warriors(winner_losses[decisive], rows=winners)
+            t.warriors[losers] = 0
+            t.building_materials[winners] += t.building_materials[losers] * shares[decisive, 0]
+            t.food[winners] += t.food[losers] * shares[decisive, 1]
+            defeated.append(losers)
+            t.alive[losers] = False
+            t.territory[losers] = 0
+
+            for i, (id1, id2) in enumerate(pairs.tolist()):
+                logger.log(self.detail_level, "Plemiona %d i %d mają wspólną granicę. Rozpoczyna się walka!", id1, id2)
+                if not decisive[i]:
+                    logger.log(self.detail_level, "Remis - brak wojowników po obu stronach.")
+                    continue
+                attacker, defender = int(attackers[i]), int(defenders[i])
+                winner, loser = (attacker, defender) if attacker_wins[i] else (defender, attacker)
+                self.battle_finished(attacker, defender, winner, loser, int(winner_losses[i]), int(loser_losses[i]))
+        if defeated:
+            self.clear_territory(np.concatenate(defeated))
+
+    def battle(self, attacker, defender):
+        """Rozstrzygnij walkę między plemionami (ten sam wzór co Board.battle).
+
+        Przegrany jest oznaczany jako martwy; jego pola zwalnia clear_territory po wszystkich walkach tury.
+        """
+        params = self.params
+        t = self.tribes
+        strength_attacker = int(t.warriors[attacker] @ t.strength_table)
+        strength_defender = int(t.warriors[defender] @ t.strength_table)
+
+        if strength_attacker == 0 and strength_defender == 0:
+            return None, None, 0, 0
+
+        if strength_attacker > strength_defender:
+            winner, loser = attacker, defender
+            winner_strength, loser_strength = strength_attacker, strength_defender
+        else:
+            winner, loser = defender, attacker
+            winner_strength, loser_strength = strength_defender, strength_attacker
+
+        winner_warriors = int(t.warriors[winner].sum())
+        winner_losses = 0
+        if winner_strength > 0:
+            winner_losses = int((winner_warriors / winner_strength) * (loser_strength / winner_strength) * winner_warriors)
+
+        t.remove_warriors(min(winner_losses, winner_warriors), rows=winner)
+
+        loser_losses = int(t.warriors[loser].sum())
+        t.warriors[loser] = 0
+
+        # Przejęcie zasobów
+        low, high = params.stole_resources_min, params.stole_resources_max
+        t.building_materials[winner] += t.building_materials[loser] * self.rng.uniform(low, high)
+        t.food[winner] += t.food[loser] * self.rng.uniform(low, high)
+
+        t.alive[loser] = False
+        t.territory[loser] = 0
+
+        return winner, loser, winner_losses, loser_losses
+
+    def print_stats(self):
+        """Wypisz statystyki żywych plemion (format jak Tribe.__str__)"""
+        level = self.turn_log_level()
+        t = self.tribes
+        strength = t.total_strength()
+        warriors_total = t.warriors_total()
+        for tribe_id in np.flatnonzero(t.alive):
+            logger.log(level, f"Plemię {tribe_id} (Żywe): Robotnicy={t.workers[tribe_id]}, "
+                       f"Wojownicy={warriors_total[tribe_id]} (Siła:{int(strength[tribe_id])}), "
+                       f"Terytorium={t.territory[tribe_id]}, Pożywienie={int(t.food[tribe_id])}, "
+                       f"Materiały={int(t.building_materials[tribe_id])}")
+
+    def display_board(self):
+        """Wyświetl siatkę NumPy w tym samym formacie co Board.display_board"""
+        renderer = self.renderer
+        if not renderer.is_due(self.turn):
+            return
+        if renderer.mode == 'diff':
+            # Zmienione pola wyznaczamy porównaniem z poprzednią klatką
+            if self._last_frame is not None:
+                for x, y in np.argwhere(self.grid != self._last_frame).tolist():
+                    renderer.cell_changed(x, y, None)
+            self._last_frame = self.grid.copy()
+        rows = [[None if cell == EMPTY else cell for cell in row] for row in self.grid.tolist()]
+        renderer.render(self.turn, rows, self.tribes_count - 1)